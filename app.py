@@ -1,22 +1,94 @@
-from flask import Flask, request, jsonify, send_file, send_from_directory
+from flask import Flask, request, jsonify, g
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
 import sys
 import os
+import hashlib
 import traceback
+from functools import wraps
+
+import numpy as np
 
 # Import logic modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'logic'))
 
 try:
     from roi_calculator import calculate_roi, get_available_courses
-    from course_data import COURSE_DATA
+    from course_data import (
+        COURSE_DATA, cached_per_data_version, get_data_version,
+        get_course_table, pin_course_table, unpin_course_table
+    )
+    from catalogue_stats import get_catalogue_stats
+    from alternatives import get_field_alternatives, BETTER, CHEAPER
+    from lifetime import project_lifetime, project_lifetime_batch, RETIREMENT_AGE
+    from batch_calculator import get_course_columns, round_like_python
+    from result_cache import ResultCache, DEFAULT_BUDGET, OVERRIDE_BUDGET
+    from static_assets import AssetPipeline, ASSET_PREFIX
+    from catalogue_watcher import CatalogueWatcher, DEFAULT_INTERVAL, warm_table
+    from process_memory import process_memory
+    from sensitivity import sensitivity_grid, parse_axis, SENSITIVITY_AXES
+    from tax import resolve_tax_year, rules_digest, TAX_YEARS, DEFAULT_TAX_YEAR
+    from course_query import query_rows, get_category_bitmaps, CATEGORY_FILTERS, RANGE_FILTERS, SORT_KEYS
+    from pareto import pareto_rows, parse_metrics
+    from catalogue_export import (
+        export_records, ndjson_lines, csv_lines, record_values, parse_fields as parse_export_fields
+    )
+    from course_comparison import (
+        resolve_courses, select_courses, metric_winners, non_dominated, comparison_chunks,
+        MAX_COMPARE_COURSES, WINNER_METRICS
+    )
+    from quiz_matcher import (
+        quiz_matches, parse_answers, get_quiz_index, DEFAULT_MATCHES, MAX_MATCHES
+    )
+    from rankings import (
+        get_rankings, encode_cursor, decode_cursor, RANK_METRICS, DEFAULT_LIMIT as RANK_DEFAULT_LIMIT,
+        MAX_LIMIT as RANK_MAX_LIMIT
+    )
+    from simulation import (
+        simulate_course, simulate_rows, DEFAULT_DRAWS, MAX_DRAWS, CATALOGUE_DRAWS,
+        MAX_CATALOGUE_DRAWS, DEFAULT_PERCENTILES
+    )
 except ImportError as e:
     print(f"❌ Error importing modules: {e}")
     print("Make sure roi_calculator.py and course_data.py are in the logic/ folder")
     sys.exit(1)
 
+# Build catalogue statistics once at startup (rebuilt when the data changes)
+get_catalogue_stats()
+
+# Memoized /calculate results, sized via environment variables
+result_cache = ResultCache(
+    default_budget=int(os.environ.get('RESULT_CACHE_DEFAULT_SIZE', DEFAULT_BUDGET)),
+    override_budget=int(os.environ.get('RESULT_CACHE_OVERRIDE_SIZE', OVERRIDE_BUDGET))
+)
+
+# Reload the catalogue in the background when its source file changes
+# (COURSE_DATA_WATCH_INTERVAL=0 turns this off). Polling starts with the
+# first request each process serves, so a preloading master never runs it.
+catalogue_watcher = CatalogueWatcher.for_active_source(
+    interval=float(os.environ.get('COURSE_DATA_WATCH_INTERVAL', DEFAULT_INTERVAL)),
+    on_swap=[get_course_columns, get_catalogue_stats, get_rankings, get_category_bitmaps, get_quiz_index,
+             get_field_alternatives]
+)
+
+# Worker processes for catalogue-wide /simulate runs (1 = in the request)
+simulation_processes = max(1, int(os.environ.get('SIMULATION_PROCESSES', 1)))
+
 app = Flask(__name__, static_folder='.')
 
+# Each request sees one catalogue from start to finish, even if a reload
+# swaps in a new one while it is running
+@app.before_request
+def pin_catalogue():
+    catalogue_watcher.ensure_running()
+    g.catalogue_token = pin_course_table()
+
+@app.teardown_request
+def unpin_catalogue(exc):
+    token = g.pop('catalogue_token', None)
+    if token is not None:
+        unpin_course_table(token)
+
 # IMPROVED CORS Configuration
 CORS(app, 
      resources={
@@ -42,13 +114,90 @@ def after_request(response):
     response.headers['Access-Control-Allow-Credentials'] = 'true'
     return response
 
+# ==================== HTTP CACHING ====================
+
+# Data responses may be reused briefly, then revalidated with If-None-Match
+DATA_CACHE_CONTROL = 'public, max-age=60'
+# Pages and live status are always revalidated
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# Bump when a change to the formulas (ROI, lifetime model, analysis labels,
+# suggestions) alters responses for the same catalogue, so ETags from an
+# older deploy stop matching
+FORMULA_VERSION = 3
+
+def computation_version():
+    """Everything besides the catalogue that decides the numbers: formulas and tax rules"""
+    return f"{FORMULA_VERSION}|{rules_digest()}"
+
+def data_etag():
+    """
+    Strong ETag from the catalogue content hash, the computation version
+    and the request parameters
+    """
+    params = sorted(request.args.items(multi=True))
+    key = f"{get_course_table().content_hash()}|{computation_version()}|{request.path}|{params!r}"
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+def conditional_on_data(view):
+    """
+    Answer If-None-Match with a 304 before the view runs.
+
+    The ETag only depends on the data and the query string, so a match
+    means the response would be identical and nothing is recalculated.
+    Successful responses get the ETag and DATA_CACHE_CONTROL.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        etag = data_etag()
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = DATA_CACHE_CONTROL
+        return response
+    return wrapper
+
+# Fingerprinted asset URLs never change content, so caches may keep them
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Minify, compress and fingerprint the front-end files once at startup
+assets = AssetPipeline(app.root_path).build()
+
+def send_asset(name, immutable=False):
+    """
+    Serve a prebuilt asset in the best encoding the client accepts.
+
+    Raises FileNotFoundError when the file was missing at startup.
+    """
+    asset = assets.get(name)
+    if asset is None:
+        raise FileNotFoundError(name)
+    
+    encoding, body = asset.negotiate(request.accept_encodings)
+    response = app.response_class(body, mimetype=asset.mimetype)
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.set_etag(f"{asset.digest}-{encoding}")
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+    return response.make_conditional(request)
+
 # Handle OPTIONS requests for CORS preflight
 @app.route('/<path:path>', methods=['OPTIONS'])
 def handle_options(path):
     return '', 204
 
-def analyze_course(result):
-    """Add smart analysis to course results"""
+def analyze_course(result, lifetime=None):
+    """
+    Add smart analysis to course results.
+    
+    `lifetime` takes lifetime figures already worked out in bulk (see
+    batch_calculator.analyze_batch) instead of projecting them here.
+    """
     
     # 1. Payback Speed Analysis
     payback = result['payback_years']
@@ -100,21 +249,13 @@ def analyze_course(result):
     else:
         recommendation = f"Solid choice with {payback_label.lower()} and {roi_rating.lower()} ROI."
     
-    # 4. Lifetime Value (30 year career)
-    career_years = 30
-    year_5_salary = result['salary_after_5_years']
-    lifetime_earnings = 0
-    
-    # First 5 years (linear growth)
-    lifetime_earnings += (result['starting_salary'] + year_5_salary) / 2 * 5
-    
-    # Years 6-30 (3% annual growth)
-    for year in range(6, career_years + 1):
-        lifetime_earnings += year_5_salary * (1.03 ** (year - 5))
-    
-    lifetime_profit = lifetime_earnings - result['total_cost']
-    lifetime_roi = (lifetime_profit / result['total_cost']) * 100
-    times_earned_back = lifetime_earnings / result['total_cost']
+    # 4. Lifetime Value (30 year career, see logic/lifetime.py)
+    if lifetime is None:
+        lifetime = project_lifetime(
+            result['starting_salary'],
+            result['salary_after_5_years'],
+            result['total_cost']
+        )
     
     # Add analysis to result
     result['analysis'] = {
@@ -126,30 +267,23 @@ def analyze_course(result):
         'roi_emoji': roi_emoji,
         'recommendation': recommendation,
         'lifetime': {
-            'total_earnings': round(lifetime_earnings, 0),
-            'profit': round(lifetime_profit, 0),
-            'roi': round(lifetime_roi, 0),
-            'times_earned_back': round(times_earned_back, 1)
+            'total_earnings': round(lifetime['total_earnings'], 0),
+            'profit': round(lifetime['profit'], 0),
+            'roi': round(lifetime['roi'], 0),
+            'times_earned_back': round(lifetime['times_earned_back'], 1)
         }
     }
     
     return result
 
-def add_comparison_context(result):
-    """Compare this course to averages across all courses"""
+def add_comparison_context(result, stats=None):
+    """Compare this course to averages across all courses (of `stats`, if given)"""
     
     try:
-        all_courses = get_available_courses()
-        all_rois = []
-        all_paybacks = []
-        
-        for course in all_courses:
-            data = calculate_roi(course)
-            all_rois.append(data['roi_5_years'])
-            all_paybacks.append(data['payback_years'])
-        
-        avg_roi = sum(all_rois) / len(all_rois)
-        avg_payback = sum(all_paybacks) / len(all_paybacks)
+        if stats is None:
+            stats = get_catalogue_stats(result.get('tax_year'))
+        avg_roi = stats.average('roi_5_years')
+        avg_payback = stats.average('payback_years')
         
         # Calculate differences
         roi_diff = ((result['roi_5_years'] - avg_roi) / avg_roi) * 100
@@ -192,70 +326,165 @@ def add_comparison_context(result):
     
     return result
 
+def suggestion_text(table, kind, other, amount):
+    """The 'suggestion' block for a FieldAlternatives answer"""
+    if kind == BETTER:
+        return {
+            'has_suggestion': True,
+            'text': f"Consider '{table.names[other]}' - it has {amount:.0f}% higher ROI",
+            'emoji': '🎯'
+        }
+    if kind == CHEAPER:
+        return {
+            'has_suggestion': True,
+            'text': f"Consider '{table.names[other]}' - it costs €{amount:,.0f} less with similar ROI",
+            'emoji': '💰'
+        }
+    return {
+        'has_suggestion': False,
+        'text': "This is already one of the top options in this field.",
+        'emoji': '✅'
+    }
+
 def suggest_alternative(result):
     """Suggest better alternatives if they exist"""
     
     try:
-        current_course = result['course_name']
-        course_field = current_course.split(' - ')[0]
-        current_roi = result['roi_5_years']
-        current_cost = result['total_cost']
-        
-        # Find similar courses (same field, different university)
-        all_courses = get_available_courses()
-        similar_courses = [c for c in all_courses if course_field in c and c != current_course]
-        
-        suggestions = []
-        
-        for similar in similar_courses[:3]:  # Limit to 3 suggestions
-            similar_data = calculate_roi(similar)
-            
-            # Is it significantly better ROI?
-            if similar_data['roi_5_years'] > current_roi * 1.1:
-                suggestions.append({
-                    'course': similar,
-                    'reason': f"has {similar_data['roi_5_years'] - current_roi:.0f}% higher ROI",
-                    'priority': 'high',
-                    'emoji': '🎯'
-                })
-            
-            # Is it significantly cheaper with similar ROI?
-            elif similar_data['total_cost'] < current_cost * 0.9 and similar_data['roi_5_years'] > current_roi * 0.95:
-                cost_saving = current_cost - similar_data['total_cost']
-                suggestions.append({
-                    'course': similar,
-                    'reason': f"costs €{cost_saving:,.0f} less with similar ROI",
-                    'priority': 'medium',
-                    'emoji': '💰'
-                })
-        
-        # Create suggestion message
-        if not suggestions:
-            result['suggestion'] = {
-                'has_suggestion': False,
-                'text': "This is already one of the top options in this field.",
-                'emoji': '✅'
-            }
-        else:
-            best = suggestions[0]
-            result['suggestion'] = {
-                'has_suggestion': True,
-                'text': f"Consider '{best['course']}' - it {best['reason']}",
-                'emoji': best['emoji']
-            }
+        # Best ROI improvement first, then biggest saving, among the other
+        # courses in the same field (see logic/alternatives.py)
+        alternatives = get_field_alternatives(result.get('tax_year'))
+        table = alternatives.stats.columns.table
+        kind, other, amount = alternatives.best_for(
+            table.row_of(result['course_name']), result['roi_5_years'], result['total_cost']
+        )
+        result['suggestion'] = suggestion_text(table, kind, other, amount)
     except Exception as e:
         print(f"Warning: Could not generate suggestions: {e}")
         result['suggestion'] = None
     
     return result
 
+# Course record fields /calculate returns under 'course_data'
+COURSE_DATA_FIELDS = [
+    'employment_rate', 'graduate_satisfaction', 'job_security', 'work_life_balance',
+    'career_progression', 'top_employers', 'typical_roles', 'skills_demand',
+    'remote_work_availability', 'further_study_rate', 'international_opportunities',
+    'industry_growth_rate', 'avg_class_size', 'internship_opportunities', 'startup_salary_range'
+]
+
+def build_course_result(course_name, tuition_per_year=None, course_length=None, tax_year=None):
+    """Run the full /calculate pipeline for one course"""
+    result = calculate_roi(
+        course_name=course_name,
+        tuition_per_year=tuition_per_year,
+        course_length=course_length,
+        tax_year=tax_year
+    )
+    
+    # Add all analysis features
+    result = analyze_course(result)
+    result = add_comparison_context(result)
+    result = suggest_alternative(result)
+    
+    # Add the raw course data for additional fields
+    if course_name in COURSE_DATA:
+        course_data = COURSE_DATA[course_name]
+        result['course_data'] = {field: course_data.get(field) for field in COURSE_DATA_FIELDS}
+    
+    return result
+
+# Courses built and serialized at a time for /calculate-all
+ALL_RESULTS_CHUNK = 4096
+# Largest catalogue whose /calculate-all body warm_caches() builds at startup
+ALL_RESULTS_WARM_LIMIT = int(os.environ.get('ALL_RESULTS_WARM_LIMIT', 100_000))
+
+@cached_per_data_version
+def get_all_results_body(tax_year):
+    """
+    Serialized /calculate-all payload, built once per data version and tax year.
+
+    Each course gets what /calculate returns for it, built with the batch
+    engine: results and lifetime figures from the catalogue arrays,
+    suggestions from one FieldAlternatives pass and record fields a column
+    at a time.
+    """
+    stats = get_catalogue_stats(tax_year)
+    table = stats.columns.table
+    kinds, others, amounts = get_field_alternatives(tax_year).best_for_all()
+    rows = np.arange(stats.course_count)
+    
+    # Each chunk is dumped as it is built; joined, the pieces give the same
+    # bytes as dumping the whole payload at once (keys are sorted)
+    pieces = []
+    start = 0
+    for results, lifetimes in comparison_chunks(stats, rows, ALL_RESULTS_CHUNK):
+        chunk = slice(start, start + len(results))
+        start += len(results)
+        records = zip(*(record_values(table, field, rows[chunk]) for field in COURSE_DATA_FIELDS))
+        suggestions = zip(kinds[chunk].tolist(), others[chunk].tolist(), amounts[chunk].tolist())
+        courses = []
+        for result, lifetime, values, suggestion in zip(results, lifetimes, records, suggestions):
+            result = analyze_course(result, lifetime)
+            result = add_comparison_context(result, stats)
+            result['suggestion'] = suggestion_text(table, *suggestion)
+            result['course_data'] = dict(zip(COURSE_DATA_FIELDS, values))
+            courses.append(result)
+        pieces.append(app.json.dumps(courses)[1:-1])
+    
+    tail = app.json.dumps({
+        "success": True,
+        "version": get_data_version(),
+        "total_courses": stats.course_count
+    })
+    return '{"courses": [' + ', '.join(pieces) + '], ' + tail[1:]
+
+def warm_caches():
+    """
+    Build everything derived from the catalogue ahead of the first request.
+
+    gunicorn.conf.py calls this in the master before forking, so workers
+    inherit the indexes, statistics and precomputed responses instead of
+    each building their own. The /calculate-all body (a few KB per course)
+    is only built ahead for catalogues up to ALL_RESULTS_WARM_LIMIT courses.
+    """
+    table = get_course_table()
+    warm_table(table)
+    get_course_columns()
+    get_catalogue_stats()
+    get_field_alternatives()
+    get_rankings().warm()
+    get_category_bitmaps()
+    get_quiz_index().warm()
+    if len(table) <= ALL_RESULTS_WARM_LIMIT:
+        get_all_results_body(DEFAULT_TAX_YEAR)
+    get_courses_body()
+
+@cached_per_data_version
+def get_courses_body():
+    """Serialized /courses payload, built once per data version"""
+    course_list = get_available_courses()
+    return app.json.response({
+        "success": True,
+        "total_courses": len(course_list),
+        "courses": course_list
+    }).get_data()
+
+def requested_tax_year():
+    """
+    The tax_year query parameter (None when not given).
+
+    Raises ValueError for a year with no tax tables.
+    """
+    tax_year = request.args.get('tax_year', type=int)
+    return None if tax_year is None else resolve_tax_year(tax_year)
+
 # ==================== ROUTES ====================
 
 @app.route('/')
 def home():
     """Serve the calculator as the homepage"""
     try:
-        return send_file('index.html')
+        return send_asset('index.html')
     except FileNotFoundError:
         return jsonify({
             "error": "Calculator page not found. Make sure index.html is in the same directory as app.py"
@@ -263,29 +492,53 @@ def home():
     except Exception as e:
         return jsonify({"error": f"Could not load calculator page: {str(e)}"}), 500
 
+# Every route, as listed by /api and in 404 responses
+API_ENDPOINTS = {
+    "/": "Calculator web interface",
+    "/api": "API status and documentation",
+    "/courses": "List all available courses",
+    "/autocomplete": "Ranked course suggestions (GET with ?q=TEXT&limit=N)",
+    "/calculate": "Calculate ROI for a specific course (GET with ?course=NAME&tax_year=)",
+    "/calculate-all": "Full analyzed results for every course in one response",
+    "/lifetime": "Lifetime earnings projection (GET with ?course=NAME&career_years=&growth=&start_age=)",
+    "/simulate": "Monte Carlo ROI ranges (GET with ?course=NAME&draws=&seed=&percentiles=5,50,95&tax_year=)",
+    "/sensitivity": "ROI/payback grid (GET with ?course=NAME&tuition=3000:12000:1000&years=3,4&tax_rate=&salary_multiplier=&tax_year=)",
+    "/rank": "Courses ranked by a metric (GET with ?metric=roi_5_years&order=desc&limit=&cursor=&university=&field=&tax_year=)",
+    "/pareto": "Courses no other course beats on every chosen metric (GET with ?metrics=total_cost,roi_5_years,payback_years&limit=&cursor=&tax_year=)",
+    "/query": "Filter, sort and page courses (GET with ?university=UCD&field=&field_match=exact|contains&skills_demand=&min_starting_salary=&max_payback_years=&sort=&order=&limit=&cursor=)",
+    "/quiz/match": "Top quiz matches (GET with ?goal=&field=&budget=&length=&location=&work_style=&demand=&international=&limit=&tax_year=)",
+    "/export.ndjson": "Analyzed courses as streamed NDJSON (GET with /query filters plus ?fields=a,b&sort=&order=&tax_year=)",
+    "/export.csv": "Analyzed courses as streamed CSV (same parameters as /export.ndjson)",
+    "/compare-multiple": "Compare courses (POST with JSON {\"courses\": [...]} or {\"university\": ..., \"field\": ...}; large sets stream)",
+    "/calculator": "Open the web calculator interface"
+}
+
 @app.route('/api')
 def api_status():
     """API status endpoint"""
-    return jsonify({
+    response = jsonify({
         "status": "online",
         "message": "Irish College ROI Calculator API",
         "version": "1.0.0",
-        "endpoints": {
-            "/": "Calculator web interface",
-            "/api": "API status and documentation",
-            "/courses": "List all available courses",
-            "/calculate": "Calculate ROI for a specific course (GET with ?course=NAME)",
-            "/compare-multiple": "Compare multiple courses (POST with JSON)",
-            "/calculator": "Open the web calculator interface"
-        },
-        "total_courses": len(COURSE_DATA)
+        "endpoints": API_ENDPOINTS,
+        "total_courses": len(COURSE_DATA),
+        "data_version": get_data_version(),
+        "tax_years": sorted(TAX_YEARS),
+        "default_tax_year": DEFAULT_TAX_YEAR,
+        "result_cache": result_cache.stats(),
+        "catalogue_reload": catalogue_watcher.status(),
+        "memory": process_memory()
     })
+    # Cache counters change on every request, so hash the body itself
+    response.headers['Cache-Control'] = REVALIDATE_CACHE_CONTROL
+    response.add_etag()
+    return response.make_conditional(request)
 
 @app.route('/calculator')
 def calculator_page():
     """Serve the HTML calculator page"""
     try:
-        return send_file('index.html')
+        return send_asset('index.html')
     except FileNotFoundError:
         return jsonify({
             "error": "Calculator page not found. Make sure index.html is in the same directory as app.py"
@@ -297,7 +550,7 @@ def calculator_page():
 def quiz_page():
     """Serve the quiz page"""
     try:
-        return send_file('quiz.html')
+        return send_asset('quiz.html')
     except FileNotFoundError:
         return jsonify({
             "error": "Quiz page not found. Make sure quiz.html is in the same directory as app.py"
@@ -309,7 +562,7 @@ def quiz_page():
 def serve_css():
     """Serve the CSS file"""
     try:
-        return send_file('style.css', mimetype='text/css')
+        return send_asset('style.css')
     except FileNotFoundError:
         return jsonify({"error": "CSS file not found"}), 404
 
@@ -317,29 +570,65 @@ def serve_css():
 def serve_js():
     """Serve the JavaScript file"""
     try:
-        return send_file('script.js', mimetype='application/javascript')
+        return send_asset('script.js')
     except FileNotFoundError:
         return jsonify({"error": "JavaScript file not found"}), 404
 
+@app.route(ASSET_PREFIX + '<path:filename>')
+def serve_fingerprinted(filename):
+    """Serve a fingerprinted asset with year-long immutable caching"""
+    asset = assets.by_url(ASSET_PREFIX + filename)
+    if asset is None:
+        return jsonify({"error": "Asset not found"}), 404
+    return send_asset(asset.name, immutable=True)
+
 @app.route('/courses')
+@conditional_on_data
 def courses():
     """List all available courses"""
     try:
-        course_list = get_available_courses()
+        return app.response_class(get_courses_body(), mimetype='application/json')
+    except Exception as e:
+        print(f"Error in /courses: {e}")
+        traceback.print_exc()
+        return jsonify({
+            "success": False,
+            "error": f"Failed to load courses: {str(e)}"
+        }), 500
+
+@app.route('/autocomplete')
+@conditional_on_data
+def autocomplete():
+    """Ranked course suggestions for type-ahead search"""
+    query = request.args.get('q', '').strip()
+    limit = request.args.get('limit', default=8, type=int)
+    limit = max(1, min(limit, 50))
+    
+    if not query:
+        return jsonify({
+            "success": True,
+            "query": query,
+            "results": []
+        })
+    
+    try:
+        results = get_course_table().search_index().search(query, limit=limit)
         return jsonify({
             "success": True,
-            "total_courses": len(course_list),
-            "courses": sorted(course_list)
+            "query": query,
+            "total_results": len(results),
+            "results": results
         })
     except Exception as e:
-        print(f"Error in /courses: {e}")
+        print(f"Error in /autocomplete: {e}")
         traceback.print_exc()
         return jsonify({
             "success": False,
-            "error": f"Failed to load courses: {str(e)}"
+            "error": f"Search failed: {str(e)}"
         }), 500
 
 @app.route('/calculate')
+@conditional_on_data
 def calculate():
     """Calculate ROI for a single course"""
     course_name = request.args.get('course')
@@ -354,38 +643,20 @@ def calculate():
     custom_years = request.args.get('years', type=int)
     
     try:
-        result = calculate_roi(
-            course_name=course_name,
-            tuition_per_year=custom_tuition,
-            course_length=custom_years
+        tax_year = requested_tax_year()
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    
+    try:
+        result = result_cache.get_or_compute(
+            course_name, custom_tuition, custom_years,
+            lambda: build_course_result(course_name, custom_tuition, custom_years, tax_year),
+            tax_year=tax_year
         )
         
-        # Add all analysis features
-        result = analyze_course(result)
-        result = add_comparison_context(result)
-        result = suggest_alternative(result)
-        
-        # Add the raw course data for additional fields
-        if course_name in COURSE_DATA:
-            course_data = COURSE_DATA[course_name]
-            result['course_data'] = {
-                'employment_rate': course_data.get('employment_rate'),
-                'graduate_satisfaction': course_data.get('graduate_satisfaction'),
-                'job_security': course_data.get('job_security'),
-                'work_life_balance': course_data.get('work_life_balance'),
-                'career_progression': course_data.get('career_progression'),
-                'top_employers': course_data.get('top_employers'),
-                'typical_roles': course_data.get('typical_roles'),
-                'skills_demand': course_data.get('skills_demand'),
-                'remote_work_availability': course_data.get('remote_work_availability'),
-                'further_study_rate': course_data.get('further_study_rate'),
-                'international_opportunities': course_data.get('international_opportunities'),
-                'industry_growth_rate': course_data.get('industry_growth_rate'),
-                'avg_class_size': course_data.get('avg_class_size'),
-                'internship_opportunities': course_data.get('internship_opportunities'),
-                'startup_salary_range': course_data.get('startup_salary_range')
-            }
-        
         return jsonify({
             "success": True,
             "data": result
@@ -403,77 +674,618 @@ def calculate():
             "error": f"Calculation failed: {str(e)}"
         }), 500
 
-@app.route('/compare-multiple', methods=['POST', 'OPTIONS'])
-def compare_multiple():
-    """Compare multiple courses - expects JSON body with course names"""
+@app.route('/calculate-all')
+@conditional_on_data
+def calculate_all():
+    """Full analyzed results for every course in one response"""
+    try:
+        tax_year = resolve_tax_year(request.args.get('tax_year', type=int))
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
     
-    if request.method == 'OPTIONS':
-        return '', 204
+    try:
+        return app.response_class(get_all_results_body(tax_year), mimetype='application/json')
+    except Exception as e:
+        print(f"Error in /calculate-all: {e}")
+        traceback.print_exc()
+        return jsonify({
+            "success": False,
+            "error": f"Calculation failed: {str(e)}"
+        }), 500
+
+@app.route('/lifetime')
+@conditional_on_data
+def lifetime():
+    """Lifetime earnings projection with adjustable career assumptions"""
+    course_name = request.args.get('course')
     
     try:
-        data = request.get_json()
+        params = {
+            'career_years': request.args.get('career_years', type=int),
+            'growth': request.args.get('growth', default=0.03, type=float),
+            'start_age': request.args.get('start_age', type=int),
+            'retirement_age': request.args.get('retirement_age', default=RETIREMENT_AGE, type=int)
+        }
         
-        if not data or 'courses' not in data:
+        if params['career_years'] is not None and not 0 <= params['career_years'] <= 60:
+            raise ValueError("'career_years' must be between 0 and 60")
+        if not -0.5 <= params['growth'] <= 0.5:
+            raise ValueError("'growth' is an annual rate, e.g. 0.03 for 3%, between -0.5 and 0.5")
+        if params['start_age'] is not None and not 14 <= params['start_age'] <= params['retirement_age']:
+            raise ValueError("'start_age' must be between 14 and the retirement age")
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    
+    try:
+        if course_name:
+            result = calculate_roi(course_name)
+            projection = project_lifetime(
+                result['starting_salary'],
+                result['salary_after_5_years'],
+                result['total_cost'],
+                **params
+            )
             return jsonify({
-                "success": False,
-                "error": "Missing 'courses' in request body. Send JSON: {\"courses\": [\"Course 1\", \"Course 2\"]}"
-            }), 400
+                "success": True,
+                "parameters": {**params, 'career_years': projection['career_years']},
+                "data": {
+                    'course_name': course_name,
+                    'total_cost': result['total_cost'],
+                    'lifetime': {
+                        'total_earnings': round(projection['total_earnings'], 0),
+                        'profit': round(projection['profit'], 0),
+                        'roi': round(projection['roi'], 0),
+                        'times_earned_back': round(projection['times_earned_back'], 1)
+                    }
+                }
+            })
         
-        course_list = data['courses']
+        # No course given: project the whole catalogue in one batch
+        columns = get_course_columns()
+        total_cost = columns.typical_tuition * columns.course_length
+        projection = project_lifetime_batch(
+            columns.starting_salary, columns.salary_5_years, total_cost, **params
+        )
+        earnings = round_like_python(projection['total_earnings'], 0).tolist()
+        profit = round_like_python(projection['profit'], 0).tolist()
+        roi = round_like_python(projection['roi'], 0).tolist()
+        times = round_like_python(projection['times_earned_back'], 1).tolist()
         
-        if not isinstance(course_list, list):
+        return jsonify({
+            "success": True,
+            "parameters": {**params, 'career_years': projection['career_years']},
+            "total_courses": len(columns),
+            "courses": [
+                {
+                    'course_name': name,
+                    'lifetime': {
+                        'total_earnings': earnings[i],
+                        'profit': profit[i],
+                        'roi': roi[i],
+                        'times_earned_back': times[i]
+                    }
+                }
+                for i, name in enumerate(columns.names)
+            ]
+        })
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 404
+    except Exception as e:
+        print(f"Error in /lifetime: {e}")
+        traceback.print_exc()
+        return jsonify({
+            "success": False,
+            "error": f"Projection failed: {str(e)}"
+        }), 500
+
+@app.route('/simulate')
+@conditional_on_data
+def simulate():
+    """Monte Carlo ROI, payback and lifetime ROI percentiles"""
+    course_name = request.args.get('course')
+    
+    try:
+        draws = request.args.get('draws', default=DEFAULT_DRAWS if course_name else CATALOGUE_DRAWS, type=int)
+        seed = request.args.get('seed', default=0, type=int)
+        tax_year = resolve_tax_year(request.args.get('tax_year', type=int))
+        percentiles = request.args.get('percentiles')
+        try:
+            percentiles = tuple(float(p) for p in percentiles.split(',')) if percentiles else DEFAULT_PERCENTILES
+        except ValueError:
+            percentiles = None
+        
+        if not 1 <= draws <= MAX_DRAWS:
+            raise ValueError(f"'draws' must be between 1 and {MAX_DRAWS}")
+        if seed < 0:
+            raise ValueError("'seed' must be a non-negative integer")
+        if percentiles is None or not all(0 <= p <= 100 for p in percentiles):
+            raise ValueError("'percentiles' must be comma-separated numbers between 0 and 100")
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    
+    parameters = {'draws': draws, 'seed': seed, 'percentiles': list(percentiles), 'tax_year': tax_year}
+    
+    try:
+        if course_name:
+            result = simulate_course(course_name, draws, seed, percentiles, tax_year)
+            point = calculate_roi(course_name, tax_year=tax_year)
+            result['point_estimate'] = {
+                'roi_5_years': point['roi_5_years'],
+                'payback_years': point['payback_years'],
+                'lifetime_roi': point['lifetime_roi']
+            }
+            return jsonify({
+                "success": True,
+                "parameters": parameters,
+                "data": result
+            })
+        
+        # No course given: every course, within a total draw budget
+        course_count = len(get_course_table())
+        if course_count * draws > MAX_CATALOGUE_DRAWS:
             return jsonify({
                 "success": False,
-                "error": "'courses' must be an array"
+                "error": f"Too many draws for {course_count} courses; use at most "
+                         f"{max(1, MAX_CATALOGUE_DRAWS // course_count)} or pick a course"
             }), 400
         
-        if len(course_list) < 2:
+        results = simulate_rows(range(course_count), draws, seed, percentiles,
+                                processes=simulation_processes, tax_year=tax_year)
+        return jsonify({
+            "success": True,
+            "parameters": parameters,
+            "total_courses": len(results),
+            "courses": results
+        })
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 404
+    except Exception as e:
+        print(f"Error in /simulate: {e}")
+        traceback.print_exc()
+        return jsonify({
+            "success": False,
+            "error": f"Simulation failed: {str(e)}"
+        }), 500
+
+@app.route('/sensitivity')
+@conditional_on_data
+def sensitivity():
+    """ROI and payback over a grid of tuition, length, tax and salary scenarios"""
+    course_list = request.args.getlist('course')
+    
+    try:
+        axes = {}
+        for name in SENSITIVITY_AXES:
+            text = request.args.get(name)
+            axes[name] = parse_axis(name, text) if text else None
+        tax_year = resolve_tax_year(request.args.get('tax_year', type=int))
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    
+    try:
+        columns = get_course_columns()
+        if course_list:
+            missing = [c for c in course_list if c not in columns]
+            if missing:
+                raise LookupError(f"Course '{missing[0]}' not found")
+            rows = columns.rows_for(course_list)
+        else:
+            rows = np.arange(len(columns))
+        
+        grid = sensitivity_grid(rows, tax_year=tax_year, columns=columns, **axes)
+        
+        # Axes left out use each course's own value (tuition, years), the
+        # tax tables (tax rate) or a 1.0 salary multiplier
+        axis_values = dict(axes)
+        if axis_values['salary_multiplier'] is None:
+            axis_values['salary_multiplier'] = [1.0]
+        
+        return jsonify({
+            "success": True,
+            "dimensions": ["course", *SENSITIVITY_AXES],
+            "axes": axis_values,
+            "tax_year": tax_year if axes['tax_rate'] is None else None,
+            "courses": [
+                {
+                    'course_name': columns.names[row],
+                    'tuition_per_year': int(columns.typical_tuition[row]),
+                    'course_length': int(columns.course_length[row])
+                }
+                for row in rows.tolist()
+            ],
+            "roi_5_years": grid['roi_5_years'].tolist(),
+            "payback_years": grid['payback_years'].tolist()
+        })
+    except LookupError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 404
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except Exception as e:
+        print(f"Error in /sensitivity: {e}")
+        traceback.print_exc()
+        return jsonify({
+            "success": False,
+            "error": f"Sensitivity grid failed: {str(e)}"
+        }), 500
+
+@app.route('/rank')
+@conditional_on_data
+def rank():
+    """Top-k and paginated course rankings by any metric, optionally within a university or field"""
+    metric = request.args.get('metric', 'roi_5_years')
+    order = request.args.get('order', RANK_METRICS.get(metric))
+    limit = request.args.get('limit', default=RANK_DEFAULT_LIMIT, type=int)
+    cursor = request.args.get('cursor')
+    filters = {name: request.args[name] for name in ('university', 'field') if request.args.get(name)}
+    
+    try:
+        if metric not in RANK_METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Available metrics: {', '.join(RANK_METRICS)}")
+        if order not in ('asc', 'desc'):
+            raise ValueError("'order' must be 'asc' or 'desc'")
+        if not 1 <= limit <= RANK_MAX_LIMIT:
+            raise ValueError(f"'limit' must be between 1 and {RANK_MAX_LIMIT}")
+        rankings = get_rankings(request.args.get('tax_year', type=int))
+        offset = decode_cursor(cursor, rankings.version) if cursor else 0
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    
+    try:
+        rows, total = rankings.page(metric, order == 'desc', offset, limit, filters)
+        results = rankings.results(rows)
+        for position, result in enumerate(results, start=offset + 1):
+            result['rank'] = position
+        
+        end = offset + len(results)
+        return jsonify({
+            "success": True,
+            "metric": metric,
+            "order": order,
+            "tax_year": rankings.tax_year,
+            "filters": filters,
+            "total_courses": total,
+            "courses": results,
+            "next_cursor": encode_cursor(rankings.version, end) if end < total else None
+        })
+    except LookupError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 404
+    except Exception as e:
+        print(f"Error in /rank: {e}")
+        traceback.print_exc()
+        return jsonify({
+            "success": False,
+            "error": f"Ranking failed: {str(e)}"
+        }), 500
+
+@app.route('/pareto')
+@conditional_on_data
+def pareto():
+    """Pareto frontier: courses not beaten on every chosen metric by any other course"""
+    limit = request.args.get('limit', default=RANK_MAX_LIMIT, type=int)
+    cursor = request.args.get('cursor')
+    
+    try:
+        metrics = parse_metrics(request.args.get('metrics'))
+        if not 1 <= limit <= RANK_MAX_LIMIT:
+            raise ValueError(f"'limit' must be between 1 and {RANK_MAX_LIMIT}")
+        tax_year = resolve_tax_year(request.args.get('tax_year', type=int))
+        offset = decode_cursor(cursor, get_data_version()) if cursor else 0
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    
+    try:
+        rows, considered = pareto_rows(metrics, tax_year)
+        rankings = get_rankings(tax_year)
+        page = rows[offset:offset + limit]
+        results = rankings.results(page)
+        # Record fields (employment_rate, ...) are not part of calculate_roi
+        for row, result in zip(page.tolist(), results):
+            for metric in metrics:
+                if metric not in result:
+                    result[metric] = rankings.values(metric)[row].item()
+        
+        end = offset + len(results)
+        return jsonify({
+            "success": True,
+            "metrics": [
+                {"metric": m, "better": "higher" if RANK_METRICS[m] == "desc" else "lower"}
+                for m in metrics
+            ],
+            "tax_year": tax_year,
+            "courses_considered": considered,
+            "frontier_size": len(rows),
+            "courses": results,
+            "next_cursor": encode_cursor(rankings.version, end) if end < len(rows) else None
+        })
+    except Exception as e:
+        print(f"Error in /pareto: {e}")
+        traceback.print_exc()
+        return jsonify({
+            "success": False,
+            "error": f"Pareto frontier failed: {str(e)}"
+        }), 500
+
+@app.route('/quiz/match')
+@conditional_on_data
+def quiz_match():
+    """Top course matches for a set of quiz answers, scored on the server"""
+    limit = request.args.get('limit', default=DEFAULT_MATCHES, type=int)
+    
+    try:
+        answers = parse_answers(request.args)
+        if not 1 <= limit <= MAX_MATCHES:
+            raise ValueError(f"'limit' must be between 1 and {MAX_MATCHES}")
+        tax_year = resolve_tax_year(request.args.get('tax_year', type=int))
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    
+    try:
+        return jsonify({
+            "success": True,
+            "answers": answers,
+            "tax_year": tax_year,
+            "matches": quiz_matches(answers, limit, tax_year)
+        })
+    except Exception as e:
+        print(f"Error in /quiz/match: {e}")
+        traceback.print_exc()
+        return jsonify({
+            "success": False,
+            "error": f"Quiz matching failed: {str(e)}"
+        }), 500
+
+def requested_filters():
+    """
+    (category filters, numeric ranges, filters matched by substring) from
+    the /query-style query parameters
+    """
+    field_match = request.args.get('field_match', 'exact')
+    if field_match not in ('exact', 'contains'):
+        raise ValueError("'field_match' must be 'exact' or 'contains'")
+    categories = {}
+    for name in CATEGORY_FILTERS:
+        values = [v for v in request.args.getlist(name) if v.strip()]
+        if values:
+            categories[name] = values
+    ranges = {}
+    for metric in RANGE_FILTERS:
+        low = request.args.get(f'min_{metric}', type=float)
+        high = request.args.get(f'max_{metric}', type=float)
+        if low is not None or high is not None:
+            ranges[metric] = (low, high)
+    return categories, ranges, ('field',) if field_match == 'contains' else ()
+
+@app.route('/query')
+@conditional_on_data
+def query():
+    """Filter courses on categories and numeric ranges, then sort and paginate"""
+    sort = request.args.get('sort', 'roi_5_years')
+    order = request.args.get('order', RANK_METRICS.get(sort, 'asc'))
+    limit = request.args.get('limit', default=20, type=int)
+    cursor = request.args.get('cursor')
+    
+    try:
+        categories, ranges, contains = requested_filters()
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort '{sort}'. Available: {', '.join(SORT_KEYS)}")
+        if order not in ('asc', 'desc'):
+            raise ValueError("'order' must be 'asc' or 'desc'")
+        if not 1 <= limit <= RANK_MAX_LIMIT:
+            raise ValueError(f"'limit' must be between 1 and {RANK_MAX_LIMIT}")
+        tax_year = resolve_tax_year(request.args.get('tax_year', type=int))
+        offset = decode_cursor(cursor, get_data_version()) if cursor else 0
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    
+    try:
+        rows, total, rankings = query_rows(categories, ranges, sort, order == 'desc', offset, limit, tax_year,
+                                           contains)
+        results = [analyze_course(result) for result in rankings.results(rows)]
+        
+        end = offset + len(results)
+        return jsonify({
+            "success": True,
+            "filters": {
+                **categories,
+                **{metric: {"min": low, "max": high} for metric, (low, high) in ranges.items()}
+            },
+            "sort": sort,
+            "order": order,
+            "tax_year": tax_year,
+            "total_courses": total,
+            "courses": results,
+            "next_cursor": encode_cursor(rankings.version, end) if end < total else None
+        })
+    except Exception as e:
+        print(f"Error in /query: {e}")
+        traceback.print_exc()
+        return jsonify({
+            "success": False,
+            "error": f"Query failed: {str(e)}"
+        }), 500
+
+def export_response(format_lines, mimetype, extension):
+    """Stream the analyzed courses matching the /query filters in one format"""
+    sort = request.args.get('sort', 'name')
+    order = request.args.get('order', RANK_METRICS.get(sort, 'asc'))
+    
+    try:
+        categories, ranges, contains = requested_filters()
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort '{sort}'. Available: {', '.join(SORT_KEYS)}")
+        if order not in ('asc', 'desc'):
+            raise ValueError("'order' must be 'asc' or 'desc'")
+        fields = parse_export_fields(request.args.get('fields'))
+        tax_year = resolve_tax_year(request.args.get('tax_year', type=int))
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    
+    try:
+        stats = get_catalogue_stats(tax_year)
+        rows, _, _ = query_rows(categories, ranges, sort, order == 'desc', 0, stats.course_count, tax_year,
+                                contains)
+        response = app.response_class(format_lines(export_records(stats, rows, fields), fields),
+                                      mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename="courses-{tax_year}.{extension}"'
+        return response
+    except Exception as e:
+        print(f"Error in /export.{extension}: {e}")
+        traceback.print_exc()
+        return jsonify({
+            "success": False,
+            "error": f"Export failed: {str(e)}"
+        }), 500
+
+@app.route('/export.ndjson')
+@conditional_on_data
+def export_ndjson():
+    """Every analyzed course (or the filtered ones) as newline-delimited JSON"""
+    return export_response(lambda records, fields: ndjson_lines(records), 'application/x-ndjson', 'ndjson')
+
+@app.route('/export.csv')
+@conditional_on_data
+def export_csv():
+    """Every analyzed course (or the filtered ones) as CSV"""
+    return export_response(csv_lines, 'text/csv', 'csv')
+
+# Fields of the course record included with each compared course
+COMPARE_DATA_FIELDS = [
+    'employment_rate', 'graduate_satisfaction', 'job_security', 'work_life_balance',
+    'industry_growth_rate', 'avg_class_size', 'internship_opportunities'
+]
+
+# Comparisons of more courses than this are streamed
+COMPARE_STREAM_THRESHOLD = 50
+
+def compared_courses(stats, rows):
+    """Yield analyzed /compare-multiple results for `rows`, a chunk at a time"""
+    table = stats.columns.table
+    for results, lifetimes in comparison_chunks(stats, rows):
+        chunk = []
+        for result, lifetime in zip(results, lifetimes):
+            result = analyze_course(result, lifetime)
+            result = add_comparison_context(result, stats)
+            record = table.record(result['course_name'])
+            result['course_data'] = {field: record.get(field) for field in COMPARE_DATA_FIELDS}
+            chunk.append(result)
+        yield chunk
+
+@app.route('/compare-multiple', methods=['POST', 'OPTIONS'])
+def compare_multiple():
+    """
+    Compare multiple courses - expects JSON body with course names.
+    
+    Send {"courses": [...]} (up to MAX_COMPARE_COURSES) or pick every course
+    of a {"university": ...} and/or {"field": ...}. Large comparisons are
+    streamed as they are computed.
+    """
+    
+    if request.method == 'OPTIONS':
+        return '', 204
+    
+    try:
+        data = request.get_json(silent=True)
+        
+        if not isinstance(data, dict) or not any(key in data for key in ('courses', 'university', 'field')):
             return jsonify({
                 "success": False,
-                "error": "Please provide at least 2 courses to compare"
+                "error": "Missing 'courses' in request body. Send JSON: {\"courses\": [\"Course 1\", \"Course 2\"]} "
+                         "or {\"university\": \"UCD\"} / {\"field\": \"Nursing\"}"
             }), 400
         
-        if len(course_list) > 5:
+        try:
+            tax_year = resolve_tax_year(data.get('tax_year'))
+        except ValueError as e:
             return jsonify({
                 "success": False,
-                "error": "Maximum 5 courses can be compared at once"
+                "error": str(e)
             }), 400
         
-        results = []
+        stats = get_catalogue_stats(tax_year)
+        rankings = get_rankings(tax_year)
         errors = []
         
-        for course_name in course_list:
+        if 'courses' in data:
+            course_list = data['courses']
+            
+            if not isinstance(course_list, list):
+                return jsonify({
+                    "success": False,
+                    "error": "'courses' must be an array"
+                }), 400
+            
+            if len(course_list) < 2:
+                return jsonify({
+                    "success": False,
+                    "error": "Please provide at least 2 courses to compare"
+                }), 400
+            
+            if len(course_list) > MAX_COMPARE_COURSES:
+                return jsonify({
+                    "success": False,
+                    "error": f"Maximum {MAX_COMPARE_COURSES} courses can be compared at once"
+                }), 400
+            
+            rows, errors = resolve_courses(course_list, stats.columns.table)
+        else:
+            for key in ('university', 'field'):
+                if data.get(key) is not None and not isinstance(data[key], str):
+                    return jsonify({
+                        "success": False,
+                        "error": f"'{key}' must be a string"
+                    }), 400
+            
             try:
-                result = calculate_roi(course_name)
-                result = analyze_course(result)
-                result = add_comparison_context(result)
-                
-                # Add course data
-                if course_name in COURSE_DATA:
-                    course_data = COURSE_DATA[course_name]
-                    result['course_data'] = {
-                        'employment_rate': course_data.get('employment_rate'),
-                        'graduate_satisfaction': course_data.get('graduate_satisfaction'),
-                        'job_security': course_data.get('job_security'),
-                        'work_life_balance': course_data.get('work_life_balance'),
-                        'industry_growth_rate': course_data.get('industry_growth_rate'),
-                        'avg_class_size': course_data.get('avg_class_size'),
-                        'internship_opportunities': course_data.get('internship_opportunities')
-                    }
-                
-                results.append(result)
+                rows = select_courses(data.get('university'), data.get('field'), tax_year)
             except ValueError as e:
-                errors.append({
-                    "course": course_name,
+                return jsonify({
+                    "success": False,
                     "error": str(e)
-                })
-            except Exception as e:
-                errors.append({
-                    "course": course_name,
-                    "error": f"Failed to calculate: {str(e)}"
-                })
+                }), 400
         
-        if not results:
+        if not len(rows):
             return jsonify({
                 "success": False,
                 "error": "No valid courses found",
@@ -481,32 +1293,47 @@ def compare_multiple():
             }), 400
         
         # Determine winners for each category
-        if len(results) >= 2:
-            best_roi = max(results, key=lambda x: x['roi_5_years'])
-            fastest_payback = min(results, key=lambda x: x['payback_years'])
-            lowest_cost = min(results, key=lambda x: x['total_cost'])
-            highest_salary = max(results, key=lambda x: x['starting_salary'])
-            
-            winners = {
-                'best_roi': best_roi['course_name'],
-                'fastest_payback': fastest_payback['course_name'],
-                'lowest_cost': lowest_cost['course_name'],
-                'highest_salary': highest_salary['course_name']
-            }
-        else:
-            winners = {}
+        names = stats.columns.names
+        winners = {}
+        metric_winner_names = {}
+        non_dominated_names = []
+        if len(rows) >= 2:
+            best = metric_winners(rankings, rows)
+            metric_winner_names = {metric: names[row] if row is not None else None
+                                   for metric, row in best.items()}
+            winners = {key: metric_winner_names[metric] for key, metric in WINNER_METRICS.items()}
+            # Courses no other compared course beats on all four at once
+            non_dominated_names = [names[row] for row in non_dominated(rankings, rows).tolist()]
         
-        response = {
+        header = {
             "success": True,
-            "total_compared": len(results),
-            "courses": results,
-            "winners": winners
+            "total_compared": len(rows),
+            "winners": winners,
+            "metric_winners": metric_winner_names,
+            "non_dominated": non_dominated_names
         }
-        
         if errors:
-            response["errors"] = errors
+            header["errors"] = errors
+        
+        if len(rows) <= COMPARE_STREAM_THRESHOLD:
+            courses = [result for chunk in compared_courses(stats, rows) for result in chunk]
+            return jsonify({**header, "courses": courses})
+        
+        def stream():
+            # The status line has gone out already: a failure part way
+            # through can only be logged, leaving the JSON incomplete
+            try:
+                yield app.json.dumps(header)[:-1] + ', "courses": ['
+                separator = ''
+                for chunk in compared_courses(stats, rows):
+                    yield separator + ', '.join(app.json.dumps(result) for result in chunk)
+                    separator = ', '
+                yield ']}'
+            except Exception as e:
+                print(f"Error streaming /compare-multiple: {e}")
+                traceback.print_exc()
         
-        return jsonify(response)
+        return app.response_class(stream(), mimetype='application/json')
     
     except Exception as e:
         print(f"Error in /compare-multiple: {e}")
@@ -522,7 +1349,7 @@ def not_found(e):
     return jsonify({
         "success": False,
         "error": "Endpoint not found",
-        "available_endpoints": ["/", "/api", "/courses", "/calculate", "/compare-multiple", "/calculator"]
+        "available_endpoints": list(API_ENDPOINTS)
     }), 404
 
 @app.errorhandler(500)
@@ -536,6 +1363,16 @@ def server_error(e):
 
 @app.errorhandler(Exception)
 def handle_exception(e):
+    if isinstance(e, HTTPException):
+        # Unknown paths only match the OPTIONS catch-all route, so they
+        # arrive here as a 405 rather than a 404
+        if e.code == 405 and set(e.valid_methods or ()) <= {'OPTIONS'}:
+            return not_found(e)
+        return jsonify({
+            "success": False,
+            "error": e.description
+        }), e.code
+    
     print(f"Unhandled exception: {e}")
     traceback.print_exc()
     return jsonify({
@@ -554,6 +1391,7 @@ if __name__ == '__main__':
     print("  - http://127.0.0.1:5000/api")
     print("  - http://127.0.0.1:5000/courses")
     print("  - http://127.0.0.1:5000/calculate?course=Computer Science - UCD")
+    print("  - http://127.0.0.1:5000/calculate-all")
     print("  - http://127.0.0.1:5000/compare-multiple (POST)")
     print("\n" + "=" * 70)
     
@@ -0,0 +1,335 @@
+# asgi.py
+# asyncio entry point serving the same routes as app.py
+#
+#   uvicorn asgi:application --workers 4
+#   gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:application
+#
+# One event loop per process holds every connection, so thousands of idle
+# keep-alive clients cost no threads. The Flask views are reused unchanged,
+# so responses are byte-for-byte those of the WSGI app. Requests answered
+# from something already built - /courses, /api, a cached /calculate, the
+# pages and assets - run straight on the loop; anything that may compute
+# (a /calculate miss, /compare-multiple, the catalogue-wide routes) runs on
+# a bounded thread pool. Once ASGI_MAX_PENDING requests are on the pool,
+# new ones get a 503 with Retry-After instead of an ever-growing queue.
+#
+# Settings (environment): ASGI_THREADS (pool threads, default 4),
+# ASGI_MAX_PENDING (default 64), ASGI_MAX_BODY (request body bytes,
+# default 8 MiB)
+
+import asyncio
+import io
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import MultiDict
+
+import app as web
+from course_data import get_data_version
+from static_assets import ASSET_PREFIX
+from tax import TAX_YEARS
+
+DEFAULT_THREADS = 4
+DEFAULT_MAX_PENDING = 64
+DEFAULT_MAX_BODY = 8 * 1024 * 1024
+
+# Seconds a client turned away with 503 is asked to wait
+RETRY_AFTER = 1
+
+# Answered from prebuilt assets or live counters, whatever the query string
+STATIC_PATHS = {'/', '/api', '/calculator', '/quiz', '/style.css', '/script.js'}
+
+
+class ClientDisconnected(Exception):
+    """The client went away before its request body arrived"""
+
+
+def runs_inline(method, path, query_string):
+    """
+    Whether a request is answered from something already built, so it can
+    run on the event loop instead of waiting for a pool thread.
+    """
+    if method == 'OPTIONS' or path in STATIC_PATHS or path.startswith(ASSET_PREFIX):
+        return True
+    if method not in ('GET', 'HEAD'):
+        return False
+    if path == '/courses':
+        return web.get_courses_body.cached_version() == get_data_version()
+    if path == '/calculate':
+        return calculate_is_cached(MultiDict(parse_qsl(query_string, keep_blank_values=True)))
+    return False
+
+
+def calculate_is_cached(args):
+    """Whether /calculate with these arguments is a result cache hit (or a quick 400)"""
+    course = args.get('course')
+    tax_year = args.get('tax_year', type=int)
+    if not course or (tax_year is not None and tax_year not in TAX_YEARS):
+        return True
+    return web.result_cache.contains(course, args.get('tuition', type=float),
+                                     args.get('years', type=int), tax_year)
+
+
+def wsgi_environ(scope, body):
+    """PEP 3333 environ for an ASGI HTTP scope and its request body"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] if server[1] is not None else 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    for name, value in scope.get('headers', []):
+        key = name.decode('latin-1').upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = 'HTTP_' + key
+        value = value.decode('latin-1')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    if body or 'CONTENT_LENGTH' in environ:
+        environ['CONTENT_LENGTH'] = str(len(body))
+    return environ
+
+
+def start_wsgi(wsgi_app, environ):
+    """
+    Call the WSGI app and take the first piece of its body.
+
+    Returns:
+        (status code, ASGI headers, body iterable, its iterator, first chunk
+        or None)
+    """
+    started = []
+
+    def start_response(status, headers, exc_info=None):
+        started[:] = [int(status.split(' ', 1)[0]),
+                      [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers]]
+
+    body = wsgi_app(environ, start_response)
+    iterator = iter(body)
+    first = next(iterator, None)
+    status, headers = started
+    return status, headers, body, iterator, first
+
+
+def content_length(headers):
+    for name, value in headers:
+        if name == b'content-length':
+            return int(value)
+    return None
+
+
+async def read_body(receive, limit):
+    """The whole request body, or None if it is larger than `limit` bytes"""
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise ClientDisconnected()
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > limit:
+            return None
+        chunks.append(chunk)
+        if not message.get('more_body', False):
+            return b''.join(chunks)
+
+
+async def send_json(send, status, payload, headers=()):
+    body = json.dumps(payload).encode()
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode()),
+                    (b'access-control-allow-origin', b'*'), *headers]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+class ASGIApp:
+    """
+    ASGI callable running a WSGI app on an event loop plus a bounded pool.
+
+    Until lifespan startup has warmed the caches (or `ready` is set by
+    hand), every request goes to the pool.
+    """
+
+    def __init__(self, wsgi_app, threads=DEFAULT_THREADS, max_pending=DEFAULT_MAX_PENDING,
+                 max_body=DEFAULT_MAX_BODY):
+        self.wsgi_app = wsgi_app
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='asgi')
+        self.max_pending = max_pending
+        self.max_body = max_body
+        self.ready = False
+        # Only touched from the event loop thread, so no lock
+        self.pending = 0
+        self.inline = 0
+        self.pooled = 0
+        self.rejected = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            await self.http(scope, receive, send)
+        elif scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await asyncio.get_running_loop().run_in_executor(self.pool, web.warm_caches)
+                except Exception as e:
+                    traceback.print_exc()
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                    return
+                self.ready = True
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.pool.shutdown(wait=False, cancel_futures=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def http(self, scope, receive, send):
+        declared = next((v for k, v in scope.get('headers', []) if k == b'content-length'), None)
+        try:
+            body = None if declared and int(declared) > self.max_body else await read_body(receive, self.max_body)
+        except ClientDisconnected:
+            return
+        if body is None:
+            await send_json(send, 413, {
+                "success": False,
+                "error": f"Request body larger than {self.max_body} bytes"
+            })
+            return
+
+        environ = wsgi_environ(scope, body)
+        if self.ready and runs_inline(environ['REQUEST_METHOD'], environ['PATH_INFO'], environ['QUERY_STRING']):
+            self.inline += 1
+            await self.respond(environ, receive, send, self.run_inline)
+            return
+
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            await send_json(send, 503, {
+                "success": False,
+                "error": "Server busy, please retry shortly"
+            }, [(b'retry-after', str(RETRY_AFTER).encode())])
+            return
+        self.pending += 1
+        self.pooled += 1
+        try:
+            await self.respond(environ, receive, send, self.run_pooled)
+        finally:
+            self.pending -= 1
+
+    async def run_inline(self, func, *args):
+        return func(*args)
+
+    async def run_pooled(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+
+    async def respond(self, environ, receive, send, run):
+        """
+        Send the WSGI app's response, a chunk at a time.
+
+        Every call into the app (and every pull from a streamed body) goes
+        through `run`; a streamed body stops early if the client disconnects.
+        """
+        status, headers, body, iterator, chunk = await run(start_wsgi, self.wsgi_app, environ)
+        length = content_length(headers)
+        disconnect = None
+        try:
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            sent = 0
+            while chunk is not None:
+                sent += len(chunk)
+                done = length is not None and sent >= length
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': not done})
+                if done:
+                    return
+                if disconnect is None:
+                    disconnect = asyncio.ensure_future(receive())
+                elif disconnect.done():
+                    return
+                chunk = await run(next, iterator, None)
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if disconnect is not None:
+                disconnect.cancel()
+            if hasattr(body, 'close'):
+                await run(body.close)
+
+    def stats(self):
+        return {
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "inline": self.inline,
+            "pooled": self.pooled,
+            "rejected": self.rejected
+        }
+
+
+async def call(application, method, path, query_string=b'', body=b'', headers=()):
+    """
+    Run one request through an ASGI app in-process (the asyncio counterpart
+    of app.test_client()).
+
+    Returns:
+        (status code, {header name: value}, body bytes)
+    """
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '',
+        'query_string': query_string, 'client': ('127.0.0.1', 50000), 'server': ('localhost', 8000),
+        'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers]
+    }
+    requests = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    finished = asyncio.Event()
+    messages = []
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await finished.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+
+    try:
+        await application(scope, receive, send)
+    finally:
+        finished.set()
+    start = messages[0]
+    response_headers = {k.decode('latin-1'): v.decode('latin-1') for k, v in start['headers']}
+    return start['status'], response_headers, b''.join(m.get('body', b'') for m in messages[1:])
+
+
+application = ASGIApp(
+    web.app,
+    threads=max(1, int(os.environ.get('ASGI_THREADS', DEFAULT_THREADS))),
+    max_pending=max(1, int(os.environ.get('ASGI_MAX_PENDING', DEFAULT_MAX_PENDING))),
+    max_body=int(os.environ.get('ASGI_MAX_BODY', DEFAULT_MAX_BODY))
+)
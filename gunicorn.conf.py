@@ -0,0 +1,43 @@
+# gunicorn.conf.py
+# Pre-fork setup: build the catalogue and everything derived from it once
+# in the master, then fork workers that share those pages
+#
+# The catalogue is moved into shared memory (COURSE_DATA_SHARED) and the
+# Python objects built at startup are frozen out of the garbage collector,
+# whose bookkeeping writes would otherwise copy every page into each worker.
+# Check the result with: python logic/process_memory.py <master pid>
+
+import gc
+import os
+
+preload_app = True
+
+os.environ.setdefault("COURSE_DATA_SHARED", "1")
+
+# No collections in the master while the app is loading, so startup
+# objects stay packed together instead of filling freed slots
+gc.disable()
+
+
+def when_ready(server):
+    import app
+    app.warm_caches()
+    server.log.info("Catalogue, indexes and responses built in master")
+
+
+def pre_fork(server, worker):
+    # Move everything allocated so far to the permanent generation
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    gc.enable()
+
+
+def post_worker_init(worker):
+    from process_memory import process_memory
+    usage = process_memory()
+    if usage and "pss_kb" in usage:
+        worker.log.info("Worker %s ready: RSS %.1f MB, PSS %.1f MB, private %.1f MB",
+                        usage["pid"], usage["rss_kb"] / 1024, usage["pss_kb"] / 1024,
+                        usage["private_kb"] / 1024)
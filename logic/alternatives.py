@@ -0,0 +1,129 @@
+# alternatives.py
+# "Consider this course instead" candidates, prepared once per field
+#
+# suggest_alternative() used to scan every course in the field on each call.
+# Here each field's courses are ordered once, best ROI first (row order
+# breaking ties). The best other course is then one of the first two in
+# the field. The courses with a "similar ROI" are always a prefix of that
+# order, so the cheapest of them comes from a running minimum.
+# best_for_all() answers every course in the catalogue with a few array
+# passes per field.
+
+import numpy as np
+
+from course_data import cached_per_data_version
+from catalogue_stats import get_catalogue_stats
+from tax import resolve_tax_year
+
+# Another course is suggested if its ROI is this much higher...
+BETTER_ROI = 1.1
+# ...or if it costs this much less with at least this share of the ROI
+CHEAPER_COST = 0.9
+SIMILAR_ROI = 0.95
+
+# Kinds of suggestion
+NO_ALTERNATIVE = 0
+BETTER = 1
+CHEAPER = 2
+
+
+class FieldAlternatives:
+    """
+    Per-field candidates for suggest_alternative.
+
+    A field is a case-insensitive table.index("field") bucket. Only
+    `stats`' default results are compared against.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+        table = stats.columns.table
+        self.roi = stats.values["roi_5_years"]
+        self.cost = stats.values["total_cost"]
+        self.group_of = np.full(stats.course_count, -1, dtype=np.int64)
+
+        # Per field: rows best ROI first, their negated ROIs (ascending,
+        # NaN last) and a running minimum of (cost, row) ranks
+        self._rows = []
+        self._neg_roi = []
+        self._cheapest = []
+        for group, (_, rows) in enumerate(table.index("field").items()):
+            order = rows[np.lexsort((rows, -self.roi[rows]))]
+            self.group_of[order] = group
+            self._rows.append(order)
+            self._neg_roi.append(-self.roi[order])
+
+            by_cost = np.lexsort((order, self.cost[order]))
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[by_cost] = np.arange(len(order))
+            self._cheapest.append((by_cost, np.minimum.accumulate(rank)))
+
+    def best_for(self, row, roi, cost):
+        """
+        The suggestion for a course with this ROI and cost (which may come
+        from overridden inputs), compared with the other courses in its field.
+
+        Returns:
+            (kind, other row or None, ROI gain or cost saving)
+        """
+        group = self.group_of[row]
+        if group < 0 or np.isnan(roi):
+            return NO_ALTERNATIVE, None, None
+        rows = self._rows[group]
+        top = rows[1] if rows[0] == row and len(rows) > 1 else rows[0]
+        if top != row and self.roi[top] > roi * BETTER_ROI:
+            return BETTER, int(top), (self.roi[top] - roi).item()
+
+        similar = rows[:np.searchsorted(self._neg_roi[group], -roi * SIMILAR_ROI, side="left")]
+        similar = similar[(similar != row) & (self.cost[similar] < cost * CHEAPER_COST)]
+        if not len(similar):
+            return NO_ALTERNATIVE, None, None
+        cheapest = similar[np.lexsort((similar, self.cost[similar]))[0]]
+        return CHEAPER, int(cheapest), (cost - self.cost[cheapest]).item()
+
+    def best_for_all(self):
+        """
+        best_for() of every course at its default results, as arrays.
+
+        Returns:
+            (kinds, other rows (-1 for none), ROI gains or cost savings)
+        """
+        count = self.stats.course_count
+        kinds = np.full(count, NO_ALTERNATIVE, dtype=np.int8)
+        others = np.full(count, -1, dtype=np.int64)
+        amounts = np.zeros(count, dtype=np.float64)
+
+        for rows, neg_roi, (by_cost, running) in zip(self._rows, self._neg_roi, self._cheapest):
+            roi, cost = self.roi[rows], self.cost[rows]
+
+            # Best ROI among the others: the first course, or the second
+            # for the first course itself
+            top = np.full(len(rows), rows[0])
+            if len(rows) > 1:
+                top[0] = rows[1]
+            better = (top != rows) & (self.roi[top] > roi * BETTER_ROI)
+
+            # A course's own cost never passes the cost test (costs are not
+            # negative), so the cheapest similar course may include it
+            similar = np.searchsorted(neg_roi, -roi * SIMILAR_ROI, side="left")
+            similar[np.isnan(roi)] = 0
+            cheapest = rows[by_cost[running[np.maximum(similar - 1, 0)]]]
+            cheaper = ~better & (similar > 0) & (self.cost[cheapest] < cost * CHEAPER_COST)
+
+            kinds[rows[better]] = BETTER
+            others[rows[better]] = top[better]
+            amounts[rows[better]] = self.roi[top[better]] - roi[better]
+            kinds[rows[cheaper]] = CHEAPER
+            others[rows[cheaper]] = cheapest[cheaper]
+            amounts[rows[cheaper]] = cost[cheaper] - self.cost[cheapest[cheaper]]
+        return kinds, others, amounts
+
+
+@cached_per_data_version
+def _build_field_alternatives(tax_year):
+    return FieldAlternatives(get_catalogue_stats(tax_year))
+
+
+def get_field_alternatives(tax_year=None):
+    """FieldAlternatives for the current data version and tax year"""
+    return _build_field_alternatives(resolve_tax_year(tax_year))
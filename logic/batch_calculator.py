@@ -0,0 +1,245 @@
+# batch_calculator.py
+# Vectorized ROI engine - computes the whole catalogue in one NumPy pass
+# calculate_roi in roi_calculator.py stays the reference implementation;
+# everything here must agree with it after rounding
+
+import numpy as np
+
+from course_data import cached_per_data_version, get_course_table
+from course_table import MISSING, typecode_of
+from lifetime import project_lifetime_batch
+from tax import get_tax_table, net_earnings_5_years_batch, resolve_tax_year
+
+PAYBACK_LABELS = np.array(["Fast payback", "Medium payback", "Slow payback"])
+ROI_RATINGS = np.array(["Excellent", "Very Good", "Good", "Fair"])
+ROI_STARS = np.array([5, 4, 3, 2])
+
+
+class CourseColumns:
+    """Numeric fields of the course table as NumPy arrays, indexed by row id"""
+
+    def __init__(self, table):
+        self.version = table.version
+        self.table = table
+        self.names = table.names
+        self.university = table.category_column("university")
+
+        def column(field, dtype):
+            return np.asarray(table.column(field), dtype=dtype)
+
+        self.starting_salary = column("starting_salary", np.int64)
+        self.salary_5_years = column("salary_5_years", np.int64)
+        self.growth_rate = column("growth_rate", np.float64)
+        self.typical_tuition = column("typical_tuition", np.int64)
+        self.course_length = column("course_length", np.int64)
+        self._take_home = {}
+        self._numeric = {}
+
+    def take_home(self, tax_year):
+        """
+        (net starting salary, net 5-year earnings) for every course.
+
+        Memoized per tax year: salaries only change with the data, so each
+        year's tax is worked out once per data version.
+        """
+        cached = self._take_home.get(tax_year)
+        if cached is None:
+            cached = self._take_home[tax_year] = (
+                get_tax_table(tax_year).net_batch(self.starting_salary),
+                net_earnings_5_years_batch(self.starting_salary, self.salary_5_years, tax_year)
+            )
+        return cached
+
+    def numeric(self, field):
+        """A numeric table field as float64, NaN where a course has no value (memoized)"""
+        values = self._numeric.get(field)
+        if values is None:
+            column = self.table.column(field)
+            values = np.asarray(column, dtype=np.float64)
+            typecode = typecode_of(column)
+            if typecode != "d":
+                values[np.asarray(column) == MISSING[typecode]] = np.nan
+            self._numeric[field] = values
+        return values
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, course_name):
+        return course_name in self.table
+
+    def rows_for(self, course_list):
+        """Row ids for the given course names (unknown names are skipped)"""
+        rows = [self.table.row_of(c) for c in course_list]
+        return np.array([row for row in rows if row is not None], dtype=np.int64)
+
+
+@cached_per_data_version
+def get_course_columns():
+    """Return the CourseColumns for the current data version"""
+    return CourseColumns(get_course_table())
+
+
+def round_like_python(values, ndigits=0):
+    """
+    Round an array the way Python's round() rounds each element.
+
+    np.round scales by 10**ndigits before rounding, which can land on the
+    other side of a .5 tie than Python's correctly rounded round(). The
+    handful of values that sit right on a tie are redone in Python.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, ndigits)
+    scaled = values * 10.0 ** ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        for i in np.flatnonzero(near_tie):
+            rounded[i] = round(float(values[i]), ndigits)
+    return rounded
+
+
+def _apply_override(default, override):
+    """Use override values where given; NaN (or None) keeps the default"""
+    if override is None:
+        return default
+    override = np.asarray(override, dtype=np.float64)
+    if override.ndim == 0:
+        override = np.full(len(default), float(override))
+    if len(override) != len(default):
+        raise ValueError(f"Override has {len(override)} values, expected {len(default)}")
+    return np.where(np.isnan(override), default, override)
+
+
+def calculate_roi_batch(tuition_per_year=None, course_length=None, rows=None, columns=None,
+                        tax_year=None):
+    """
+    Vectorized calculate_roi for many courses at once.
+
+    Args:
+        tuition_per_year: None, a scalar, or an array with one value per row
+                          (NaN means "use the course default")
+        course_length: same as tuition_per_year, for course length in years
+        rows: optional array of row ids to restrict the calculation to
+        columns: CourseColumns to use (defaults to the current data)
+        tax_year: tax rules to apply (defaults to the latest year)
+
+    Returns:
+        dict of arrays, one entry per row. Values are unrounded except where
+        calculate_roi itself feeds rounded numbers forward.
+    """
+    if columns is None:
+        columns = get_course_columns()
+    if rows is None:
+        rows = np.arange(len(columns))
+    tax_year = resolve_tax_year(tax_year)
+    net_income, net_earnings_5y = columns.take_home(tax_year)
+
+    starting_salary = columns.starting_salary[rows]
+    salary_5_years = columns.salary_5_years[rows]
+
+    tuition = _apply_override(columns.typical_tuition[rows], tuition_per_year)
+    length = _apply_override(columns.course_length[rows], course_length).astype(np.int64)
+
+    # Same formulas, in the same order, as calculate_roi
+    total_cost = tuition * length
+    annual_net_income = net_income[rows]
+    payback_years = total_cost / annual_net_income
+    total_earnings_5y = net_earnings_5y[rows]
+    roi_percentage = ((total_earnings_5y - total_cost) / total_cost) * 100
+    lifetime_roi = project_lifetime_batch(starting_salary, salary_5_years, total_cost)["roi"]
+
+    return {
+        "rows": rows,
+        "total_cost": total_cost,
+        "tuition_per_year": tuition,
+        "course_length": length,
+        "starting_salary": starting_salary,
+        "salary_5_years": salary_5_years,
+        "annual_net_income": annual_net_income,
+        "payback_years": payback_years,
+        "roi_5_years": roi_percentage,
+        "lifetime_roi": lifetime_roi,
+        "tax_year": tax_year
+    }
+
+
+def analyze_batch(batch):
+    """
+    Vectorized lifetime figures and labels from analyze_course.
+
+    Works from the rounded values calculate_roi returns, exactly like
+    analyze_course does.
+    """
+    total_cost = round_like_python(batch["total_cost"], 2)
+    payback = round_like_python(batch["payback_years"], 1)
+    roi = round_like_python(batch["roi_5_years"], 1)
+    starting_salary = batch["starting_salary"]
+    year_5_salary = batch["salary_5_years"]
+
+    payback_code = np.select([payback < 1.5, payback < 2.5], [0, 1], default=2)
+    roi_code = np.select([roi > 400, roi > 300, roi > 200], [0, 1, 2], default=3)
+
+    lifetime = project_lifetime_batch(starting_salary, year_5_salary, total_cost)
+
+    return {
+        "payback_label": PAYBACK_LABELS[payback_code],
+        "roi_rating": ROI_RATINGS[roi_code],
+        "roi_stars": ROI_STARS[roi_code],
+        "lifetime": {
+            "total_earnings": round_like_python(lifetime["total_earnings"], 0),
+            "profit": round_like_python(lifetime["profit"], 0),
+            "roi": round_like_python(lifetime["roi"], 0),
+            "times_earned_back": round_like_python(lifetime["times_earned_back"], 1)
+        }
+    }
+
+
+def batch_results(batch, columns=None):
+    """Turn a calculate_roi_batch result into calculate_roi-style dicts"""
+    if columns is None:
+        columns = get_course_columns()
+
+    # calculate_roi's round(total_cost, 2) leaves an int cost (no overrides) an int
+    total_cost = batch["total_cost"]
+    if total_cost.dtype.kind == "i":
+        total_cost = total_cost.tolist()
+    else:
+        total_cost = round_like_python(total_cost, 2).tolist()
+    net_income = round_like_python(batch["annual_net_income"], 2).tolist()
+    payback = round_like_python(batch["payback_years"], 1).tolist()
+    roi = round_like_python(batch["roi_5_years"], 1).tolist()
+    lifetime_roi = round_like_python(batch["lifetime_roi"], 0).tolist()
+    starting_salary = batch["starting_salary"].tolist()
+    salary_5_years = batch["salary_5_years"].tolist()
+    length = batch["course_length"].tolist()
+    tuition = batch["tuition_per_year"].tolist()
+
+    results = []
+    for i, row in enumerate(batch["rows"].tolist()):
+        results.append({
+            "course_name": columns.names[row],
+            "university": columns.university[row],
+            "total_cost": total_cost[i],
+            "starting_salary": starting_salary[i],
+            "annual_net_income": net_income[i],
+            "salary_after_5_years": salary_5_years[i],
+            "payback_years": payback[i],
+            "roi_5_years": roi[i],
+            "lifetime_roi": lifetime_roi[i],
+            "course_length": length[i],
+            "tuition_per_year": tuition[i],
+            "tax_year": batch["tax_year"]
+        })
+    return results
+
+
+def select_rows(batch, order):
+    """Reorder/select every array in a calculate_roi_batch result"""
+    return {key: values[order] if isinstance(values, np.ndarray) else values
+            for key, values in batch.items()}
+
+
+def ranked_rows(values, descending=False):
+    """Row positions ordered by value, keeping ties in course-name order"""
+    keys = -values if descending else values
+    return np.argsort(keys, kind="stable")
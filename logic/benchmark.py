@@ -0,0 +1,283 @@
+# benchmark.py
+# Timing suite for the ROI engine, the analysis pipeline and the HTTP routes
+#
+# Usage (from the repo root):
+#   python logic/benchmark.py                               # real catalogue + 10k/100k/1M
+#   python logic/benchmark.py --sizes real,10000 --output bench.json
+#   python logic/benchmark.py --baseline bench.json --threshold 0.25
+#
+# Exits with status 1 when any benchmark is slower than the baseline by
+# more than the threshold (0.25 = 25% slower)
+
+import gc
+import os
+import asyncio
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+from itertools import cycle
+from urllib.parse import urlencode
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+import app as web
+from asgi import ASGIApp, call as asgi_call
+from course_data import COURSE_RECORDS, get_course_table, install_course_table
+from course_table import CourseTable
+from catalogue_generator import generate_courses
+from roi_calculator import calculate_roi, compare_courses, get_top_roi_courses
+from catalogue_stats import get_catalogue_stats
+from batch_calculator import get_course_columns
+
+DEFAULT_SIZES = ["real", "10000", "100000", "1000000"]
+DEFAULT_THRESHOLD = 0.25
+SAMPLE_COURSES = 200        # distinct courses cycled through per benchmark
+LARGE_COMPARISON = 500      # courses in route_compare_500 (skipped on smaller catalogues)
+
+client = web.app.test_client()
+
+# The same routes through the asyncio entry point, for comparison with route_*
+asgi_app = ASGIApp(web.app)
+asgi_app.ready = True
+asgi_loop = asyncio.new_event_loop()
+
+
+def asgi_get(path, **params):
+    query = urlencode(params).encode()
+    return asgi_loop.run_until_complete(asgi_call(asgi_app, 'GET', path, query))
+
+
+# ==================== TIMING ====================
+
+def time_call(func, min_round=0.02, rounds=5):
+    """
+    Per-call time of func() in milliseconds.
+
+    Calls are batched so each round takes at least `min_round` seconds;
+    the median round is reported (min is kept as a noise-free reference).
+    Garbage collection is paused while timing, as timeit does.
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _time_rounds(func, min_round, rounds)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _time_rounds(func, min_round, rounds):
+    func()      # untimed warm-up call
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_round or number >= 100000:
+            break
+        number *= 10 if elapsed < min_round / 10 else 2
+
+    per_call = [elapsed / number]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - start) / number)
+
+    return {
+        "median_ms": round(statistics.median(per_call) * 1000, 6),
+        "min_ms": round(min(per_call) * 1000, 6),
+        "calls": number * rounds
+    }
+
+
+def _cycled(values):
+    iterator = cycle(values)
+    return lambda: next(iterator)
+
+
+def build_benchmarks(courses, large_group=()):
+    """
+    {benchmark name: zero-argument callable} over the active catalogue;
+    route_compare_500 only when `large_group` has LARGE_COMPARISON courses
+    """
+    next_course = _cycled(courses)
+    results = [calculate_roi(c) for c in courses]
+    next_result = _cycled(results)
+    groups = [courses[i:i + 5] for i in range(0, len(courses) - 4, 5)] or [courses[:5]]
+    next_group = _cycled(groups)
+
+    def cold_calculate_route():
+        web.result_cache.clear()
+        return client.get('/calculate', query_string={'course': next_course()})
+
+    warmed = []
+    def warm_result_cache():
+        if not warmed:
+            for course in courses:
+                client.get('/calculate', query_string={'course': course})
+            warmed.append(True)
+
+    def cached_calculate_route():
+        warm_result_cache()
+        return client.get('/calculate', query_string={'course': next_course()})
+
+    def asgi_cached_calculate():
+        warm_result_cache()
+        return asgi_get('/calculate', course=next_course())
+
+    benchmarks = {
+        "calculate_roi": lambda: calculate_roi(next_course()),
+        "analyze_course": lambda: web.analyze_course(dict(next_result())),
+        "add_comparison_context": lambda: web.add_comparison_context(dict(next_result())),
+        "suggest_alternative": lambda: web.suggest_alternative(next_result()),
+        "compare_courses": lambda: compare_courses(next_group()),
+        "get_top_roi_courses": lambda: get_top_roi_courses(10),
+        "route_calculate": cold_calculate_route,
+        "route_calculate_cached": cached_calculate_route,
+        "route_compare_multiple": lambda: client.post('/compare-multiple', json={'courses': next_group()}),
+        "route_courses": lambda: client.get('/courses'),
+        "asgi_courses": lambda: asgi_get('/courses'),
+        "asgi_calculate_cached": asgi_cached_calculate,
+        "route_rank_university": lambda: client.get('/rank', query_string={
+            'metric': 'payback_years', 'university': next_result()['university']
+        }),
+        "route_query": lambda: client.get('/query', query_string={
+            'university': next_result()['university'], 'skills_demand': ['High', 'Very High'],
+            'min_starting_salary': 30000, 'max_payback_years': 2, 'sort': 'roi_5_years'
+        }),
+        "route_pareto": lambda: client.get('/pareto', query_string={
+            'metrics': 'total_cost,roi_5_years,payback_years,employment_rate'
+        }),
+        "route_quiz_match": lambda: client.get('/quiz/match', query_string={
+            'goal': 'high-salary', 'field': 'technology', 'budget': 9000, 'length': 4,
+            'location': 'dublin', 'work_style': 'remote', 'demand': 8, 'international': 'yes'
+        })
+    }
+    if len(large_group) == LARGE_COMPARISON:
+        benchmarks["route_compare_500"] = lambda: client.post('/compare-multiple', json={
+            'courses': list(large_group)
+        }).get_data()
+    return benchmarks
+
+
+def run_size(items, only=None):
+    """Install a catalogue, warm its caches and time every benchmark on it"""
+    start = time.perf_counter()
+    install_course_table(CourseTable.from_items(items))
+    get_catalogue_stats()
+    get_course_columns()
+    setup = time.perf_counter() - start
+
+    names = get_course_table().names
+    print(f"\n📊 {len(names)} courses")
+    rng = random.Random(len(names))
+    courses = rng.sample(list(names), min(SAMPLE_COURSES, len(names)))
+    large_group = rng.sample(list(names), min(LARGE_COMPARISON, len(names)))
+
+    timings = {}
+    for name, func in build_benchmarks(courses, large_group).items():
+        if only and name not in only:
+            continue
+        timings[name] = time_call(func)
+        print(f"  {name:<26} {timings[name]['median_ms']:>12.4f} ms")
+    return {"courses": len(names), "setup_s": round(setup, 3), "benchmarks": timings}
+
+
+def run_suite(sizes, only=None):
+    """Run every benchmark at every catalogue size, restoring the real catalogue after"""
+    original = get_course_table()
+    results = {}
+    try:
+        for size in sizes:
+            items = COURSE_RECORDS.items() if size == "real" else generate_courses(int(size))
+            results[size] = run_size(items, only)
+    finally:
+        install_course_table(CourseTable.from_records(original.to_records()))
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform()
+        },
+        "results": results
+    }
+
+
+# ==================== REGRESSION CHECK ====================
+
+def find_regressions(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Benchmarks whose median is more than `threshold` slower than the baseline.
+
+    Only sizes and benchmarks present in both runs are compared.
+
+    Returns:
+        list of dicts with size, benchmark, baseline_ms, current_ms and slowdown
+    """
+    regressions = []
+    for size, run in current["results"].items():
+        previous = baseline["results"].get(size)
+        if previous is None:
+            continue
+        for name, timing in run["benchmarks"].items():
+            before = previous["benchmarks"].get(name)
+            if before is None or before["median_ms"] <= 0:
+                continue
+            slowdown = timing["median_ms"] / before["median_ms"] - 1
+            if slowdown > threshold:
+                regressions.append({
+                    "size": size,
+                    "benchmark": name,
+                    "baseline_ms": before["median_ms"],
+                    "current_ms": timing["median_ms"],
+                    "slowdown": round(slowdown, 3)
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ROI calculator")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES),
+                        help="Comma-separated catalogue sizes; 'real' is the built-in catalogue")
+    parser.add_argument("--only", help="Comma-separated benchmark names to run")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a previous results file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before failing (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    only = set(args.only.split(",")) if args.only else None
+    results = run_suite(args.sizes.split(","), only)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}:")
+            for r in regressions:
+                print(f"  [{r['size']}] {r['benchmark']}: {r['baseline_ms']:.4f} ms -> "
+                      f"{r['current_ms']:.4f} ms (+{r['slowdown']:.0%})")
+            return 1
+        print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
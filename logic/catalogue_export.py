@@ -0,0 +1,191 @@
+# catalogue_export.py
+# Streaming export of the analyzed catalogue (NDJSON or CSV)
+#
+# export_records() is a generator: it works through the selected rows a
+# chunk at a time (batch ROI results, lifetime figures and record fields
+# all sliced from column arrays) and yields one flat record per course, so
+# memory stays the same however many courses are exported. The first
+# chunks are small so the first lines go out straight away.
+
+import csv
+import io
+import json
+import math
+
+import numpy as np
+
+from batch_calculator import analyze_batch, batch_results
+from course_table import COLD_LIST_FIELDS, MISSING, typecode_of
+
+# calculate_roi result keys
+RESULT_FIELDS = [
+    "course_name", "university", "total_cost", "starting_salary", "annual_net_income",
+    "salary_after_5_years", "payback_years", "roi_5_years", "lifetime_roi", "course_length",
+    "tuition_per_year", "tax_year"
+]
+
+# analyze_course labels and lifetime figures, flattened
+ANALYSIS_FIELDS = [
+    "payback_label", "roi_rating", "roi_stars", "lifetime_total_earnings", "lifetime_profit",
+    "lifetime_times_earned_back"
+]
+
+# Course record fields (list fields are joined with "; " in CSV)
+RECORD_FIELDS = [
+    "field", "university_code", "employment_rate", "graduate_satisfaction", "job_security",
+    "work_life_balance", "career_progression", "skills_demand", "remote_work_availability",
+    "further_study_rate", "international_opportunities", "industry_growth_rate", "avg_class_size",
+    "internship_opportunities", "growth_rate", "top_employers", "typical_roles", "source"
+]
+
+EXPORT_FIELDS = RESULT_FIELDS + ANALYSIS_FIELDS + RECORD_FIELDS
+
+# Courses per chunk: the first chunk is small, then each one doubles
+FIRST_CHUNK = 64
+MAX_CHUNK = 4096
+
+# Separator for list fields in CSV cells
+CSV_LIST_SEPARATOR = "; "
+
+
+def parse_fields(text):
+    """
+    Export fields from "a,b,c" (every field when empty), in the order given.
+
+    Raises:
+        ValueError: for an unknown or repeated field
+    """
+    if not text:
+        return list(EXPORT_FIELDS)
+    fields = [f.strip() for f in text.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in EXPORT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field '{unknown[0]}'. Available fields: {', '.join(EXPORT_FIELDS)}")
+    if len(set(fields)) != len(fields):
+        raise ValueError("Each field can only be listed once")
+    return fields
+
+
+def _chunks(rows):
+    size, start = FIRST_CHUNK, 0
+    while start < len(rows):
+        yield rows[start:start + size]
+        start += size
+        size = min(size * 2, MAX_CHUNK)
+
+
+def record_values(table, field, rows):
+    """One record field for several rows, None where missing (like table.value)"""
+    if field == "startup_salary_range":
+        lows = record_values(table, "salary_range_min", rows)
+        highs = record_values(table, "salary_range_max", rows)
+        return [None if low is None and high is None else {"min": low, "max": high}
+                for low, high in zip(lows, highs)]
+    try:
+        column = table.column(field)
+    except KeyError:
+        column = None
+    if column is None:
+        categories = table.category_column(field)
+        values = categories.categories
+        return [values[code] for code in np.asarray(categories.codes)[rows].tolist()]
+
+    values = np.asarray(column)[rows]
+    typecode = typecode_of(column)
+    missing = np.isnan(values) if typecode == "d" else values == MISSING[typecode]
+    values = values.tolist()
+    for i in np.flatnonzero(missing).tolist():
+        values[i] = None
+    return values
+
+
+def export_records(stats, rows, fields=None):
+    """
+    Yield one flat {field: value} dict per row, in the order of `rows`.
+
+    Args:
+        stats: CatalogueStats to take the results from (fixes the data
+            version and tax year for the whole export)
+        rows: row ids to export
+        fields: EXPORT_FIELDS to include (default: all)
+    """
+    fields = list(EXPORT_FIELDS) if fields is None else fields
+    table = stats.columns.table
+    wanted = set(fields)
+    need_results = bool(wanted & set(RESULT_FIELDS))
+    need_analysis = bool(wanted & set(ANALYSIS_FIELDS))
+    record_fields = [f for f in RECORD_FIELDS if f in wanted]
+
+    for chunk in _chunks(rows):
+        batch = stats.batch_for(chunk)
+        columns = {}
+        if need_results:
+            results = batch_results(batch, stats.columns)
+            for field in RESULT_FIELDS:
+                if field in wanted:
+                    columns[field] = [result[field] for result in results]
+        if need_analysis:
+            analysis = analyze_batch(batch)
+            columns["payback_label"] = analysis["payback_label"].tolist()
+            columns["roi_rating"] = analysis["roi_rating"].tolist()
+            columns["roi_stars"] = analysis["roi_stars"].tolist()
+            for key in ("total_earnings", "profit", "times_earned_back"):
+                columns[f"lifetime_{key}"] = analysis["lifetime"][key].tolist()
+        for field in record_fields:
+            columns[field] = record_values(table, field, chunk)
+
+        selected = [columns[field] for field in fields]
+        for values in zip(*selected):
+            yield dict(zip(fields, values))
+
+
+# Rejects NaN/inf (not valid JSON) instead of writing them
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, allow_nan=False)
+
+
+def _json_line(record):
+    try:
+        return _JSON_ENCODER.encode(record) + "\n"
+    except ValueError:
+        # Rare: a non-finite figure becomes null
+        return _JSON_ENCODER.encode({k: None if isinstance(v, float) and not math.isfinite(v) else v
+                                     for k, v in record.items()}) + "\n"
+
+
+def ndjson_lines(records):
+    """Yield the records as lines of JSON, a few dozen lines at a time"""
+    lines = []
+    for record in records:
+        lines.append(_json_line(record))
+        if len(lines) == FIRST_CHUNK:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def csv_lines(records, fields):
+    """Yield the CSV header, then the records a few dozen lines at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield _drain(buffer)
+
+    list_fields = [f for f in fields if f in COLD_LIST_FIELDS]
+    written = 0
+    for record in records:
+        for field in list_fields:
+            if record[field] is not None:
+                record[field] = CSV_LIST_SEPARATOR.join(record[field])
+        writer.writerow(["" if v is None else v for v in record.values()])
+        written += 1
+        if written % FIRST_CHUNK == 0:
+            yield _drain(buffer)
+    yield _drain(buffer)
+
+
+def _drain(buffer):
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
@@ -0,0 +1,51 @@
+# catalogue_file.py
+# Reading and writing course catalogues as NDJSON
+# One course per line: {"course": "<name>", "data": {<record>}}
+# Files are written to a temporary path and renamed into place, so a
+# reader never sees a half-written catalogue
+
+import os
+import json
+
+from course_table import CourseTable
+
+
+def write_catalogue(path, items):
+    """
+    Stream (course_name, record) pairs to an NDJSON file.
+
+    Returns:
+        number of courses written
+    """
+    temp_path = f"{path}.tmp"
+    count = 0
+    with open(temp_path, "w", encoding="utf-8") as f:
+        for name, record in items:
+            f.write(json.dumps({"course": name, "data": record}, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    os.replace(temp_path, path)
+    return count
+
+
+def read_catalogue(path):
+    """
+    Yield (course_name, record) pairs from an NDJSON catalogue.
+
+    Raises:
+        ValueError: on a line that is not a {"course", "data"} object
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                yield entry["course"], entry["data"]
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"{path}:{line_number}: invalid catalogue entry ({e})") from e
+
+
+def load_catalogue(path, version=None):
+    """Build a CourseTable from an NDJSON catalogue without holding every record at once"""
+    return CourseTable.from_items(read_catalogue(path), version)
@@ -0,0 +1,157 @@
+# catalogue_generator.py
+# Synthetic course catalogues for scale testing
+#
+# Every generated course is modelled on a real course from the same field:
+# salaries, growth, tuition and ratings are jittered around that course's
+# figures, and employers/roles are drawn from what the field's real courses
+# list, so distributions stay close to the hand-written catalogue.
+#
+# Usage (from the repo root):
+#   python logic/catalogue_generator.py 100000 --seed 1 --output catalogue.ndjson
+#   COURSE_CATALOGUE=catalogue.ndjson python app.py
+
+import sys
+import math
+import random
+import argparse
+from collections import Counter
+
+from course_data import COURSE_RECORDS
+from course_table import split_course_name, CATEGORY_FIELDS
+from catalogue_file import write_catalogue
+
+# Distinguish courses that share a field and university
+SPECIALISATIONS = [
+    "Applied", "International", "Honours", "Joint Honours", "with Placement",
+    "with Business", "with Languages", "Research", "Professional", "Part-Time"
+]
+
+# How often a generated course keeps its model course's rating instead of
+# drawing one from the catalogue-wide distribution
+KEEP_CATEGORY_PROBABILITY = 0.75
+
+
+class _FieldProfile:
+    """Real courses of one field plus the employers and roles they list"""
+
+    def __init__(self, records):
+        self.records = records
+        self.employers = sorted({e for r in records for e in r.get("top_employers", ())})
+        self.roles = sorted({e for r in records for e in r.get("typical_roles", ())})
+
+
+def _build_profiles(source_records):
+    fields = {}
+    universities = Counter()
+    university_codes = {}
+    for name, record in sorted(source_records.items()):
+        field, _, code = split_course_name(name)
+        fields.setdefault(field, []).append(record)
+        universities[code] += 1
+        university_codes[code] = record["university"]
+
+    category_values = {
+        field: Counter(r[field] for r in source_records.values() if r.get(field) is not None)
+        for field in CATEGORY_FIELDS if field != "university"
+    }
+    profiles = {field: _FieldProfile(records) for field, records in fields.items()}
+    return profiles, universities, university_codes, category_values
+
+
+def _clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+def _weighted(rng, counter):
+    values = list(counter)
+    return rng.choices(values, weights=[counter[v] for v in values])[0]
+
+
+def generate_courses(count, seed=0, source_records=None):
+    """
+    Yield `count` synthetic (course_name, record) pairs.
+
+    Output is fully determined by `seed`, and courses are produced one at
+    a time so any count runs in constant memory.
+
+    Args:
+        count: number of courses to generate
+        seed: random seed
+        source_records: real catalogue to model on (defaults to COURSE_RECORDS)
+    """
+    rng = random.Random(seed)
+    profiles, universities, university_codes, category_values = \
+        _build_profiles(source_records or COURSE_RECORDS)
+    fields = sorted(profiles)
+    field_weights = [len(profiles[f].records) for f in fields]
+    codes = sorted(universities)
+    code_weights = [universities[c] for c in codes]
+
+    for serial in range(1, count + 1):
+        field = rng.choices(fields, weights=field_weights)[0]
+        profile = profiles[field]
+        model = rng.choice(profile.records)
+        code = rng.choices(codes, weights=code_weights)[0]
+        specialisation = rng.choice(SPECIALISATIONS)
+        name = f"{field} - {specialisation} {serial} - {code}"
+
+        starting_salary = int(round(model["starting_salary"] * math.exp(rng.gauss(0, 0.08)), -2))
+        growth_rate = round(_clamp(model["growth_rate"] * rng.gauss(1, 0.04), 1.0, 2.5), 2)
+        tuition = int(round(model["typical_tuition"] * rng.uniform(0.9, 1.1), -2))
+
+        record = {
+            "university": university_codes[code],
+            "starting_salary": starting_salary,
+            "salary_5_years": int(round(starting_salary * growth_rate, -2)),
+            "growth_rate": growth_rate,
+            "typical_tuition": tuition,
+            "course_length": model["course_length"],
+            "source": f"Synthetic (modelled on {model['source']})"
+        }
+
+        if "employment_rate" in model:
+            record["employment_rate"] = int(_clamp(round(model["employment_rate"] + rng.gauss(0, 2)), 50, 100))
+        for rating in ("graduate_satisfaction", "job_security", "work_life_balance"):
+            if rating in model:
+                record[rating] = round(_clamp(model[rating] + rng.gauss(0, 0.15), 1.0, 5.0), 1)
+        for field_name, counter in category_values.items():
+            if field_name not in model:
+                continue
+            if rng.random() < KEEP_CATEGORY_PROBABILITY:
+                record[field_name] = model[field_name]
+            else:
+                record[field_name] = _weighted(rng, counter)
+        if profile.employers and "top_employers" in model:
+            record["top_employers"] = rng.sample(profile.employers, min(len(profile.employers), rng.randint(3, 5)))
+        if profile.roles and "typical_roles" in model:
+            record["typical_roles"] = rng.sample(profile.roles, min(len(profile.roles), rng.randint(3, 4)))
+        if "further_study_rate" in model:
+            record["further_study_rate"] = int(_clamp(round(model["further_study_rate"] + rng.gauss(0, 3)), 0, 100))
+        for text in ("industry_growth_rate", "internship_opportunities"):
+            if text in model:
+                record[text] = model[text]
+        if "avg_class_size" in model:
+            record["avg_class_size"] = max(5, int(round(model["avg_class_size"] * math.exp(rng.gauss(0, 0.2)))))
+        if "startup_salary_range" in model:
+            record["startup_salary_range"] = {
+                "min": int(round(starting_salary * 0.9, -2)),
+                "max": int(round(starting_salary * 1.1, -2))
+            }
+
+        yield name, record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic course catalogue (NDJSON)")
+    parser.add_argument("count", type=int, help="Number of courses to generate")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", default="catalogue.ndjson", help="Output file")
+    args = parser.parse_args(argv)
+
+    written = write_catalogue(args.output, generate_courses(args.count, args.seed))
+    print(f"✅ Wrote {written} courses to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+# catalogue_snapshot.py
+# Compiled, memory-mapped catalogue snapshots
+#
+# A snapshot is a CourseTable laid out on disk: numeric columns and category
+# codes as fixed-width arrays, names and category values as string tables
+# (UTF-8 bytes plus an offsets array). Opening one maps the file and wraps
+# the sections in memoryviews, so startup cost does not grow with the
+# catalogue and every worker shares the same page-cache pages.
+#
+# Layout:
+#   8 bytes   magic
+#   8 bytes   header length (little-endian u64)
+#   header    JSON: row count, content hash, column typecodes, section table
+#   sections  each 8-byte aligned, offsets relative to the end of the header
+#
+# Usage (from the repo root):
+#   python logic/catalogue_snapshot.py --output catalogue.snap
+#   python logic/catalogue_snapshot.py --input catalogue.ndjson --output catalogue.snap
+#   COURSE_SNAPSHOT=catalogue.snap gunicorn app:app
+
+import os
+import sys
+import json
+import mmap
+import struct
+import argparse
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from itertools import accumulate
+
+from course_table import (
+    CourseTable, CategoryColumn, typecode_of, HOT_NUMERIC_FIELDS, CATEGORY_FIELDS,
+    COLD_TEXT_FIELDS, COLD_LIST_FIELDS, DERIVED_CATEGORY_FIELDS
+)
+
+MAGIC = b"CRSNAP\x00\x01"
+FORMAT_VERSION = 1
+ALIGNMENT = 8
+PREAMBLE = struct.Struct("<8sQ")
+
+# Category vocabularies up to this size are decoded when the snapshot is
+# opened; larger ones (e.g. employer lists) are decoded per lookup
+EAGER_CATEGORY_LIMIT = 4096
+
+SNAPSHOT_CATEGORY_FIELDS = CATEGORY_FIELDS + COLD_TEXT_FIELDS + COLD_LIST_FIELDS + DERIVED_CATEGORY_FIELDS
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+# ==================== STRING TABLES ====================
+
+class StringTable(Sequence):
+    """Read-only sequence of UTF-8 strings stored back to back"""
+
+    def __init__(self, offsets, data):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def _raw(self, index):
+        return self._data[self._offsets[index]:self._offsets[index + 1]]
+
+    def _decode(self, raw):
+        return str(raw, "utf-8")
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("string table index out of range")
+        return self._decode(self._raw(index))
+
+    def __iter__(self):
+        data = self._data.tobytes()
+        offsets = self._offsets.tolist()
+        for start, end in zip(offsets, offsets[1:]):
+            yield self._decode(data[start:end])
+
+
+class NameTable(StringTable):
+    """Sorted course names, looked up by binary search over the raw bytes"""
+
+    class _RawView(Sequence):
+        def __init__(self, table):
+            self._table = table
+
+        def __len__(self):
+            return len(self._table)
+
+        def __getitem__(self, index):
+            return bytes(self._table._raw(index))
+
+    def position(self, name):
+        """Row of `name`, or None. UTF-8 byte order matches str order."""
+        target = name.encode("utf-8")
+        row = bisect_left(self._RawView(self), target)
+        if row < len(self) and bytes(self._raw(row)) == target:
+            return row
+        return None
+
+    def __contains__(self, name):
+        return isinstance(name, str) and self.position(name) is not None
+
+
+class JSONValues(StringTable):
+    """Category values stored as JSON; lists come back as tuples"""
+
+    def _decode(self, raw):
+        value = json.loads(str(raw, "utf-8"))
+        return tuple(value) if isinstance(value, list) else value
+
+
+# ==================== WRITING ====================
+
+def _string_sections(values):
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = array("Q", accumulate((len(e) for e in encoded), initial=0))
+    return offsets, b"".join(encoded)
+
+
+def write_snapshot(table, path):
+    """
+    Compile a CourseTable into a snapshot file (written atomically).
+
+    Returns:
+        size of the snapshot in bytes
+    """
+    sections = []
+
+    def add(name, data):
+        sections.append((name, data))
+
+    name_offsets, name_data = _string_sections(table.names)
+    add("names.offsets", name_offsets)
+    add("names.data", name_data)
+
+    numeric = {}
+    for field in HOT_NUMERIC_FIELDS:
+        column = table.column(field)
+        numeric[field] = typecode_of(column)
+        add(f"numeric.{field}", column)
+
+    categories = {}
+    for field in SNAPSHOT_CATEGORY_FIELDS:
+        column = table.category_column(field)
+        values = (json.dumps(list(v) if isinstance(v, tuple) else v, ensure_ascii=False)
+                  for v in column.categories)
+        offsets, data = _string_sections(values)
+        categories[field] = {"codes": typecode_of(column.codes), "count": len(column.categories)}
+        add(f"codes.{field}", column.codes)
+        add(f"categories.{field}.offsets", offsets)
+        add(f"categories.{field}.data", data)
+
+    extras = {str(row): extra for row, extra in table.extras().items()}
+    add("extras", json.dumps(extras, ensure_ascii=False).encode("utf-8"))
+
+    section_table = {}
+    position = 0
+    for name, data in sections:
+        length = memoryview(data).nbytes
+        section_table[name] = [position, length]
+        position = _align(position + length)
+
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "rows": len(table),
+        "content_hash": table.content_hash(),
+        "numeric": numeric,
+        "categories": categories,
+        "sections": section_table
+    }).encode("utf-8")
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(PREAMBLE.pack(MAGIC, len(header)))
+        f.write(header)
+        f.write(b"\0" * (_align(PREAMBLE.size + len(header)) - PREAMBLE.size - len(header)))
+        written = 0
+        for name, data in sections:
+            start = section_table[name][0]
+            f.write(b"\0" * (start - written))
+            f.write(data)
+            written = start + memoryview(data).nbytes
+        size = f.tell()
+    os.replace(temp_path, path)
+    return size
+
+
+# ==================== OPENING ====================
+
+def open_snapshot(path, version=None):
+    """
+    Map a snapshot file and return it as a CourseTable.
+
+    Only the header is parsed up front; columns are read straight from the
+    mapped pages when used.
+
+    Raises:
+        ValueError: if the file is not a snapshot this code can read
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(mapped) < PREAMBLE.size:
+        raise ValueError(f"{path} is not a catalogue snapshot")
+    magic, header_length = PREAMBLE.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a catalogue snapshot")
+    header = json.loads(mapped[PREAMBLE.size:PREAMBLE.size + header_length])
+    if header["format"] != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported snapshot format {header['format']}")
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError(f"{path}: snapshot was built on a {header['byteorder']}-endian machine")
+
+    view = memoryview(mapped)
+    base = _align(PREAMBLE.size + header_length)
+
+    def section(name, typecode="B"):
+        offset, length = header["sections"][name]
+        return view[base + offset:base + offset + length].cast(typecode)
+
+    names = NameTable(section("names.offsets", "Q"), section("names.data"))
+    numeric = {field: section(f"numeric.{field}", typecode)
+               for field, typecode in header["numeric"].items()}
+
+    categories = {}
+    for field, info in header["categories"].items():
+        values = JSONValues(section(f"categories.{field}.offsets", "Q"),
+                            section(f"categories.{field}.data"))
+        if info["count"] <= EAGER_CATEGORY_LIMIT:
+            values = list(values)
+        categories[field] = CategoryColumn(section(f"codes.{field}", info["codes"]), values)
+
+    extras = {int(row): extra for row, extra in json.loads(bytes(section("extras"))).items()}
+
+    return CourseTable(names, numeric, categories, extras, version,
+                       content_hash=header["content_hash"])
+
+
+# ==================== SHARING BETWEEN PROCESSES ====================
+
+# tmpfs, where multiprocessing.shared_memory segments live on Linux
+SHARED_MEMORY_DIR = "/dev/shm"
+
+
+def share_table(table):
+    """
+    Copy a CourseTable into a shared mapping and return the mapped copy.
+
+    The table is compiled as a snapshot into an unlinked tmpfs file, so its
+    columns live in MAP_SHARED pages: processes forked afterwards read the
+    same physical memory instead of copying it on write, and the memory is
+    released when the last of them exits.
+    """
+    directory = SHARED_MEMORY_DIR if os.path.isdir(SHARED_MEMORY_DIR) else tempfile.gettempdir()
+    fd, path = tempfile.mkstemp(prefix="course-catalogue-", suffix=".snap", dir=directory)
+    os.close(fd)
+    try:
+        write_snapshot(table, path)
+        return open_snapshot(path, table.version)
+    finally:
+        os.unlink(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a course catalogue snapshot")
+    parser.add_argument("--input", help="NDJSON catalogue (default: the built-in course_records.py)")
+    parser.add_argument("--output", default="catalogue.snap", help="Snapshot file to write")
+    args = parser.parse_args(argv)
+
+    if args.input:
+        from catalogue_file import load_catalogue
+        table = load_catalogue(args.input)
+    else:
+        from course_records import COURSE_RECORDS
+        table = CourseTable.from_records(COURSE_RECORDS)
+
+    size = write_snapshot(table, args.output)
+    print(f"✅ Wrote {len(table)} courses ({size / 1e6:.1f} MB) to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
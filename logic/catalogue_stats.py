@@ -0,0 +1,129 @@
+# catalogue_stats.py
+# Catalogue-wide statistics, computed once per data version
+# Used by the comparison context so a single /calculate call no longer
+# recalculates every course in the database. Built with the batch engine,
+# so building them costs a few array passes however large the catalogue
+
+import numpy as np
+
+from course_data import cached_per_data_version, get_data_version
+from batch_calculator import (
+    calculate_roi_batch, batch_results, get_course_columns, round_like_python, select_rows
+)
+from tax import resolve_tax_year
+
+# Metrics from calculate_roi that we keep sorted arrays for, with the
+# number of digits calculate_roi rounds each one to (None = not rounded)
+STAT_METRICS = {
+    "roi_5_years": 1,
+    "payback_years": 1,
+    "total_cost": 2,
+    "starting_salary": None,
+    "salary_after_5_years": None,
+    "lifetime_roi": 0,
+    "annual_net_income": 2,
+    "tuition_per_year": None,
+    "course_length": None
+}
+
+# calculate_roi result keys that have a different name in the batch engine
+_BATCH_KEYS = {"salary_after_5_years": "salary_5_years"}
+
+
+class CatalogueStats:
+    """
+    Default ROI results for every course, held as NumPy arrays.
+
+    For each metric in STAT_METRICS: the per-course values (rounded exactly
+    as calculate_roi rounds them, in row order), the average, min, max and
+    a sorted copy for rank queries. result_for() rebuilds a single course's
+    calculate_roi dict on demand.
+    """
+
+    def __init__(self, columns, version, tax_year=None):
+        self.version = version
+        self.columns = columns
+        self.tax_year = resolve_tax_year(tax_year)
+        self.course_count = len(columns)
+        self._batch = calculate_roi_batch(columns=columns, tax_year=self.tax_year)
+        self.values = {}
+        self.sorted_values = {}
+        self.averages = {}
+        self.minimums = {}
+        self.maximums = {}
+
+        for metric, ndigits in STAT_METRICS.items():
+            values = self._batch[_BATCH_KEYS.get(metric, metric)]
+            if ndigits is not None and values.dtype.kind == "f":
+                values = round_like_python(values, ndigits)
+            self.values[metric] = values
+            if not len(values):
+                continue
+            self.sorted_values[metric] = np.sort(values, kind="stable")
+            # cumsum adds in row order, so the average matches Python's sum()
+            self.averages[metric] = np.cumsum(values)[-1].item() / len(values)
+            self.minimums[metric] = self.sorted_values[metric][0].item()
+            self.maximums[metric] = self.sorted_values[metric][-1].item()
+
+    def average(self, metric):
+        return self.averages[metric]
+
+    def minimum(self, metric):
+        return self.minimums[metric]
+
+    def maximum(self, metric):
+        return self.maximums[metric]
+
+    def percentile_rank(self, metric, value):
+        """Percentage of courses with a value at or below `value` (0-100)"""
+        values = self.sorted_values.get(metric)
+        if values is None or not len(values):
+            return None
+        return int(np.searchsorted(values, value, side="right")) / len(values) * 100
+
+    def count_between(self, metric, low, high):
+        """Number of courses with low <= metric <= high"""
+        values = self.sorted_values.get(metric)
+        if values is None:
+            return 0
+        return int(np.searchsorted(values, high, side="right") - np.searchsorted(values, low, side="left"))
+
+    def result_for(self, course_name):
+        """Default (no overrides) ROI result for a course, or None"""
+        row = self.columns.table.row_of(course_name)
+        if row is None:
+            return None
+        return self.results_for([row])[0]
+
+    def batch_for(self, rows):
+        """calculate_roi_batch arrays for several rows, in the order given"""
+        return select_rows(self._batch, rows)
+
+    def results_for(self, rows):
+        """Default ROI results for several rows, in the order given"""
+        return batch_results(self.batch_for(rows), self.columns)
+
+    def summary(self):
+        return {
+            "version": self.version,
+            "tax_year": self.tax_year,
+            "course_count": self.course_count,
+            "metrics": {
+                metric: {
+                    "average": round(self.averages[metric], 2),
+                    "min": self.minimums[metric],
+                    "max": self.maximums[metric]
+                }
+                for metric in self.averages
+            }
+        }
+
+
+@cached_per_data_version
+def _build_catalogue_stats(tax_year):
+    return CatalogueStats(get_course_columns(), get_data_version(), tax_year)
+
+
+def get_catalogue_stats(tax_year=None):
+    """Return the CatalogueStats for the current data version and tax year"""
+    return _build_catalogue_stats(resolve_tax_year(tax_year))
@@ -0,0 +1,169 @@
+# catalogue_watcher.py
+# Hot reload of the course catalogue
+#
+# A background thread polls the data source (snapshot, NDJSON catalogue or
+# course_records.py). When it changes, a new CourseTable is built and
+# validated off to the side, its indexes are warmed, and only then is it
+# installed with install_course_table(). Requests already running keep the
+# table they pinned; derived caches rebuild for the new data version.
+
+import os
+import time
+import threading
+
+from course_data import (
+    CATALOGUE_SOURCE, load_catalogue_source, install_course_table, validate_course_data,
+    get_data_version
+)
+from course_table import CourseDataView
+
+DEFAULT_INTERVAL = 5.0      # seconds between checks
+SETTLE_SECONDS = 0.2        # file must stay unchanged this long before loading
+
+# Indexes built on the new table before it goes live
+WARM_INDEXES = ["field", "programme", "university", "university_code"]
+
+
+def warm_table(table):
+    """Build a table's lookup indexes, search index and content hash ahead of use"""
+    for field in WARM_INDEXES:
+        table.index(field)
+    table.search_index()
+    table.content_hash()
+
+
+def _signature(path):
+    """What we compare to spot a change: (inode, size, mtime), or None if missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class CatalogueWatcher:
+    """
+    Polls one data source and swaps in a new catalogue when it changes.
+
+    A source that fails to load or validate is reported in status() and the
+    current catalogue stays in place until the file changes again.
+    """
+
+    def __init__(self, kind, path, interval=DEFAULT_INTERVAL, on_swap=None):
+        self.kind = kind
+        self.path = path
+        self.interval = interval
+        self.on_swap = list(on_swap or [])
+        self.reloads = 0
+        self.failures = 0
+        self.last_reload = None
+        self.last_error = None
+        self._signature = _signature(path)
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._reload_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+
+    @classmethod
+    def for_active_source(cls, **kwargs):
+        """Watcher for the source the app was started with"""
+        kind, path = CATALOGUE_SOURCE
+        return cls(kind, path, **kwargs)
+
+    def start(self):
+        if self._thread is None:
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="catalogue-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def ensure_running(self):
+        """
+        Start polling in this process unless it already is.
+
+        Threads do not survive fork(), so a preloading server calls this from
+        each worker rather than starting the watcher in the master.
+        """
+        if self.interval <= 0 or self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                # Anything inherited from the parent belongs to its thread
+                self._thread = None
+                self._stop = threading.Event()
+                self._reload_lock = threading.Lock()
+                self.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                # Never let the watcher thread die
+                print(f"Warning: Catalogue watcher error: {e}")
+
+    def check(self):
+        """
+        Reload if the source changed since the last check.
+
+        Returns:
+            True if a new catalogue was installed
+        """
+        signature = _signature(self.path)
+        if signature is None or signature == self._signature:
+            return False
+
+        # Let a writer finish before reading
+        time.sleep(SETTLE_SECONDS)
+        if _signature(self.path) != signature:
+            return False
+        self._signature = signature
+        return self.reload()
+
+    def reload(self):
+        """Build, validate and install a new catalogue from the source"""
+        with self._reload_lock:
+            try:
+                table = load_catalogue_source(self.kind, self.path)
+                if not validate_course_data(CourseDataView(lambda: table)):
+                    raise ValueError("validation failed")
+
+                warm_table(table)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"⚠️ Catalogue reload from {self.path} rejected ({self.last_error}); "
+                      f"still serving version {get_data_version()}")
+                return False
+
+            version = install_course_table(table)
+            self.reloads += 1
+            self.last_reload = time.strftime("%Y-%m-%dT%H:%M:%S")
+            self.last_error = None
+            print(f"✅ Catalogue reloaded from {self.path}: {len(table)} courses, version {version}")
+
+            for callback in self.on_swap:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"Warning: Post-reload hook failed: {e}")
+            return True
+
+    def status(self):
+        return {
+            "source": self.path,
+            "kind": self.kind,
+            "running": self._thread is not None and self._pid == os.getpid(),
+            "interval_seconds": self.interval,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_reload": self.last_reload,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,105 @@
+# course_comparison.py
+# Side-by-side comparison of many courses at once
+#
+# Courses are looked up as row ids and computed through the batch engine a
+# chunk at a time, so results can be sent while the rest are still being
+# built. The winner for every ranking metric comes from one pass over a
+# (metrics x courses) array of the compared courses' values.
+
+import numpy as np
+
+from batch_calculator import analyze_batch, batch_results
+from course_query import query_rows
+from pareto import skyline
+from rankings import RANK_METRICS
+
+# Courses that can be named in one request, and picked by university/field
+MAX_COMPARE_COURSES = 1000
+MAX_SELECTED_COURSES = 50_000
+
+# Courses computed (and sent) at a time
+COMPARE_CHUNK = 100
+
+# The winners /compare-multiple has always reported, and their metrics
+WINNER_METRICS = {
+    "best_roi": "roi_5_years",
+    "fastest_payback": "payback_years",
+    "lowest_cost": "total_cost",
+    "highest_salary": "starting_salary"
+}
+
+
+def resolve_courses(names, table):
+    """
+    Row ids of the named courses, in the order given (repeats dropped).
+
+    Returns:
+        (row ids, [{"course": name, "error": message}] for unknown names)
+    """
+    rows, seen, errors = [], set(), []
+    for name in names:
+        row = table.row_of(name) if isinstance(name, str) else None
+        if row is None:
+            errors.append({
+                "course": name,
+                "error": f"Course '{name}' not found. Available courses: {len(table)} courses in database"
+            })
+        elif row not in seen:
+            seen.add(row)
+            rows.append(row)
+    return np.array(rows, dtype=np.int64), errors
+
+
+def select_courses(university=None, field=None, tax_year=None):
+    """
+    Row ids of every course at a university and/or in a field, in name order.
+
+    Raises:
+        ValueError: if the selection is larger than MAX_SELECTED_COURSES
+    """
+    categories = {name: [value] for name, value in (("university", university), ("field", field)) if value}
+    rows, total, _ = query_rows(categories, sort="name", limit=MAX_SELECTED_COURSES + 1, tax_year=tax_year)
+    if total > MAX_SELECTED_COURSES:
+        raise ValueError(f"{total} courses match; narrow the selection to at most {MAX_SELECTED_COURSES}")
+    return rows.astype(np.int64)
+
+
+def metric_winners(rankings, rows):
+    """
+    Best of `rows` on every metric in RANK_METRICS.
+
+    Ties go to the course listed first, and courses without a value never
+    win. Returns {metric: row id or None}.
+    """
+    metrics = list(RANK_METRICS)
+    values = np.empty((len(metrics), len(rows)), dtype=np.float64)
+    for i, metric in enumerate(metrics):
+        column = rankings.values(metric)[rows]
+        values[i] = -column if RANK_METRICS[metric] == "desc" else column
+    values[np.isnan(values)] = np.inf
+
+    best = values.argmin(axis=1)
+    found = np.isfinite(values[np.arange(len(metrics)), best])
+    return {metric: int(rows[b]) if ok else None
+            for metric, b, ok in zip(metrics, best.tolist(), found.tolist())}
+
+
+def non_dominated(rankings, rows):
+    """Rows no other compared course beats on every WINNER_METRICS metric"""
+    columns = []
+    for metric in WINNER_METRICS.values():
+        column = rankings.values(metric)[rows]
+        columns.append(-column if RANK_METRICS[metric] == "desc" else column)
+    return rows[skyline(np.column_stack(columns))] if len(rows) else rows
+
+
+def comparison_chunks(stats, rows, chunk=COMPARE_CHUNK):
+    """
+    Yield (calculate_roi-style results, their analyze_batch lifetime figures)
+    for `rows`, `chunk` courses at a time.
+    """
+    for start in range(0, len(rows), chunk):
+        batch = stats.batch_for(rows[start:start + chunk])
+        lifetime = analyze_batch(batch)["lifetime"]
+        figures = [dict(zip(lifetime, values)) for values in zip(*(v.tolist() for v in lifetime.values()))]
+        yield batch_results(batch, stats.columns), figures
@@ -1,1551 +1,191 @@
-# course_data.py - COMPLETE VERSION
-# Complete database with 80+ courses - ALL DATA FROM VERIFIED SOURCES
-# Sources: HSE Pay Scales 2024, gradireland, Forsa, glassdoor, Indeed Ireland
-# Last updated: December 2024
+# course_data.py
+# Access layer for the course catalogue
+# The source records live in course_records.py; at startup they (or a
+# generated catalogue, or a compiled snapshot) are loaded into a CourseTable
 
-COURSE_DATA = {
-    
-    # ==================== UCD (University College Dublin) ====================
-    "Computer Science - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 35000,
-        "salary_5_years": 49000,
-        "growth_rate": 1.4,
-        "typical_tuition": 7000,
-        "course_length": 4,
-        "source": "Software Space Ireland 2024, gradireland",
-        "employment_rate": 96,
-        "graduate_satisfaction": 4.3,
-        "job_security": 4.5,
-        "work_life_balance": 3.8,
-        "career_progression": "Excellent",
-        "top_employers": ["Google", "Meta", "Microsoft", "Accenture", "Amazon"],
-        "typical_roles": ["Software Developer", "Data Analyst", "Systems Engineer", "Full Stack Developer"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 15,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "20-25% annually",
-        "avg_class_size": 45,
-        "internship_opportunities": "Excellent - 90% placement rate",
-        "startup_salary_range": {"min": 32000, "max": 39000}
-    },
-    
-    "Data Science & Analytics - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 38000,
-        "salary_5_years": 55000,
-        "growth_rate": 1.45,
-        "typical_tuition": 7200,
-        "course_length": 4,
-        "source": "Morgan McKinley 2024, Connexus Recruit 2025",
-        "employment_rate": 94,
-        "graduate_satisfaction": 4.4,
-        "job_security": 4.6,
-        "work_life_balance": 3.7,
-        "career_progression": "Excellent",
-        "top_employers": ["Meta", "Amazon", "Mastercard", "Bank of Ireland", "EY"],
-        "typical_roles": ["Data Analyst", "Data Scientist", "Business Analyst", "ML Engineer"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 18,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "18-22% annually",
-        "avg_class_size": 40,
-        "internship_opportunities": "Excellent - 85% placement rate",
-        "startup_salary_range": {"min": 35000, "max": 42000}
-    },
-    
-    "Cybersecurity - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 40000,
-        "salary_5_years": 62000,
-        "growth_rate": 1.55,
-        "typical_tuition": 7200,
-        "course_length": 4,
-        "source": "FRS Recruitment 2025, Nucamp Ireland 2025",
-        "employment_rate": 98,
-        "graduate_satisfaction": 4.5,
-        "job_security": 4.8,
-        "work_life_balance": 3.5,
-        "career_progression": "Excellent",
-        "top_employers": ["Microsoft", "IBM", "Accenture", "PwC", "Deloitte"],
-        "typical_roles": ["Security Analyst", "Penetration Tester", "Security Engineer", "SOC Analyst"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 12,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "7.91% annually",
-        "avg_class_size": 35,
-        "internship_opportunities": "Excellent - 92% placement rate",
-        "startup_salary_range": {"min": 38000, "max": 45000}
-    },
-    
-    "Engineering - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 36500,
-        "salary_5_years": 47500,
-        "growth_rate": 1.3,
-        "typical_tuition": 7200,
-        "course_length": 4,
-        "source": "gradireland 2024, Engineers Ireland",
-        "employment_rate": 93,
-        "graduate_satisfaction": 4.1,
-        "job_security": 4.3,
-        "work_life_balance": 3.7,
-        "career_progression": "Very Good",
-        "top_employers": ["ESB", "Siemens", "Boston Scientific", "Jacobs Engineering", "Arup"],
-        "typical_roles": ["Graduate Engineer", "Project Engineer", "Design Engineer", "Process Engineer"],
-        "skills_demand": "High",
-        "remote_work_availability": "Medium",
-        "further_study_rate": 20,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "5-7% annually",
-        "avg_class_size": 38,
-        "internship_opportunities": "Excellent - 90% placement rate",
-        "startup_salary_range": {"min": 42000, "max": 47000}
-    },
+import os
+import sys
+import runpy
+import threading
+import contextvars
+from functools import wraps
 
-    # ==================== UCC (University College Cork) ====================
-    "Nursing - UCC": {
-        "university": "University College Cork",
-        "starting_salary": 36000,
-        "salary_5_years": 48000,
-        "growth_rate": 1.33,
-        "typical_tuition": 6800,
-        "course_length": 4,
-        "source": "HSE Pay Scales 2024",
-        "employment_rate": 97,
-        "graduate_satisfaction": 4.2,
-        "job_security": 4.7,
-        "work_life_balance": 3.3,
-        "career_progression": "Very Good",
-        "top_employers": ["HSE", "Cork University Hospital", "Mercy University Hospital", "Private Hospitals", "Community Care"],
-        "typical_roles": ["Staff Nurse", "Community Nurse", "Practice Nurse", "Clinical Nurse"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 26,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 68,
-        "internship_opportunities": "Guaranteed - 100% clinical placement",
-        "startup_salary_range": {"min": 35000, "max": 37000}
-    },
-    
-    "Occupational Therapy - UCC": {
-        "university": "University College Cork",
-        "starting_salary": 44563,
-        "salary_5_years": 56753,
-        "growth_rate": 1.27,
-        "typical_tuition": 6900,
-        "course_length": 4,
-        "source": "Forsa Health Salary Scales 2024",
-        "employment_rate": 92,
-        "graduate_satisfaction": 4.1,
-        "job_security": 4.5,
-        "work_life_balance": 4.0,
-        "career_progression": "Good",
-        "top_employers": ["HSE", "Cork University Hospital", "Enable Ireland", "Community Services", "Private Practice"],
-        "typical_roles": ["Occupational Therapist", "Community OT", "Rehab Specialist", "Senior OT"],
-        "skills_demand": "High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 22,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 44,
-        "internship_opportunities": "Very Good - 82% placement rate",
-        "startup_salary_range": {"min": 42000, "max": 47000}
-    },
-    
-    "Speech & Language Therapy - UCC": {
-        "university": "University College Cork",
-        "starting_salary": 44563,
-        "salary_5_years": 56753,
-        "growth_rate": 1.27,
-        "typical_tuition": 6900,
-        "course_length": 4,
-        "source": "Forsa Health Salary Scales 2024",
-        "employment_rate": 94,
-        "graduate_satisfaction": 4.2,
-        "job_security": 4.5,
-        "work_life_balance": 4.1,
-        "career_progression": "Good",
-        "top_employers": ["HSE", "Enable Ireland", "Cork University Hospital", "Community Services", "Private Clinics"],
-        "typical_roles": ["Speech & Language Therapist", "Community SLT", "Hospital-based SLT", "Senior SLT"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 24,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "5-7% annually",
-        "avg_class_size": 38,
-        "internship_opportunities": "Very Good - 86% placement rate",
-        "startup_salary_range": {"min": 42000, "max": 47000}
-    },
-    
-    "Dentistry - UCC": {
-        "university": "University College Cork",
-        "starting_salary": 48000,
-        "salary_5_years": 75000,
-        "growth_rate": 1.56,
-        "typical_tuition": 30000,
-        "course_length": 5,
-        "source": "Dental Council Ireland",
-        "employment_rate": 100,
-        "graduate_satisfaction": 4.4,
-        "job_security": 4.9,
-        "work_life_balance": 3.7,
-        "career_progression": "Excellent",
-        "top_employers": ["Private Dental Clinics", "HSE", "Cork University Dental Hospital", "Smiles Dental", "Self-Employed"],
-        "typical_roles": ["Dentist", "Clinical Dentist", "Specialist Dentist", "Practice Principal"],
-        "skills_demand": "High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 32,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "3-4% annually",
-        "avg_class_size": 50,
-        "internship_opportunities": "Guaranteed - 100% placement",
-        "startup_salary_range": {"min": 45000, "max": 52000}
-    },
-    
-    "Social Work - UCC": {
-        "university": "University College Cork",
-        "starting_salary": 35000,
-        "salary_5_years": 46000,
-        "growth_rate": 1.31,
-        "typical_tuition": 6900,
-        "course_length": 4,
-        "source": "Glassdoor Ireland 2024",
-        "employment_rate": 86,
-        "graduate_satisfaction": 3.9,
-        "job_security": 4.1,
-        "work_life_balance": 3.5,
-        "career_progression": "Good",
-        "top_employers": ["HSE", "Tusla", "Cork City Council", "NGOs", "Family Support Services"],
-        "typical_roles": ["Social Worker", "Child Protection Worker", "Medical Social Worker", "Community Worker"],
-        "skills_demand": "High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 32,
-        "international_opportunities": "Fair",
-        "industry_growth_rate": "4-5% annually",
-        "avg_class_size": 56,
-        "internship_opportunities": "Good - 78% placement rate",
-        "startup_salary_range": {"min": 33000, "max": 37000}
-    },
+import numpy as np
 
-    # ==================== University of Galway (NUIG) ====================
-    "Computer Science - Galway": {
-        "university": "University of Galway",
-        "starting_salary": 33000,
-        "salary_5_years": 47000,
-        "growth_rate": 1.42,
-        "typical_tuition": 6200,
-        "course_length": 4,
-        "source": "University of Galway 2024",
-        "employment_rate": 90,
-        "graduate_satisfaction": 4.1,
-        "job_security": 4.3,
-        "work_life_balance": 4.0,
-        "career_progression": "Very Good",
-        "top_employers": ["Cisco", "SAP", "Boston Scientific", "Medtronic", "Oracle"],
-        "typical_roles": ["Software Engineer", "Systems Administrator", "Web Developer", "IT Consultant"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 14,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "20-25% annually",
-        "avg_class_size": 52,
-        "internship_opportunities": "Good - 75% placement rate",
-        "startup_salary_range": {"min": 30000, "max": 36000}
-    },
-    
-    "Data Analytics - Galway": {
-        "university": "University of Galway",
-        "starting_salary": 36000,
-        "salary_5_years": 51000,
-        "growth_rate": 1.42,
-        "typical_tuition": 6400,
-        "course_length": 4,
-        "source": "University of Galway 2024",
-        "employment_rate": 88,
-        "graduate_satisfaction": 4.0,
-        "job_security": 4.4,
-        "work_life_balance": 3.9,
-        "career_progression": "Very Good",
-        "top_employers": ["Medtronic", "Boston Scientific", "Fidelity", "SAP", "Cisco"],
-        "typical_roles": ["Data Analyst", "Business Analyst", "Data Visualization Specialist", "BI Developer"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 15,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "18-22% annually",
-        "avg_class_size": 46,
-        "internship_opportunities": "Good - 73% placement rate",
-        "startup_salary_range": {"min": 33000, "max": 39000}
-    },
-    
-    "Engineering - Galway": {
-        "university": "University of Galway",
-        "starting_salary": 35500,
-        "salary_5_years": 46500,
-        "growth_rate": 1.31,
-        "typical_tuition": 6500,
-        "course_length": 4,
-        "source": "University of Galway 2024, Engineers Ireland",
-        "employment_rate": 92,
-        "graduate_satisfaction": 4.0,
-        "job_security": 4.2,
-        "work_life_balance": 3.8,
-        "career_progression": "Very Good",
-        "top_employers": ["Medtronic", "Boston Scientific", "Cisco", "Valeo", "Abbott"],
-        "typical_roles": ["Graduate Engineer", "Design Engineer", "Process Engineer", "Project Engineer"],
-        "skills_demand": "High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 19,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "5-7% annually",
-        "avg_class_size": 54,
-        "internship_opportunities": "Good - 74% placement rate",
-        "startup_salary_range": {"min": 32000, "max": 39000}
-    },
-    
-    "Business/Commerce - Galway": {
-        "university": "University of Galway",
-        "starting_salary": 28500,
-        "salary_5_years": 38500,
-        "growth_rate": 1.35,
-        "typical_tuition": 6300,
-        "course_length": 4,
-        "source": "University of Galway 2024",
-        "employment_rate": 86,
-        "graduate_satisfaction": 3.7,
-        "job_security": 3.6,
-        "work_life_balance": 3.7,
-        "career_progression": "Good",
-        "top_employers": ["Fidelity", "EY", "BDO", "Boston Scientific", "Local businesses"],
-        "typical_roles": ["Business Analyst", "Accountant", "Marketing Executive", "HR Assistant"],
-        "skills_demand": "Medium",
-        "remote_work_availability": "Medium",
-        "further_study_rate": 26,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "3-5% annually",
-        "avg_class_size": 82,
-        "internship_opportunities": "Fair - 58% placement rate",
-        "startup_salary_range": {"min": 25000, "max": 31000}
-    },
-    
-    "Biomedical Engineering - Galway": {
-        "university": "University of Galway",
-        "starting_salary": 38000,
-        "salary_5_years": 50000,
-        "growth_rate": 1.32,
-        "typical_tuition": 6800,
-        "course_length": 4,
-        "source": "University of Galway 2024",
-        "employment_rate": 95,
-        "graduate_satisfaction": 4.4,
-        "job_security": 4.6,
-        "work_life_balance": 3.6,
-        "career_progression": "Excellent",
-        "top_employers": ["Medtronic", "Boston Scientific", "Abbott", "Stryker", "Zimmer Biomet"],
-        "typical_roles": ["Biomedical Engineer", "Quality Engineer", "R&D Engineer", "Clinical Engineer"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 22,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "8-10% annually",
-        "avg_class_size": 38,
-        "internship_opportunities": "Excellent - 90% placement rate",
-        "startup_salary_range": {"min": 35000, "max": 41000}
-    },
-    
-    "Nursing - Galway": {
-        "university": "University of Galway",
-        "starting_salary": 36000,
-        "salary_5_years": 48000,
-        "growth_rate": 1.33,
-        "typical_tuition": 6400,
-        "course_length": 4,
-        "source": "HSE Pay Scales 2024",
-        "employment_rate": 96,
-        "graduate_satisfaction": 4.1,
-        "job_security": 4.7,
-        "work_life_balance": 3.4,
-        "career_progression": "Good",
-        "top_employers": ["HSE", "University Hospital Galway", "Portiuncula Hospital", "Community Health", "Private Care"],
-        "typical_roles": ["Staff Nurse", "Theatre Nurse", "Emergency Nurse", "Paediatric Nurse"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 25,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 70,
-        "internship_opportunities": "Guaranteed - 100% clinical placement",
-        "startup_salary_range": {"min": 35000, "max": 37000}
-    },
-    
-    "Speech & Language Therapy - Galway": {
-        "university": "University of Galway",
-        "starting_salary": 44563,
-        "salary_5_years": 56753,
-        "growth_rate": 1.27,
-        "typical_tuition": 6500,
-        "course_length": 4,
-        "source": "Forsa Health Salary Scales 2024",
-        "employment_rate": 93,
-        "graduate_satisfaction": 4.1,
-        "job_security": 4.5,
-        "work_life_balance": 4.2,
-        "career_progression": "Good",
-        "top_employers": ["HSE", "Enable Ireland", "Brothers of Charity", "University Hospital Galway", "Private Practice"],
-        "typical_roles": ["Speech & Language Therapist", "Early Intervention SLT", "School-based SLT", "Clinical SLT"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 22,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "5-7% annually",
-        "avg_class_size": 40,
-        "internship_opportunities": "Good - 82% placement rate",
-        "startup_salary_range": {"min": 42000, "max": 47000}
-    },
+from course_table import CourseTable, CourseDataView
 
-    # ==================== UL (University of Limerick) ====================
-    "Computer Science - UL": {
-        "university": "University of Limerick",
-        "starting_salary": 34000,
-        "salary_5_years": 48000,
-        "growth_rate": 1.41,
-        "typical_tuition": 6400,
-        "course_length": 4,
-        "source": "UL 2024",
-        "employment_rate": 92,
-        "graduate_satisfaction": 4.2,
-        "job_security": 4.4,
-        "work_life_balance": 3.9,
-        "career_progression": "Very Good",
-        "top_employers": ["Johnson & Johnson", "Dell", "Analog Devices", "Northern Trust", "Jaguar Land Rover"],
-        "typical_roles": ["Software Developer", "Systems Engineer", "Application Developer", "IT Analyst"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 13,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "20-25% annually",
-        "avg_class_size": 49,
-        "internship_opportunities": "Excellent - 85% placement via Co-op",
-        "startup_salary_range": {"min": 31000, "max": 37000}
-    },
-    
-    "Software Engineering - UL": {
-        "university": "University of Limerick",
-        "starting_salary": 35000,
-        "salary_5_years": 49000,
-        "growth_rate": 1.4,
-        "typical_tuition": 6600,
-        "course_length": 4,
-        "source": "UL 2024",
-        "employment_rate": 94,
-        "graduate_satisfaction": 4.3,
-        "job_security": 4.5,
-        "work_life_balance": 3.8,
-        "career_progression": "Excellent",
-        "top_employers": ["Dell", "Northern Trust", "Johnson & Johnson", "Analog Devices", "Cook Medical"],
-        "typical_roles": ["Software Engineer", "Full Stack Developer", "Cloud Engineer", "Solutions Architect"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 10,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "20-25% annually",
-        "avg_class_size": 44,
-        "internship_opportunities": "Excellent - 88% placement via Co-op",
-        "startup_salary_range": {"min": 32000, "max": 38000}
-    },
-    
-    "Engineering - UL": {
-        "university": "University of Limerick",
-        "starting_salary": 37000,
-        "salary_5_years": 48000,
-        "growth_rate": 1.3,
-        "typical_tuition": 6700,
-        "course_length": 4,
-        "source": "UL 2024, Engineers Ireland",
-        "employment_rate": 95,
-        "graduate_satisfaction": 4.3,
-        "job_security": 4.5,
-        "work_life_balance": 3.7,
-        "career_progression": "Very Good",
-        "top_employers": ["Johnson & Johnson", "Jaguar Land Rover", "Analog Devices", "Cook Medical", "Boston Scientific"],
-        "typical_roles": ["Graduate Engineer", "Manufacturing Engineer", "Process Engineer", "Design Engineer"],
-        "skills_demand": "High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 16,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "5-7% annually",
-        "avg_class_size": 51,
-        "internship_opportunities": "Excellent - 92% placement via Co-op",
-        "startup_salary_range": {"min": 34000, "max": 40000}
-    },
-    
-    "Business Analytics - UL": {
-        "university": "University of Limerick",
-        "starting_salary": 32000,
-        "salary_5_years": 43000,
-        "growth_rate": 1.34,
-        "typical_tuition": 6500,
-        "course_length": 4,
-        "source": "UL 2024",
-        "employment_rate": 89,
-        "graduate_satisfaction": 4.0,
-        "job_security": 4.0,
-        "work_life_balance": 3.8,
-        "career_progression": "Good",
-        "top_employers": ["Johnson & Johnson", "Northern Trust", "Dell", "Analog Devices", "PwC"],
-        "typical_roles": ["Business Analyst", "Data Analyst", "Operations Analyst", "Project Coordinator"],
-        "skills_demand": "High",
-        "remote_work_availability": "High",
-        "further_study_rate": 20,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "12-15% annually",
-        "avg_class_size": 58,
-        "internship_opportunities": "Very Good - 80% placement via Co-op",
-        "startup_salary_range": {"min": 29000, "max": 35000}
-    },
-    
-    "Nursing - UL": {
-        "university": "University of Limerick",
-        "starting_salary": 36000,
-        "salary_5_years": 48000,
-        "growth_rate": 1.33,
-        "typical_tuition": 6500,
-        "course_length": 4,
-        "source": "HSE Pay Scales 2024",
-        "employment_rate": 97,
-        "graduate_satisfaction": 4.2,
-        "job_security": 4.7,
-        "work_life_balance": 3.3,
-        "career_progression": "Good",
-        "top_employers": ["HSE", "University Hospital Limerick", "Milford Care Centre", "Croom Hospital", "Community Services"],
-        "typical_roles": ["Staff Nurse", "ICU Nurse", "Oncology Nurse", "Community Nurse"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 27,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 66,
-        "internship_opportunities": "Guaranteed - 100% clinical placement",
-        "startup_salary_range": {"min": 35000, "max": 37000}
-    },
-    
-    "Physiotherapy - UL": {
-        "university": "University of Limerick",
-        "starting_salary": 44563,
-        "salary_5_years": 56753,
-        "growth_rate": 1.27,
-        "typical_tuition": 6700,
-        "course_length": 4,
-        "source": "Forsa Health Salary Scales 2024",
-        "employment_rate": 93,
-        "graduate_satisfaction": 4.1,
-        "job_security": 4.4,
-        "work_life_balance": 4.0,
-        "career_progression": "Good",
-        "top_employers": ["HSE", "University Hospital Limerick", "Sports Clinics", "Private Practice", "Rehabilitation Centers"],
-        "typical_roles": ["Physiotherapist", "Sports Physio", "Occupational Health Physio", "Paediatric Physio"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 18,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "5-7% annually",
-        "avg_class_size": 48,
-        "internship_opportunities": "Very Good - 85% placement rate",
-        "startup_salary_range": {"min": 42000, "max": 47000}
-    },
-    
-    "Occupational Therapy - UL": {
-        "university": "University of Limerick",
-        "starting_salary": 44563,
-        "salary_5_years": 56753,
-        "growth_rate": 1.27,
-        "typical_tuition": 6600,
-        "course_length": 4,
-        "source": "Forsa Health Salary Scales 2024",
-        "employment_rate": 91,
-        "graduate_satisfaction": 4.0,
-        "job_security": 4.4,
-        "work_life_balance": 4.1,
-        "career_progression": "Good",
-        "top_employers": ["HSE", "Enable Ireland", "Brothers of Charity", "Community Health", "Private Services"],
-        "typical_roles": ["Occupational Therapist", "OT in Disability Services", "OT in Mental Health", "Senior OT"],
-        "skills_demand": "High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 20,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 46,
-        "internship_opportunities": "Good - 80% placement rate",
-        "startup_salary_range": {"min": 42000, "max": 47000}
-    },
 
-    # ==================== Maynooth University ====================
-    "Computer Science - Maynooth": {
-        "university": "Maynooth University",
-        "starting_salary": 33000,
-        "salary_5_years": 47000,
-        "growth_rate": 1.42,
-        "typical_tuition": 6100,
-        "course_length": 4,
-        "source": "Maynooth University 2024",
-        "employment_rate": 91,
-        "graduate_satisfaction": 4.1,
-        "job_security": 4.3,
-        "work_life_balance": 4.0,
-        "career_progression": "Very Good",
-        "top_employers": ["Intel", "HP", "IBM", "Hewlett Packard Enterprise", "State Street"],
-        "typical_roles": ["Software Developer", "Systems Analyst", "Network Engineer", "Technical Support"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 16,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "20-25% annually",
-        "avg_class_size": 46,
-        "internship_opportunities": "Good - 72% placement rate",
-        "startup_salary_range": {"min": 30000, "max": 36000}
-    },
-    
-    "Data Science - Maynooth": {
-        "university": "Maynooth University",
-        "starting_salary": 36000,
-        "salary_5_years": 51000,
-        "growth_rate": 1.42,
-        "typical_tuition": 6300,
-        "course_length": 4,
-        "source": "Maynooth University 2024",
-        "employment_rate": 89,
-        "graduate_satisfaction": 4.2,
-        "job_security": 4.4,
-        "work_life_balance": 3.9,
-        "career_progression": "Very Good",
-        "top_employers": ["Intel", "State Street", "IBM", "Accenture", "PwC"],
-        "typical_roles": ["Data Analyst", "Data Scientist", "Business Intelligence Analyst", "Analytics Engineer"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 18,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "18-22% annually",
-        "avg_class_size": 40,
-        "internship_opportunities": "Good - 70% placement rate",
-        "startup_salary_range": {"min": 33000, "max": 39000}
-    },
-    
-    "Business/Finance - Maynooth": {
-        "university": "Maynooth University",
-        "starting_salary": 29000,
-        "salary_5_years": 39000,
-        "growth_rate": 1.34,
-        "typical_tuition": 6200,
-        "course_length": 4,
-        "source": "Maynooth University 2024",
-        "employment_rate": 85,
-        "graduate_satisfaction": 3.8,
-        "job_security": 3.7,
-        "work_life_balance": 3.7,
-        "career_progression": "Good",
-        "top_employers": ["State Street", "Bank of Ireland", "AIB", "Grant Thornton", "EY"],
-        "typical_roles": ["Financial Analyst", "Accountant", "Business Analyst", "Investment Analyst"],
-        "skills_demand": "Medium",
-        "remote_work_availability": "Medium",
-        "further_study_rate": 23,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "3-5% annually",
-        "avg_class_size": 76,
-        "internship_opportunities": "Fair - 60% placement rate",
-        "startup_salary_range": {"min": 26000, "max": 32000}
-    },
-    
-    "Education - Primary Teaching - Maynooth": {
-        "university": "Maynooth University",
-        "starting_salary": 37803,
-        "salary_5_years": 52059,
-        "growth_rate": 1.38,
-        "typical_tuition": 6300,
-        "course_length": 4,
-        "source": "Teaching Council Ireland 2024",
-        "employment_rate": 90,
-        "graduate_satisfaction": 4.0,
-        "job_security": 4.6,
-        "work_life_balance": 4.3,
-        "career_progression": "Good",
-        "top_employers": ["National Schools", "Educate Together", "Multi-denominational Schools", "Community Schools"],
-        "typical_roles": ["Primary Teacher", "Special Education Teacher", "Assistant Principal", "Deputy Principal"],
-        "skills_demand": "High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 26,
-        "international_opportunities": "Fair",
-        "industry_growth_rate": "2-3% annually",
-        "avg_class_size": 72,
-        "internship_opportunities": "Guaranteed - 100% teaching practice",
-        "startup_salary_range": {"min": 37000, "max": 39000}
-    },
+# ==================== ACTIVE CATALOGUE ====================
 
-    # ==================== TU Dublin (Technological University Dublin) ====================
-    "Computer Science - TU Dublin": {
-        "university": "TU Dublin",
-        "starting_salary": 32000,
-        "salary_5_years": 45000,
-        "growth_rate": 1.41,
-        "typical_tuition": 5800,
-        "course_length": 4,
-        "source": "TU Dublin 2024",
-        "employment_rate": 90,
-        "graduate_satisfaction": 4.0,
-        "job_security": 4.2,
-        "work_life_balance": 4.0,
-        "career_progression": "Good",
-        "top_employers": ["Accenture", "IBM", "Vodafone", "Three Ireland", "Version 1"],
-        "typical_roles": ["Software Developer", "Web Developer", "IT Support", "Systems Administrator"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 14,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "20-25% annually",
-        "avg_classsize": 50,
-        "internship_opportunities": "Very Good - 75% placement rate",
-        "startup_salary_range": {"min": 33000, "max": 40000}
-    },
-    
-    "Business/Commerce - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 30000,
-        "salary_5_years": 40500,
-        "growth_rate": 1.35,
-        "typical_tuition": 7400,
-        "course_length": 4,
-        "source": "Glassdoor IE 2024, gradireland",
-        "employment_rate": 89,
-        "graduate_satisfaction": 3.9,
-        "job_security": 3.8,
-        "work_life_balance": 3.5,
-        "career_progression": "Good",
-        "top_employers": ["Deloitte", "PwC", "EY", "KPMG", "Bank of Ireland"],
-        "typical_roles": ["Business Analyst", "Financial Analyst", "Accountant", "Management Consultant"],
-        "skills_demand": "Medium",
-        "remote_work_availability": "Medium",
-        "further_study_rate": 25,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "3-5% annually",
-        "avg_class_size": 80,
-        "internship_opportunities": "Good - 65% placement rate",
-        "startup_salary_range": {"min": 27000, "max": 33000}
-    },
-    
-    "Law - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 42000,
-        "salary_5_years": 70000,
-        "growth_rate": 1.67,
-        "typical_tuition": 7600,
-        "course_length": 4,
-        "source": "Glassdoor IE 2024, Law Society Ireland",
-        "employment_rate": 85,
-        "graduate_satisfaction": 3.7,
-        "job_security": 4.0,
-        "work_life_balance": 2.9,
-        "career_progression": "Very Good",
-        "top_employers": ["A&L Goodbody", "Arthur Cox", "Matheson", "McCann Fitzgerald", "William Fry"],
-        "typical_roles": ["Trainee Solicitor", "Legal Assistant", "Paralegal", "In-House Counsel"],
-        "skills_demand": "Medium",
-        "remote_work_availability": "Low",
-        "further_study_rate": 35,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "2-4% annually",
-        "avg_class_size": 60,
-        "internship_opportunities": "Fair - 60% placement rate",
-        "startup_salary_range": {"min": 26000, "max": 32000}
-    },
-    
-    "Medicine - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 45000,
-        "salary_5_years": 78000,
-        "growth_rate": 1.73,
-        "typical_tuition": 8500,
-        "course_length": 6,
-        "source": "HSE Pay Scales 2024, IMG Connect",
-        "employment_rate": 100,
-        "graduate_satisfaction": 4.5,
-        "job_security": 5.0,
-        "work_life_balance": 2.5,
-        "career_progression": "Excellent",
-        "top_employers": ["HSE", "Private Hospitals", "Beaumont Hospital", "St. Vincent's", "Mater Hospital"],
-        "typical_roles": ["Junior Doctor", "Hospital Intern", "SHO", "Registrar"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 45,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 70,
-        "internship_opportunities": "Guaranteed - 100% placement",
-        "startup_salary_range": {"min": 45000, "max": 45000}
-    },
-    
-    "Veterinary Medicine - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 35000,
-        "salary_5_years": 50000,
-        "growth_rate": 1.43,
-        "typical_tuition": 12000,
-        "course_length": 5,
-        "source": "Veterinary Council Ireland, gradireland",
-        "employment_rate": 98,
-        "graduate_satisfaction": 4.4,
-        "job_security": 4.5,
-        "work_life_balance": 3.3,
-        "career_progression": "Very Good",
-        "top_employers": ["Private Vet Practices", "Department of Agriculture", "Pharmaceutical Companies", "Universities", "Self-Employed"],
-        "typical_roles": ["Veterinary Surgeon", "Farm Vet", "Small Animal Vet", "Equine Vet"],
-        "skills_demand": "High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 25,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "3-4% annually",
-        "avg_class_size": 92,
-        "internship_opportunities": "Guaranteed - 100% clinical placement",
-        "startup_salary_range": {"min": 32000, "max": 38000}
-    },
-    
-    "Nursing - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 36000,
-        "salary_5_years": 48000,
-        "growth_rate": 1.33,
-        "typical_tuition": 7200,
-        "course_length": 4,
-        "source": "HSE Pay Scales January 2024, FRS Recruitment 2025",
-        "employment_rate": 98,
-        "graduate_satisfaction": 4.3,
-        "job_security": 4.8,
-        "work_life_balance": 3.2,
-        "career_progression": "Very Good",
-        "top_employers": ["HSE", "Mater Hospital", "St. Vincent's", "Beaumont Hospital", "Private Nursing Homes"],
-        "typical_roles": ["Staff Nurse", "Clinical Nurse Specialist", "Nurse Manager", "Public Health Nurse"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 28,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 65,
-        "internship_opportunities": "Guaranteed - 100% clinical placement",
-        "startup_salary_range": {"min": 35000, "max": 37000}
-    },
-    
-    "Physiotherapy - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 44563,
-        "salary_5_years": 56753,
-        "growth_rate": 1.27,
-        "typical_tuition": 7400,
-        "course_length": 4,
-        "source": "Forsa Health Salary Scales 2024",
-        "employment_rate": 94,
-        "graduate_satisfaction": 4.2,
-        "job_security": 4.5,
-        "work_life_balance": 3.9,
-        "career_progression": "Very Good",
-        "top_employers": ["HSE", "Sports Surgery Clinic", "Beacon Hospital", "Hermitage Clinic", "Private Clinics"],
-        "typical_roles": ["Physiotherapist", "Rehab Specialist", "MSK Physiotherapist", "Neurophysiotherapist"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 20,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "5-7% annually",
-        "avg_class_size": 45,
-        "internship_opportunities": "Excellent - 88% placement rate",
-        "startup_salary_range": {"min": 42000, "max": 47000}
-    },
-    
-    "Radiography - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 44012,
-        "salary_5_years": 57882,
-        "growth_rate": 1.31,
-        "typical_tuition": 7300,
-        "course_length": 4,
-        "source": "Forsa Health Salary Scales 2024",
-        "employment_rate": 96,
-        "graduate_satisfaction": 4.2,
-        "job_security": 4.6,
-        "work_life_balance": 3.7,
-        "career_progression": "Very Good",
-        "top_employers": ["HSE", "Beacon Hospital", "Mater Hospital", "St. Vincent's", "Private Imaging Centers"],
-        "typical_roles": ["Diagnostic Radiographer", "CT/MRI Radiographer", "Interventional Radiographer", "Chief Radiographer"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 18,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "4-5% annually",
-        "avg_class_size": 42,
-        "internship_opportunities": "Excellent - 95% placement rate",
-        "startup_salary_range": {"min": 42000, "max": 46000}
-    },
-    
-    "Actuarial Science - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 38000,
-        "salary_5_years": 58000,
-        "growth_rate": 1.53,
-        "typical_tuition": 7400,
-        "course_length": 4,
-        "source": "Society of Actuaries Ireland, gradireland",
-        "employment_rate": 96,
-        "graduate_satisfaction": 4.3,
-        "job_security": 4.7,
-        "work_life_balance": 3.6,
-        "career_progression": "Excellent",
-        "top_employers": ["Insurance Companies", "Pension Consultancies", "Willis Towers Watson", "Mercer", "Deloitte"],
-        "typical_roles": ["Trainee Actuary", "Actuarial Analyst", "Pensions Consultant", "Risk Analyst"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 45,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "6-8% annually",
-        "avg_class_size": 35,
-        "internship_opportunities": "Excellent - 92% placement rate",
-        "startup_salary_range": {"min": 35000, "max": 42000}
-    },
-    
-    "Architecture - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 28000,
-        "salary_5_years": 40000,
-        "growth_rate": 1.43,
-        "typical_tuition": 7500,
-        "course_length": 5,
-        "source": "RIAI, gradireland",
-        "employment_rate": 85,
-        "graduate_satisfaction": 4.0,
-        "job_security": 3.6,
-        "work_life_balance": 3.3,
-        "career_progression": "Good",
-        "top_employers": ["Architecture Firms", "Urban Planning", "Construction Companies", "Local Authorities", "Self-Employed"],
-        "typical_roles": ["Architectural Assistant", "Architect", "Project Architect", "Principal Architect"],
-        "skills_demand": "Medium",
-        "remote_work_availability": "Medium",
-        "further_study_rate": 60,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 62,
-        "internship_opportunities": "Good - 70% placement rate",
-        "startup_salary_range": {"min": 25000, "max": 31000}
-    },
-    
-    "Psychology - UCD": {
-        "university": "University College Dublin",
-        "starting_salary": 32000,
-        "salary_5_years": 42000,
-        "growth_rate": 1.31,
-        "typical_tuition": 7400,
-        "course_length": 4,
-        "source": "gradireland 2024",
-        "employment_rate": 80,
-        "graduate_satisfaction": 3.9,
-        "job_security": 3.7,
-        "work_life_balance": 4.0,
-        "career_progression": "Good",
-        "top_employers": ["HSE", "Jigsaw", "Pieta House", "Private Practice", "Universities"],
-        "typical_roles": ["Assistant Psychologist", "Wellbeing Officer", "Research Assistant", "Support Worker"],
-        "skills_demand": "Medium",
-        "remote_work_availability": "Medium",
-        "further_study_rate": 68,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "3-5% annually",
-        "avg_class_size": 92,
-        "internship_opportunities": "Fair - 52% placement rate",
-        "startup_salary_range": {"min": 28000, "max": 35000}
-    },
+# Where the catalogue is loaded from, in order of preference:
+#   COURSE_SNAPSHOT  - compiled snapshot, memory-mapped (catalogue_snapshot.py)
+#   COURSE_CATALOGUE - NDJSON catalogue (catalogue_generator.py)
+#   otherwise the built-in records in course_records.py
+SNAPSHOT_PATH = os.environ.get("COURSE_SNAPSHOT")
+CATALOGUE_PATH = os.environ.get("COURSE_CATALOGUE")
+RECORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "course_records.py")
 
-    # ==================== TCD (Trinity College Dublin) ====================
-    "Computer Science - TCD": {
-        "university": "Trinity College Dublin",
-        "starting_salary": 35000,
-        "salary_5_years": 49000,
-        "growth_rate": 1.4,
-        "typical_tuition": 7500,
-        "course_length": 4,
-        "source": "Software Space Ireland 2024, gradireland",
-        "employment_rate": 97,
-        "graduate_satisfaction": 4.4,
-        "job_security": 4.5,
-        "work_life_balance": 3.8,
-        "career_progression": "Excellent",
-        "top_employers": ["Google", "Meta", "IBM", "Stripe", "Shopify"],
-        "typical_roles": ["Software Engineer", "Machine Learning Engineer", "DevOps Engineer", "Security Analyst"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 18,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "20-25% annually",
-        "avg_class_size": 42,
-        "internship_opportunities": "Excellent - 92% placement rate",
-        "startup_salary_range": {"min": 32000, "max": 39000}
-    },
-    
-    "Artificial Intelligence - TCD": {
-        "university": "Trinity College Dublin",
-        "starting_salary": 42000,
-        "salary_5_years": 65000,
-        "growth_rate": 1.55,
-        "typical_tuition": 7800,
-        "course_length": 4,
-        "source": "Nucamp Ireland 2025",
-        "employment_rate": 98,
-        "graduate_satisfaction": 4.6,
-        "job_security": 4.7,
-        "work_life_balance": 3.6,
-        "career_progression": "Excellent",
-        "top_employers": ["Google", "Amazon", "Microsoft", "Meta", "OpenAI"],
-        "typical_roles": ["ML Engineer", "AI Researcher", "Data Scientist", "AI Product Manager"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 25,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "383% growth in demand",
-        "avg_class_size": 30,
-        "internship_opportunities": "Excellent - 88% placement rate",
-        "startup_salary_range": {"min": 40000, "max": 48000}
-    },
-    
-    "Engineering - TCD": {
-        "university": "Trinity College Dublin",
-        "starting_salary": 36500,
-        "salary_5_years": 47500,
-        "growth_rate": 1.3,
-        "typical_tuition": 7800,
-        "course_length": 4,
-        "source": "gradireland 2024, Engineers Ireland",
-        "employment_rate": 94,
-        "graduate_satisfaction": 4.2,
-        "job_security": 4.3,
-        "work_life_balance": 3.6,
-        "career_progression": "Very Good",
-        "top_employers": ["Intel", "Analog Devices", "Pfizer", "Arup", "PM Group"],
-        "typical_roles": ["Engineering Graduate", "Technical Consultant", "R&D Engineer", "Manufacturing Engineer"],
-        "skills_demand": "High",
-        "remote_work_availability": "Medium",
-        "further_study_rate": 22,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "5-7% annually",
-        "avg_class_size": 48,
-        "internship_opportunities": "Very Good - 78% placement rate",
-        "startup_salary_range": {"min": 33000, "max": 40000}
-    },
-    
-    "Business/Commerce - TCD": {
-        "university": "Trinity College Dublin",
-        "starting_salary": 30000,
-        "salary_5_years": 40500,
-        "growth_rate": 1.35,
-        "typical_tuition": 7900,
-        "course_length": 4,
-        "source": "Glassdoor IE 2024, gradireland",
-        "employment_rate": 91,
-        "graduate_satisfaction": 4.0,
-        "job_security": 3.9,
-        "work_life_balance": 3.4,
-        "career_progression": "Good",
-        "top_employers": ["Goldman Sachs", "Citi", "McKinsey", "BCG", "Accenture"],
-        "typical_roles": ["Analyst", "Associate Consultant", "Junior Accountant", "Investment Analyst"],
-        "skills_demand": "Medium",
-        "remote_work_availability": "Medium",
-        "further_study_rate": 28,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "3-5% annually",
-        "avg_class_size": 75,
-        "internship_opportunities": "Good - 68% placement rate",
-        "startup_salary_range": {"min": 27000, "max": 33000}
-    },
-    
-    "Law - TCD": {
-        "university": "Trinity College Dublin",
-        "starting_salary": 42000,
-        "salary_5_years": 70000,
-        "growth_rate": 1.67,
-        "typical_tuition": 8200,
-        "course_length": 4,
-        "source": "Glassdoor IE 2024, Law Society Ireland",
-        "employment_rate": 87,
-        "graduate_satisfaction": 3.8,
-        "job_security": 4.1,
-        "work_life_balance": 2.8,
-        "career_progression": "Very Good",
-        "top_employers": ["Arthur Cox", "Matheson", "A&L Goodbody", "Mason Hayes & Curran", "Dillon Eustace"],
-        "typical_roles": ["Trainee Solicitor", "Legal Researcher", "Barrister", "Legal Advisor"],
-        "skills_demand": "Medium",
-        "remote_work_availability": "Low",
-        "further_study_rate": 40,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "2-4% annually",
-        "avg_class_size": 55,
-        "internship_opportunities": "Fair - 52% placement rate",
-        "startup_salary_range": {"min": 38000, "max": 46000}
-    },
-    
-    "Medicine - TCD": {
-        "university": "Trinity College Dublin",
-        "starting_salary": 45000,
-        "salary_5_years": 78000,
-        "growth_rate": 1.73,
-        "typical_tuition": 9200,
-        "course_length": 6,
-        "source": "HSE Pay Scales 2024, IMG Connect",
-        "employment_rate": 100,
-        "graduate_satisfaction": 4.6,
-        "job_security": 5.0,
-        "work_life_balance": 2.4,
-        "career_progression": "Excellent",
-        "top_employers": ["HSE", "St. James's Hospital", "Tallaght Hospital", "Private Practice", "Research Institutions"],
-        "typical_roles": ["Intern", "SHO", "Clinical Fellow", "Registrar"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 50,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 65,
-        "internship_opportunities": "Guaranteed - 100% placement",
-        "startup_salary_range": {"min": 45000, "max": 45000}
-    },
-    
-    "Nursing - TCD": {
-        "university": "Trinity College Dublin",
-        "starting_salary": 36000,
-        "salary_5_years": 48000,
-        "growth_rate": 1.33,
-        "typical_tuition": 7800,
-        "course_length": 4,
-        "source": "HSE Pay Scales 2024",
-        "employment_rate": 99,
-        "graduate_satisfaction": 4.4,
-        "job_security": 4.8,
-        "work_life_balance": 3.1,
-        "career_progression": "Very Good",
-        "top_employers": ["HSE", "St. James's Hospital", "Tallaght Hospital", "Adelaide & Meath Hospital", "Private Hospitals"],
-        "typical_roles": ["Staff Nurse", "CNS", "ANP", "Nurse Educator"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 30,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 60,
-        "internship_opportunities": "Guaranteed - 100% clinical placement",
-        "startup_salary_range": {"min": 35000, "max": 37000}
-    },
-    
-    "Physiotherapy - TCD": {
-        "university": "Trinity College Dublin",
-        "starting_salary": 44563,
-        "salary_5_years": 56753,
-        "growth_rate": 1.27,
-        "typical_tuition": 7900,
-        "course_length": 4,
-        "source": "Forsa Health Salary Scales 2024, HSE",
-        "employment_rate": 95,
-        "graduate_satisfaction": 4.3,
-        "job_security": 4.5,
-        "work_life_balance": 3.8,
-        "career_progression": "Very Good",
-        "top_employers": ["HSE", "Private Hospitals", "Sports Clinics", "Private Practice", "Community Care"],
-        "typical_roles": ["Physiotherapist", "Sports Physio", "Musculoskeletal Specialist", "Clinical Specialist"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 22,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "5-7% annually",
-        "avg_class_size": 42,
-        "internship_opportunities": "Excellent - 90% placement rate",
-        "startup_salary_range": {"min": 42000, "max": 47000}
-    },
-    
-    "Occupational Therapy - TCD": {
-        "university": "Trinity College Dublin",
-        "starting_salary": 44563,
-        "salary_5_years": 56753,
-        "growth_rate": 1.27,
-        "typical_tuition": 7900,
-        "course_length": 4,
-        "source": "Forsa Health Salary Scales 2024",
-        "employment_rate": 94,
-        "graduate_satisfaction": 4.3,
-        "job_security": 4.6,
-        "work_life_balance": 3.9,
-        "career_progression": "Very Good",
-        "top_employers": ["HSE", "Enable Ireland", "RehabCare", "Central Remedial Clinic", "Private Practice"],
-        "typical_roles": ["Occupational Therapist", "Paediatric OT", "Mental Health OT", "Clinical Specialist OT"],
-        "skills_demand": "High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 24,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 40,
-        "internship_opportunities": "Excellent - 88% placement rate",
-        "startup_salary_range": {"min": 42000, "max": 47000}
-    },
-    
-    "Speech & Language Therapy - TCD": {
-        "university": "Trinity College Dublin",
-        "starting_salary": 44563,
-        "salary_5_years": 56753,
-        "growth_rate": 1.27,
-        "typical_tuition": 7900,
-        "course_length": 4,
-        "source": "Forsa Health Salary Scales 2024",
-        "employment_rate": 96,
-        "graduate_satisfaction": 4.4,
-        "job_security": 4.6,
-        "work_life_balance": 4.0,
-        "career_progression": "Very Good",
-        "top_employers": ["HSE", "Enable Ireland", "Central Remedial Clinic", "St. Michael's House", "Private Practice"],
-        "typical_roles": ["Speech & Language Therapist", "Paediatric SLT", "Dysphagia Specialist", "Clinical Specialist SLT"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 26,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "5-7% annually",
-        "avg_class_size": 38,
-        "internship_opportunities": "Excellent - 90% placement rate",
-        "startup_salary_range": {"min": 42000, "max": 47000}
-    },
+# COURSE_DATA_SHARED=1 moves the catalogue into shared memory at startup so
+# forked workers (gunicorn --preload, see gunicorn.conf.py) reuse one copy
+SHARE_TABLE = os.environ.get("COURSE_DATA_SHARED", "").lower() in ("1", "true", "yes")
 
-    # ==================== DCU (Dublin City University) ====================
-    "Computer Applications - DCU": {
-        "university": "Dublin City University",
-        "starting_salary": 34000,
-        "salary_5_years": 48000,
-        "growth_rate": 1.41,
-        "typical_tuition": 6500,
-        "course_length": 4,
-        "source": "DCU 2024",
-        "employment_rate": 93,
-        "graduate_satisfaction": 4.2,
-        "job_security": 4.4,
-        "work_life_balance": 3.9,
-        "career_progression": "Very Good",
-        "top_employers": ["Microsoft", "IBM", "Accenture", "State Street", "Bank of Ireland"],
-        "typical_roles": ["Software Developer", "Application Developer", "Systems Analyst", "IT Consultant"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "High",
-        "further_study_rate": 15,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "20-25% annually",
-        "avg_class_size": 50,
-        "internship_opportunities": "Excellent - 82% placement via INTRA",
-        "startup_salary_range": {"min": 31000, "max": 37000}
-    },
-    
-    "Engineering - DCU": {
-        "university": "Dublin City University",
-        "starting_salary": 36000,
-        "salary_5_years": 47000,
-        "growth_rate": 1.31,
-        "typical_tuition": 6600,
-        "course_length": 4,
-        "source": "DCU 2024, Engineers Ireland",
-        "employment_rate": 92,
-        "graduate_satisfaction": 4.1,
-        "job_security": 4.3,
-        "work_life_balance": 3.7,
-        "career_progression": "Very Good",
-        "top_employers": ["Intel", "Analog Devices", "Microsoft", "IBM", "Siemens"],
-        "typical_roles": ["Graduate Engineer", "Process Engineer", "Design Engineer", "Manufacturing Engineer"],
-        "skills_demand": "High",
-        "remote_work_availability": "Medium",
-        "further_study_rate": 19,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "5-7% annually",
-        "avg_class_size": 52,
-        "internship_opportunities": "Very Good - 78% placement via INTRA",
-        "startup_salary_range": {"min": 33000, "max": 39000}
-    },
-    
-    "Business - DCU": {
-        "university": "Dublin City University",
-        "starting_salary": 29500,
-        "salary_5_years": 39500,
-        "growth_rate": 1.34,
-        "typical_tuition": 6400,
-        "course_length": 4,
-        "source": "DCU 2024",
-        "employment_rate": 88,
-        "graduate_satisfaction": 3.9,
-        "job_security": 3.8,
-        "work_life_balance": 3.6,
-        "career_progression": "Good",
-        "top_employers": ["Big 4", "State Street", "Bank of Ireland", "AIB", "Accenture"],
-        "typical_roles": ["Business Analyst", "Accountant", "Financial Analyst", "Management Trainee"],
-        "skills_demand": "Medium",
-        "remote_work_availability": "Medium",
-        "further_study_rate": 24,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "3-5% annually",
-        "avg_class_size": 78,
-        "internship_opportunities": "Good - 65% placement via INTRA",
-        "startup_salary_range": {"min": 26000, "max": 32000}
-    },
-    
-    "Nursing - DCU": {
-        "university": "Dublin City University",
-        "starting_salary": 36000,
-        "salary_5_years": 48000,
-        "growth_rate": 1.33,
-        "typical_tuition": 6500,
-        "course_length": 4,
-        "source": "HSE Pay Scales 2024",
-        "employment_rate": 97,
-        "graduate_satisfaction": 4.2,
-        "job_security": 4.8,
-        "work_life_balance": 3.3,
-        "career_progression": "Very Good",
-        "top_employers": ["HSE", "Beaumont Hospital", "Connolly Hospital", "Community Services", "Private Hospitals"],
-        "typical_roles": ["Staff Nurse", "Clinical Nurse", "Theatre Nurse", "Emergency Nurse"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 27,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 64,
-        "internship_opportunities": "Guaranteed - 100% clinical placement",
-        "startup_salary_range": {"min": 35000, "max": 37000}
-    },
-    
-    "Psychology - DCU": {
-        "university": "Dublin City University",
-        "starting_salary": 31000,
-        "salary_5_years": 41000,
-        "growth_rate": 1.32,
-        "typical_tuition": 6500,
-        "course_length": 4,
-        "source": "gradireland 2024",
-        "employment_rate": 78,
-        "graduate_satisfaction": 3.9,
-        "job_security": 3.6,
-        "work_life_balance": 4.0,
-        "career_progression": "Good",
-        "top_employers": ["HSE", "Pieta House", "Jigsaw", "Private Practice", "Universities"],
-        "typical_roles": ["Assistant Psychologist", "Research Assistant", "Wellbeing Officer", "Support Worker"],
-        "skills_demand": "Medium",
-        "remote_work_availability": "Medium",
-        "further_study_rate": 65,
-        "international_opportunities": "Good",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 85,
-        "internship_opportunities": "Fair - 50% placement rate",
-        "startup_salary_range": {"min": 27000, "max": 34000}
-    },
-    
-    "Education - DCU": {
-        "university": "Dublin City University",
-        "starting_salary": 37803,
-        "salary_5_years": 52059,
-        "growth_rate": 1.38,
-        "typical_tuition": 6500,
-        "course_length": 4,
-        "source": "Teaching Council Ireland 2024",
-        "employment_rate": 92,
-        "graduate_satisfaction": 4.1,
-        "job_security": 4.6,
-        "work_life_balance": 4.4,
-        "career_progression": "Good",
-        "top_employers": ["Primary Schools", "Secondary Schools", "Educate Together", "Community Schools"],
-        "typical_roles": ["Primary Teacher", "Post-Primary Teacher", "Special Education Teacher", "Resource Teacher"],
-        "skills_demand": "High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 28,
-        "international_opportunities": "Fair",
-        "industry_growth_rate": "2-3% annually",
-        "avg_class_size": 68,
-        "internship_opportunities": "Guaranteed - 100% teaching practice",
-        "startup_salary_range": {"min": 37000, "max": 39000}
-    },
-    
-    "Communications - DCU": {
-        "university": "Dublin City University",
-        "starting_salary": 27000,
-        "salary_5_years": 36000,
-        "growth_rate": 1.33,
-        "typical_tuition": 6400,
-        "course_length": 4,
-        "source": "gradireland 2024",
-        "employment_rate": 82,
-        "graduate_satisfaction": 3.8,
-        "job_security": 3.4,
-        "work_life_balance": 3.7,
-        "career_progression": "Fair",
-        "top_employers": ["RTÉ", "Virgin Media", "PR Agencies", "Marketing Firms", "Digital Media"],
-        "typical_roles": ["Communications Officer", "PR Executive", "Content Creator", "Social Media Manager"],
-        "skills_demand": "Medium",
-        "remote_work_availability": "High",
-        "further_study_rate": 30,
-        "international_opportunities": "Fair",
-        "industry_growth_rate": "3-5% annually",
-        "avg_class_size": 72,
-        "internship_opportunities": "Fair - 55% placement rate",
-        "startup_salary_range": {"min": 24000, "max": 30000}
-    },
+# (kind, path) of the data source being served; watched for hot reloads
+if SNAPSHOT_PATH:
+    CATALOGUE_SOURCE = ("snapshot", SNAPSHOT_PATH)
+elif CATALOGUE_PATH:
+    CATALOGUE_SOURCE = ("ndjson", CATALOGUE_PATH)
+else:
+    CATALOGUE_SOURCE = ("records", RECORDS_PATH)
+
+
+def load_catalogue_source(kind, path, version=None):
+    """
+    Build a fresh CourseTable from a data source.
+
+    Args:
+        kind: "snapshot", "ndjson" or "records" (a module defining COURSE_RECORDS)
+        path: file to read
+    """
+    if kind == "snapshot":
+        from catalogue_snapshot import open_snapshot
+        return open_snapshot(path, version)
+    if kind == "ndjson":
+        from catalogue_file import load_catalogue
+        return load_catalogue(path, version)
+    if kind == "records":
+        return CourseTable.from_records(runpy.run_path(path)["COURSE_RECORDS"], version)
+    raise ValueError(f"Unknown catalogue source kind: {kind}")
+
+
+def _load_initial_table():
+    kind, path = CATALOGUE_SOURCE
+    if kind == "records":
+        from course_records import COURSE_RECORDS
+        table = CourseTable.from_records(COURSE_RECORDS, version=1)
+    else:
+        table = load_catalogue_source(kind, path, version=1)
+
+    # A snapshot is already a shared file mapping
+    if SHARE_TABLE and kind != "snapshot":
+        from catalogue_snapshot import share_table
+        table = share_table(table)
+        # Let the source dict be freed; COURSE_RECORDS re-imports it on demand
+        sys.modules.pop("course_records", None)
+    return table
+
+
+def __getattr__(name):
+    # The source dict is only imported when asked for, so serving a
+    # snapshot never executes the records module
+    if name == "COURSE_RECORDS":
+        from course_records import COURSE_RECORDS
+        return COURSE_RECORDS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_active_table = _load_initial_table()
+
+# A request pins the table that was active when it started, so a reload
+# in the middle of it cannot mix data from two versions
+_pinned_table = contextvars.ContextVar("pinned_course_table", default=None)
+
+
+def get_course_table():
+    """Return the CourseTable for the current request (the active one if none is pinned)"""
+    pinned = _pinned_table.get()
+    return _active_table if pinned is None else pinned
+
+
+def pin_course_table():
+    """Pin the active table for the current context; pass the token to unpin_course_table()"""
+    return _pinned_table.set(_active_table)
+
+
+def unpin_course_table(token):
+    _pinned_table.reset(token)
+
+
+# Read-only {course_name: record} view of the active table, so existing
+# COURSE_DATA[name] / COURSE_DATA.get(name) lookups keep working
+COURSE_DATA = CourseDataView(get_course_table)
 
-    # ==================== RCSI (Royal College of Surgeons Ireland) ====================
-    "Medicine - RCSI": {
-        "university": "Royal College of Surgeons Ireland",
-        "starting_salary": 45000,
-        "salary_5_years": 78000,
-        "growth_rate": 1.73,
-        "typical_tuition": 35000,
-        "course_length": 6,
-        "source": "HSE Pay Scales 2024",
-        "employment_rate": 100,
-        "graduate_satisfaction": 4.6,
-        "job_security": 5.0,
-        "work_life_balance": 2.3,
-        "career_progression": "Excellent",
-        "top_employers": ["HSE", "Beaumont Hospital", "RCSI Hospitals Group", "Private Hospitals", "International"],
-        "typical_roles": ["Intern", "SHO", "Registrar", "Specialist"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 52,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 110,
-        "internship_opportunities": "Guaranteed - 100% placement",
-        "startup_salary_range": {"min": 45000, "max": 45000}
-    },
-    
-    "Pharmacy - RCSI": {
-        "university": "Royal College of Surgeons Ireland",
-        "starting_salary": 38000,
-        "salary_5_years": 52000,
-        "growth_rate": 1.37,
-        "typical_tuition": 22000,
-        "course_length": 4,
-        "source": "Pharmaceutical Society Ireland 2024",
-        "employment_rate": 96,
-        "graduate_satisfaction": 4.3,
-        "job_security": 4.5,
-        "work_life_balance": 3.8,
-        "career_progression": "Very Good",
-        "top_employers": ["Community Pharmacies", "Hospital Pharmacies", "HSE", "Pharmaceutical Companies", "Retail Chains"],
-        "typical_roles": ["Pharmacist", "Clinical Pharmacist", "Community Pharmacist", "Hospital Pharmacist"],
-        "skills_demand": "High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 28,
-        "international_opportunities": "Very Good",
-        "industry_growth_rate": "4-5% annually",
-        "avg_class_size": 85,
-        "internship_opportunities": "Excellent - 90% placement rate",
-        "startup_salary_range": {"min": 36000, "max": 40000}
-    },
-    
-    "Physiotherapy - RCSI": {
-        "university": "Royal College of Surgeons Ireland",
-        "starting_salary": 44563,
-        "salary_5_years": 56753,
-        "growth_rate": 1.27,
-        "typical_tuition": 15000,
-        "course_length": 4,
-        "source": "Forsa Health Salary Scales 2024",
-        "employment_rate": 95,
-        "graduate_satisfaction": 4.4,
-        "job_security": 4.6,
-        "work_life_balance": 3.9,
-        "career_progression": "Very Good",
-        "top_employers": ["HSE", "RCSI Hospitals", "Sports Medicine Clinics", "Private Practice", "Rehabilitation Centers"],
-        "typical_roles": ["Physiotherapist", "Sports Physiotherapist", "Clinical Specialist", "Rehab Specialist"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 21,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "5-7% annually",
-        "avg_class_size": 44,
-        "internship_opportunities": "Excellent - 92% placement rate",
-        "startup_salary_range": {"min": 42000, "max": 47000}
-    },
-    
-    "Nursing - RCSI": {
-        "university": "Royal College of Surgeons Ireland",
-        "starting_salary": 36000,
-        "salary_5_years": 48000,
-        "growth_rate": 1.33,
-        "typical_tuition": 14000,
-        "course_length": 4,
-        "source": "HSE Pay Scales 2024",
-        "employment_rate": 99,
-        "graduate_satisfaction": 4.5,
-        "job_security": 4.9,
-        "work_life_balance": 3.2,
-        "career_progression": "Excellent",
-        "top_employers": ["HSE", "RCSI Hospitals", "Beaumont Hospital", "Connolly Hospital", "Private Hospitals"],
-        "typical_roles": ["Staff Nurse", "Surgical Nurse", "ICU Nurse", "Clinical Nurse Specialist"],
-        "skills_demand": "Very High",
-        "remote_work_availability": "Low",
-        "further_study_rate": 32,
-        "international_opportunities": "Excellent",
-        "industry_growth_rate": "4-6% annually",
-        "avg_class_size": 95,
-        "internship_opportunities": "Guaranteed - 100% clinical placement",
-        "startup_salary_range": {"min": 35000, "max": 37000}
-    },
-}
 
 # ==================== HELPER FUNCTIONS ====================
 
 def get_all_courses():
     """Return list of all available course names"""
-    return sorted(list(COURSE_DATA.keys()))
+    return list(get_course_table().names)
+
+
+def _names_for_rows(table, rows):
+    return [table.names[row] for row in rows]
 
 
 def get_courses_by_university(university_name):
-    """Get all courses for a specific university"""
-    courses = []
-    for course_name, course_info in COURSE_DATA.items():
-        if (university_name.lower() in course_info["university"].lower() or 
-            university_name.lower() in course_name.lower()):
-            courses.append(course_name)
-    return sorted(courses)
+    """Get all courses for a specific university (full name or short code, e.g. "UCD")"""
+    table = get_course_table()
+    by_name = table.index("university")
+    by_code = table.index("university_code")
+    
+    rows = np.union1d(by_name.exact(university_name), by_code.exact(university_name))
+    if not len(rows):
+        rows = np.union1d(by_name.containing(university_name), by_code.containing(university_name))
+    return _names_for_rows(table, rows.tolist())
 
 
 def get_universities():
     """Return list of all universities in the database"""
-    universities = set()
-    for course_info in COURSE_DATA.values():
-        universities.add(course_info["university"])
-    return sorted(list(universities))
+    return sorted(get_course_table().category_column("university").categories)
 
 
 def get_courses_by_field(field_name):
-    """Get all courses in a specific field"""
-    courses = []
-    for course_name in COURSE_DATA.keys():
-        if field_name.lower() in course_name.lower():
-            courses.append(course_name)
-    return courses
+    """
+    Get all courses in a specific field.
+    
+    "Engineering" returns the Engineering courses only, not "Software
+    Engineering"; a partial name such as "Data" matches every field
+    containing it when no field has that exact name.
+    """
+    table = get_course_table()
+    return _names_for_rows(table, table.index("field").lookup(field_name).tolist())
 
 
-def search_courses(query):
-    """Search courses by name or university"""
-    query = query.lower()
-    results = []
-    for course_name in COURSE_DATA.keys():
-        if query in course_name.lower():
-            results.append(course_name)
-    return results
+def search_courses(query, limit=None):
+    """Search courses by name, university, typical roles or top employers, best match first"""
+    table = get_course_table()
+    query = query.strip()
+    if query in table:
+        return [query]
+    return [hit["course"] for hit in table.search_index().search(query, limit=limit)]
 
 
-def validate_course_data():
-    """Validate all course entries have required fields"""
+def validate_course_data(course_data=None):
+    """
+    Validate all course entries have required fields.
+    
+    Checks COURSE_DATA unless another {course_name: record} mapping is given
+    (e.g. a catalogue that is about to be swapped in).
+    """
+    if course_data is None:
+        course_data = COURSE_DATA
     required_fields = [
         "university", "starting_salary", "salary_5_years", "growth_rate",
         "typical_tuition", "course_length", "source"
     ]
+    # The ROI formulas divide by these
+    positive_fields = ["starting_salary", "typical_tuition", "course_length"]
     
     errors = []
-    for course_name, course_info in COURSE_DATA.items():
+    if not course_data:
+        errors.append("No courses in catalogue")
+    for course_name, course_info in course_data.items():
         for field in required_fields:
             if field not in course_info:
                 errors.append(f"{course_name} missing field: {field}")
+        for field in positive_fields:
+            value = course_info.get(field)
+            if value is not None and not value > 0:
+                errors.append(f"{course_name} has non-positive {field}: {value}")
     
     if errors:
         print("⚠️ Data validation errors:")
@@ -1554,4 +194,80 @@ def validate_course_data():
         return False
     else:
         print("✅ All course data validated successfully")
-        return True
\ No newline at end of file
+        return True
+
+
+# ==================== DATA VERSIONING ====================
+
+# Generation number of the active course table. Anything derived from the course data
+# (statistics, indexes, cached responses) records the version it was built
+# from and rebuilds itself once this number moves on.
+_data_version = 1
+_version_lock = threading.Lock()
+
+# Derived values kept per builder: the active version and the one before it
+CACHED_VERSIONS = 2
+
+
+def get_data_version():
+    """Return the generation number of the table the current request is using"""
+    pinned = _pinned_table.get()
+    return _data_version if pinned is None else pinned.version
+
+
+def mark_data_changed():
+    """Bump the data version so derived caches get rebuilt"""
+    global _data_version
+    with _version_lock:
+        _data_version += 1
+        _active_table.version = _data_version
+        return _data_version
+
+
+def install_course_table(table):
+    """Make `table` the active catalogue and bump the data version"""
+    global _active_table, _data_version
+    with _version_lock:
+        _data_version += 1
+        table.version = _data_version
+        _active_table = table
+        return _data_version
+
+
+def cached_per_data_version(builder):
+    """
+    Cache the result of a builder until the data changes.
+
+    The wrapped function is built at most once per data version and set of
+    (hashable) arguments. The last CACHED_VERSIONS versions are kept, so
+    requests still pinned to the previous table during a reload do not
+    force rebuilds.
+    `wrapper.cached_version()` reports the newest version held and
+    `wrapper.invalidate()` forces a rebuild on the next call.
+    """
+    lock = threading.Lock()
+    values = {}
+
+    @wraps(builder)
+    def wrapper(*args):
+        version = get_data_version()
+        try:
+            return values[version][args]
+        except KeyError:
+            pass
+        with lock:
+            built = values.setdefault(version, {})
+            value = built.get(args)
+            if value is None:
+                value = built[args] = builder(*args)
+                while len(values) > CACHED_VERSIONS:
+                    values.pop(min(values))
+            return value
+
+    def invalidate():
+        with lock:
+            values.clear()
+
+    wrapper.invalidate = invalidate
+    wrapper.cached_version = lambda: max(values, default=None)
+    return wrapper
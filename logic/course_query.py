@@ -0,0 +1,190 @@
+# course_query.py
+# Multi-criteria course search: filter, sort and paginate on the server
+#
+# Category predicates (university, field, skills demand, ...) use bitmaps
+# built once per data version: one packed bit per course for every value,
+# so "any of these values" is an OR and combining criteria is an AND over
+# N/8 bytes. Numeric ranges are binary searches into the sorted arrays
+# kept by rankings.py, setting bits only for the courses in range. The
+# matches are then read off in the order of the requested ranking.
+
+import numpy as np
+
+from course_data import cached_per_data_version, get_course_table
+from rankings import get_rankings, RANK_METRICS
+
+# Category filters and the columns they match; a university can be given
+# by its code ("UCD") or its full name
+CATEGORY_FILTERS = {
+    "university": ("university_code", "university"),
+    "field": ("field",),
+    "career_progression": ("career_progression",),
+    "skills_demand": ("skills_demand",),
+    "remote_work_availability": ("remote_work_availability",),
+    "international_opportunities": ("international_opportunities",)
+}
+
+# Numeric filters (min_<metric> / max_<metric>) and sort keys
+RANGE_FILTERS = tuple(RANK_METRICS)
+SORT_KEYS = RANGE_FILTERS + ("name",)
+
+# Ranges matching more than this share of the catalogue are tested with one
+# sequential comparison instead of scattering bits from the sorted array
+WIDE_RANGE_FRACTION = 1 / 8
+
+# Smallest slice of a ranking scanned at a time for matches
+SCAN_CHUNK = 4096
+
+
+class CategoryBitmaps:
+    """Packed bitmaps of the courses having each category value, per filter"""
+
+    def __init__(self, table):
+        self.size = len(table)
+        self._bitmaps = {}
+        for name, fields in CATEGORY_FILTERS.items():
+            bitmaps = {}
+            for field in fields:
+                column = table.category_column(field)
+                codes = np.asarray(column.codes)
+                for code, value in enumerate(column.categories):
+                    if value is None:
+                        continue
+                    bits = np.packbits(codes == code)
+                    key = str(value).lower()
+                    bitmaps[key] = bits if key not in bitmaps else bitmaps[key] | bits
+            self._bitmaps[name] = bitmaps
+
+    def empty(self):
+        return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def match(self, name, values, contains=False):
+        """
+        Courses whose `name` category is any of `values`, ignoring case.
+
+        A value with no exact match selects every category containing it,
+        as course_data.get_courses_by_field does; with `contains` it always
+        does (so "Engineering" also selects "Software Engineering").
+        """
+        bitmaps = self._bitmaps[name]
+        bits = self.empty()
+        for value in values:
+            key = value.strip().lower()
+            if key in bitmaps and not contains:
+                bits |= bitmaps[key]
+                continue
+            for category, category_bits in bitmaps.items():
+                if key and key in category:
+                    bits |= category_bits
+        return bits
+
+
+@cached_per_data_version
+def get_category_bitmaps():
+    """Return the CategoryBitmaps for the current data version"""
+    return CategoryBitmaps(get_course_table())
+
+
+def range_bits(rankings, metric, low=None, high=None):
+    """Packed bitmap of the courses with low <= metric <= high (missing values never match)"""
+    values = rankings.sorted_values(metric)
+    start = 0 if low is None else int(np.searchsorted(values, low, side="left"))
+    # NaN sorts after +inf, so this stops before courses with no value
+    stop = int(np.searchsorted(values, np.inf if high is None else high, side="right"))
+
+    if stop - start > len(values) * WIDE_RANGE_FRACTION:
+        # Comparing every value in row order beats scattering most of them
+        column = rankings.values(metric)
+        with np.errstate(invalid="ignore"):
+            if low is not None and high is not None:
+                mask = (column >= low) & (column <= high)
+            elif low is not None:
+                mask = column >= low
+            elif high is not None:
+                mask = column <= high
+            else:
+                mask = column == column         # everything but NaN
+    else:
+        mask = np.zeros(len(values), dtype=bool)
+        mask[rankings.order(metric, False)[start:stop]] = True
+    return np.packbits(mask)
+
+
+def _first_matches(order, mask, wanted, total):
+    """The first `wanted` rows of `order` set in `mask`, scanning only as far as needed"""
+    # Matches are spread through the ranking at about total / len(mask)
+    step = max(SCAN_CHUNK, int(wanted * len(mask) / total * 1.25) + 1)
+    parts, found = [], 0
+    for start in range(0, len(order), step):
+        chunk = order[start:start + step]
+        hits = chunk[mask[chunk]]
+        parts.append(hits)
+        found += len(hits)
+        if found >= wanted:
+            break
+    return np.concatenate(parts) if parts else order[:0]
+
+
+def query_rows(categories=None, ranges=None, sort="roi_5_years", descending=None,
+               offset=0, limit=20, tax_year=None, contains=()):
+    """
+    Courses matching every criterion, in ranking order.
+
+    Args:
+        categories: {filter name: [values]}; a course matches a filter when
+            it has any of the values
+        ranges: {metric: (low, high)}; either bound may be None
+        sort: a RANGE_FILTERS metric or "name"
+        descending: sort direction (default: best first, A-Z for "name")
+        offset: matches to skip
+        limit: maximum number of rows to return
+        tax_year: tax tables the ROI metrics are based on
+        contains: category filters whose values select every category
+            containing them, not just the equal one
+
+    Returns:
+        (row ids, total number of matches, Rankings used)
+    """
+    rankings = get_rankings(tax_year)
+    if descending is None:
+        descending = RANK_METRICS.get(sort) == "desc"
+
+    bits = None
+    if categories:
+        bitmaps = get_category_bitmaps()
+        for name, values in categories.items():
+            matched = bitmaps.match(name, values, name in contains)
+            bits = matched if bits is None else bits & matched
+    for metric, (low, high) in (ranges or {}).items():
+        matched = range_bits(rankings, metric, low, high)
+        bits = matched if bits is None else bits & matched
+
+    size = rankings.stats.course_count
+    if bits is None:
+        if sort == "name":
+            rows = np.arange(size, dtype=np.int32)[::-1 if descending else 1]
+            return rows[offset:offset + limit], size, rankings
+        rows, total = rankings.page(sort, descending, offset, limit)
+        return rows, total, rankings
+
+    mask = np.unpackbits(bits, count=size).view(bool)
+    total = int(np.count_nonzero(mask))
+    wanted = offset + limit
+    if not total or offset >= total:
+        return np.empty(0, dtype=np.int32), total, rankings
+
+    # Rows are in name order, so "name" needs no ranking
+    if total < wanted * size / total:
+        # Few matches: sorting them by rank costs less than scanning for them
+        rows = np.flatnonzero(mask)
+        if sort == "name":
+            rows = rows[::-1] if descending else rows
+        else:
+            rows = rows[np.argsort(rankings.position(sort, descending)[rows], kind="stable")]
+    else:
+        if sort == "name":
+            order = np.arange(size, dtype=np.int32)[::-1 if descending else 1]
+        else:
+            order = rankings.order(sort, descending)
+        rows = _first_matches(order, mask, wanted, total)
+    return rows[offset:wanted].astype(np.int32), total, rankings
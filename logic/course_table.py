@@ -0,0 +1,454 @@
+# course_table.py
+# Compact columnar storage for the course catalogue
+# Each course is a row id; numbers live in typed arrays and repeated text
+# (universities, ratings, employer lists) is stored once and referenced by code
+
+import sys
+import math
+import hashlib
+from array import array
+from collections.abc import Mapping
+
+import numpy as np
+
+from search_index import SearchIndex
+
+# Frequently used numeric fields (ROI engine, comparisons, rankings)
+HOT_NUMERIC_FIELDS = [
+    "starting_salary", "salary_5_years", "growth_rate", "typical_tuition",
+    "course_length", "employment_rate", "graduate_satisfaction", "job_security",
+    "work_life_balance", "further_study_rate", "avg_class_size",
+    "salary_range_min", "salary_range_max"
+]
+
+# Enum-like text with only a handful of distinct values
+CATEGORY_FIELDS = [
+    "university", "career_progression", "skills_demand",
+    "remote_work_availability", "international_opportunities"
+]
+
+# Rarely used descriptive fields
+COLD_TEXT_FIELDS = ["source", "industry_growth_rate", "internship_opportunities"]
+COLD_LIST_FIELDS = ["top_employers", "typical_roles"]
+
+# Categories derived from the "Field - UNI" course name. "programme" is the
+# name without the university code, which differs from "field" for names
+# like "Education - Primary Teaching - Maynooth"
+DERIVED_CATEGORY_FIELDS = ["field", "programme", "university_code"]
+
+# Order in which a course record lists its fields (matches course_data.py)
+RECORD_FIELDS = [
+    "university", "starting_salary", "salary_5_years", "growth_rate",
+    "typical_tuition", "course_length", "source", "employment_rate",
+    "graduate_satisfaction", "job_security", "work_life_balance",
+    "career_progression", "top_employers", "typical_roles", "skills_demand",
+    "remote_work_availability", "further_study_rate", "international_opportunities",
+    "industry_growth_rate", "avg_class_size", "internship_opportunities",
+    "startup_salary_range"
+]
+
+# Sentinels for missing numeric values, per array typecode
+MISSING = {"i": -2 ** 31, "q": -2 ** 63, "d": math.nan}
+
+
+def split_course_name(course_name):
+    """Split "Field - UNI" into (field, programme, university code)"""
+    parts = course_name.split(' - ')
+    if len(parts) < 2:
+        return course_name, course_name, ""
+    return parts[0], ' - '.join(parts[:-1]), parts[-1]
+
+
+def _numeric_typecode(values):
+    """Smallest array typecode that holds every (non-missing) value exactly"""
+    present = [v for v in values if v is not None]
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        if all(-2 ** 31 < v < 2 ** 31 for v in present):
+            return "i"
+        return "q"
+    return "d"
+
+
+def typecode_of(column):
+    """Array typecode of a numeric column (array.array or mapped memoryview)"""
+    return getattr(column, "typecode", None) or column.format
+
+
+def _is_missing(typecode, value):
+    if typecode == "d":
+        return math.isnan(value)
+    return value == MISSING[typecode]
+
+
+class CategoryColumn:
+    """Integer codes into a list of distinct (interned) values"""
+
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+        self._lookup = None
+
+    @classmethod
+    def build(cls, values):
+        lookup = {}
+        categories = []
+        codes = []
+        for value in values:
+            code = lookup.get(value)
+            if code is None:
+                code = len(categories)
+                lookup[value] = code
+                categories.append(sys.intern(value) if isinstance(value, str) else value)
+            codes.append(code)
+        typecode = "H" if len(categories) <= 0xFFFF else "I"
+        return cls(array(typecode, codes), categories)
+
+    def __getitem__(self, row):
+        return self.categories[self.codes[row]]
+
+    def code_of(self, value):
+        """Code for a category value, or None if it never occurs"""
+        if self._lookup is None:
+            self._lookup = {v: code for code, v in enumerate(self.categories)}
+        return self._lookup.get(value)
+
+    def nbytes(self):
+        total = sys.getsizeof(self.codes) + sys.getsizeof(self.categories)
+        if isinstance(self.categories, list):
+            total += sum(sys.getsizeof(c) for c in self.categories)
+        return total
+
+
+def _frozen_rows(rows):
+    rows = rows.astype(np.int64)
+    rows.flags.writeable = False
+    return rows
+
+
+_NO_ROWS = _frozen_rows(np.empty(0, dtype=np.int64))
+
+
+class CategoryIndex:
+    """
+    Case-insensitive {value: row ids} index over one category column.
+
+    Lookups cost O(result) for exact matches and O(distinct values + result)
+    for partial matches - never a scan over every course. Row ids come back
+    as sorted, read-only int64 arrays built once, so callers can index
+    result arrays with them directly.
+    """
+
+    def __init__(self, column):
+        codes = np.asarray(column.codes)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(column.categories) + 1))
+
+        parts = {}
+        for code, value in enumerate(column.categories):
+            if value is None:
+                continue
+            parts.setdefault(str(value).lower(), []).append(order[bounds[code]:bounds[code + 1]])
+
+        self._rows = {}
+        for key, rows in parts.items():
+            self._rows[key] = _frozen_rows(rows[0] if len(rows) == 1 else np.sort(np.concatenate(rows)))
+
+    def exact(self, value):
+        """Rows whose value equals `value`, ignoring case"""
+        return self._rows.get(value.strip().lower(), _NO_ROWS)
+
+    def containing(self, text):
+        """Rows whose value contains `text`, ignoring case"""
+        text = text.strip().lower()
+        matches = [rows for key, rows in self._rows.items() if text in key]
+        if not matches:
+            return _NO_ROWS
+        if len(matches) == 1:
+            return matches[0]
+        return _frozen_rows(np.sort(np.concatenate(matches)))
+
+    def lookup(self, query):
+        """Exact match if there is one, otherwise partial matches"""
+        rows = self.exact(query)
+        return rows if len(rows) else self.containing(query)
+
+    def values(self):
+        return list(self._rows)
+
+    def items(self):
+        """(lower-cased value, row ids) pairs"""
+        return self._rows.items()
+
+
+class CourseTable:
+    """
+    Immutable columnar course catalogue.
+
+    Rows are sorted by course name, so row ids double as positions in
+    get_all_courses(). Use CourseTable.from_records() to build one from
+    the usual {course_name: {field: value}} dict, or
+    catalogue_snapshot.open_snapshot() to map one from disk.
+
+    `names` is a list, or for mapped tables a sorted sequence with a
+    position(name) method; columns may be arrays or memoryviews.
+    """
+
+    def __init__(self, names, numeric, categories, extras=None, version=None,
+                 content_hash=None):
+        self.names = names
+        self.version = version
+        if isinstance(names, list):
+            self._row_by_name = {name: row for row, name in enumerate(names)}
+        else:
+            # Mapped name tables are searched in place instead
+            self._row_by_name = None
+        self._numeric = numeric
+        self._categories = categories
+        self._extras = extras or {}
+        self._indexes = {}
+        self._search_index = None
+        self._content_hash = content_hash
+
+    @classmethod
+    def from_records(cls, records, version=None):
+        """Build a table from {course_name: {field: value}}"""
+        return cls.from_items(records.items(), version)
+
+    @classmethod
+    def from_items(cls, items, version=None):
+        """
+        Build a table from an iterable of (course_name, record) pairs.
+
+        Records are consumed one at a time and only their column values are
+        kept, so a streamed catalogue never needs to fit in memory as dicts.
+
+        Raises:
+            ValueError: if a course name occurs more than once
+        """
+        names = []
+        collected = {field: [] for field in HOT_NUMERIC_FIELDS + CATEGORY_FIELDS
+                     + COLD_TEXT_FIELDS + COLD_LIST_FIELDS}
+        list_pool = {}
+        known = set(RECORD_FIELDS)
+        unknown_by_position = {}
+
+        # (field, target list) pairs resolved once rather than per record
+        plain_fields = [(f, collected[f]) for f in HOT_NUMERIC_FIELDS + CATEGORY_FIELDS + COLD_TEXT_FIELDS
+                        if not f.startswith("salary_range_")]
+        range_fields = [(f[len("salary_range_"):], collected[f]) for f in HOT_NUMERIC_FIELDS
+                        if f.startswith("salary_range_")]
+        list_fields = [(f, collected[f]) for f in COLD_LIST_FIELDS]
+
+        for name, record in items:
+            for field, column in plain_fields:
+                column.append(record.get(field))
+            salary_range = record.get("startup_salary_range") or {}
+            for bound, column in range_fields:
+                column.append(salary_range.get(bound))
+            for field, column in list_fields:
+                values = record.get(field)
+                if values is not None:
+                    key = tuple(values)
+                    values = list_pool.get(key)
+                    if values is None:
+                        values = list_pool[key] = tuple(sys.intern(v) for v in key)
+                column.append(values)
+
+            # Anything outside the schema is kept per row so no data is lost
+            unknown = {k: v for k, v in record.items() if k not in known}
+            if unknown:
+                unknown_by_position[len(names)] = unknown
+            names.append(name)
+
+        order = sorted(range(len(names)), key=names.__getitem__)
+        names = [names[i] for i in order]
+        for previous, name in zip(names, names[1:]):
+            if previous == name:
+                raise ValueError(f"Duplicate course name: {name}")
+
+        numeric = {}
+        for field in HOT_NUMERIC_FIELDS:
+            values = [collected[field][i] for i in order]
+            typecode = _numeric_typecode(values)
+            missing = MISSING[typecode]
+            numeric[field] = array(typecode, (missing if v is None else v for v in values))
+
+        categories = {}
+        for field in CATEGORY_FIELDS + COLD_TEXT_FIELDS + COLD_LIST_FIELDS:
+            values = collected.pop(field)
+            categories[field] = CategoryColumn.build(values[i] for i in order)
+        split = [split_course_name(name) for name in names]
+        for position, field in enumerate(DERIVED_CATEGORY_FIELDS):
+            categories[field] = CategoryColumn.build(s[position] for s in split)
+
+        extras = {}
+        if unknown_by_position:
+            for row, position in enumerate(order):
+                if position in unknown_by_position:
+                    extras[row] = unknown_by_position[position]
+
+        return cls(names, numeric, categories, extras, version)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, course_name):
+        return self.row_of(course_name) is not None
+
+    def row_of(self, course_name):
+        """Row id for a course name, or None"""
+        if self._row_by_name is None:
+            return self.names.position(course_name)
+        return self._row_by_name.get(course_name)
+
+    def column(self, field):
+        """Typed array of a numeric field, indexed by row id"""
+        return self._numeric[field]
+
+    def category_column(self, field):
+        """CategoryColumn for a categorical, derived or descriptive field"""
+        return self._categories[field]
+
+    def index(self, field):
+        """CategoryIndex for a category field, built on first use"""
+        index = self._indexes.get(field)
+        if index is None:
+            index = CategoryIndex(self._categories[field])
+            self._indexes[field] = index
+        return index
+
+    def search_index(self):
+        """Ranked SearchIndex over this table, built on first use"""
+        if self._search_index is None:
+            self._search_index = SearchIndex(self)
+        return self._search_index
+
+    def value(self, row, field):
+        """Value of one field for one row (None when missing)"""
+        if field in self._numeric:
+            column = self._numeric[field]
+            value = column[row]
+            return None if _is_missing(typecode_of(column), value) else value
+        if field in self._categories:
+            return self._categories[field][row]
+        if field == "startup_salary_range":
+            low = self.value(row, "salary_range_min")
+            high = self.value(row, "salary_range_max")
+            if low is None and high is None:
+                return None
+            return {"min": low, "max": high}
+        extra = self._extras.get(row)
+        if extra is not None and field in extra:
+            return extra[field]
+        return None
+
+    def record(self, course_name):
+        """Read-only mapping of all fields for one course"""
+        row = self.row_of(course_name)
+        if row is None:
+            raise KeyError(course_name)
+        return CourseRecord(self, row)
+
+    def extras(self):
+        """{row: {field: value}} for fields outside the known schema"""
+        return self._extras
+
+    def to_records(self):
+        """Rebuild the {course_name: {field: value}} dict (lists for list fields)"""
+        records = {}
+        for name in self.names:
+            record = dict(self.record(name))
+            for field in COLD_LIST_FIELDS:
+                if record.get(field) is not None:
+                    record[field] = list(record[field])
+            records[name] = record
+        return records
+
+    def content_hash(self):
+        """
+        SHA-256 hex digest of the table contents, computed once per table.
+
+        Hashes the raw column buffers rather than rebuilding records, so two
+        tables built from the same data always hash the same. Snapshots
+        store the hash of the table they were compiled from.
+        """
+        if self._content_hash is None:
+            digest = hashlib.sha256()
+            digest.update("\0".join(self.names).encode())
+            for field in sorted(self._numeric):
+                column = self._numeric[field]
+                digest.update(f"{field}:{typecode_of(column)}".encode())
+                digest.update(column.tobytes())
+            for field in sorted(self._categories):
+                column = self._categories[field]
+                digest.update(f"{field}:{column.categories!r}".encode())
+                digest.update(column.codes.tobytes())
+            digest.update(repr(sorted(self._extras.items())).encode())
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    def memory_usage(self):
+        """Approximate bytes held on the heap (mapped file pages are not counted)"""
+        total = sys.getsizeof(self.names)
+        if self._row_by_name is not None:
+            total += sum(sys.getsizeof(n) for n in self.names)
+            total += sys.getsizeof(self._row_by_name)
+        total += sum(sys.getsizeof(column) for column in self._numeric.values())
+        total += sum(column.nbytes() for column in self._categories.values())
+        total += sum(sys.getsizeof(extra) for extra in self._extras.values())
+        return total
+
+
+class CourseRecord(Mapping):
+    """Read-only view of one course row, behaving like the old course dict"""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def _fields(self):
+        for field in RECORD_FIELDS:
+            if self._table.value(self._row, field) is not None:
+                yield field
+        yield from self._table._extras.get(self._row, ())
+
+    def __getitem__(self, field):
+        value = self._table.value(self._row, field)
+        if value is None:
+            raise KeyError(field)
+        return value
+
+    def __iter__(self):
+        return self._fields()
+
+    def __len__(self):
+        return sum(1 for _ in self._fields())
+
+    def __repr__(self):
+        return f"CourseRecord({self._table.names[self._row]!r})"
+
+
+class CourseDataView(Mapping):
+    """
+    Read-only {course_name: CourseRecord} mapping over the active table.
+
+    Every lookup goes through `get_table`, so the view keeps working after
+    a new table has been installed.
+    """
+
+    def __init__(self, get_table):
+        self._get_table = get_table
+
+    def __getitem__(self, course_name):
+        return self._get_table().record(course_name)
+
+    def __contains__(self, course_name):
+        return course_name in self._get_table()
+
+    def __iter__(self):
+        return iter(self._get_table().names)
+
+    def __len__(self):
+        return len(self._get_table())
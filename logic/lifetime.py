@@ -0,0 +1,108 @@
+# lifetime.py
+# Lifetime earnings projection - one formula for single courses and batches
+#
+# Years 1-5: salary grows linearly from starting_salary to salary_5_years
+# Year 6 on: salary_5_years compounding at a fixed annual growth rate
+# The compounding part is a geometric series, so no per-year loop is needed:
+#   sum(y5 * g**k for k in 1..n) = y5 * g * (g**n - 1) / (g - 1)
+
+import numpy as np
+
+DEFAULT_CAREER_YEARS = 30
+DEFAULT_GROWTH = 0.03          # annual growth after year 5
+RETIREMENT_AGE = 66            # Irish State Pension age
+
+
+def career_length(career_years=None, start_age=None, retirement_age=RETIREMENT_AGE):
+    """
+    Number of working years to project.
+
+    With only start_age, the career runs to retirement_age. With both,
+    the shorter of the two wins. With neither, DEFAULT_CAREER_YEARS.
+    """
+    if start_age is not None:
+        to_retirement = max(0, int(retirement_age - start_age))
+        if career_years is None:
+            return to_retirement
+        return min(int(career_years), to_retirement)
+    if career_years is None:
+        return DEFAULT_CAREER_YEARS
+    return max(0, int(career_years))
+
+
+def growth_factor(growth, years):
+    """
+    sum(g**k for k in 1..years) with g = 1 + growth, in closed form.
+
+    growth may also be an array (one rate per simulated career).
+    """
+    if years <= 0:
+        return 0.0
+    g = 1 + growth
+    if isinstance(g, np.ndarray):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factor = g * (g ** years - 1) / (g - 1)
+        return np.where(g == 1, float(years), factor)
+    if g == 1:
+        return float(years)
+    return g * (g ** years - 1) / (g - 1)
+
+
+def early_career_earnings(starting_salary, salary_5_years, years):
+    """Earnings over the first min(years, 5) years of linear growth"""
+    if years >= 5:
+        return (starting_salary + salary_5_years) / 2 * 5
+    # Salary in year i (0-based) is starting + (y5 - starting) * i / 4
+    return years * starting_salary + (salary_5_years - starting_salary) / 4 * years * (years - 1) / 2
+
+
+def _summary(lifetime_earnings, total_cost):
+    lifetime_profit = lifetime_earnings - total_cost
+    return {
+        "total_earnings": lifetime_earnings,
+        "profit": lifetime_profit,
+        "roi": (lifetime_profit / total_cost) * 100,
+        "times_earned_back": lifetime_earnings / total_cost
+    }
+
+
+def project_lifetime(starting_salary, salary_5_years, total_cost,
+                     career_years=None, growth=DEFAULT_GROWTH, start_age=None,
+                     retirement_age=RETIREMENT_AGE):
+    """
+    Lifetime earnings, profit and ROI for one course (unrounded).
+
+    Returns:
+        dict with total_earnings, profit, roi, times_earned_back and
+        the career_years actually used
+    """
+    years = career_length(career_years, start_age, retirement_age)
+    earnings = early_career_earnings(starting_salary, salary_5_years, years)
+    earnings += salary_5_years * growth_factor(growth, years - 5)
+
+    projection = _summary(earnings, total_cost)
+    projection["career_years"] = years
+    return projection
+
+
+def project_lifetime_batch(starting_salary, salary_5_years, total_cost,
+                           career_years=None, growth=DEFAULT_GROWTH, start_age=None,
+                           retirement_age=RETIREMENT_AGE):
+    """
+    Vectorized project_lifetime over arrays of courses.
+
+    The career parameters are shared by every course, so the growth factor
+    is one scalar and each course costs a couple of array operations.
+    An array of growth rates (Monte Carlo draws) is applied elementwise.
+    """
+    years = career_length(career_years, start_age, retirement_age)
+    starting_salary = np.asarray(starting_salary)
+    salary_5_years = np.asarray(salary_5_years)
+    total_cost = np.asarray(total_cost)
+
+    earnings = early_career_earnings(starting_salary, salary_5_years, years)
+    earnings = earnings + salary_5_years * growth_factor(growth, years - 5)
+
+    projection = _summary(earnings, total_cost)
+    projection["career_years"] = years
+    return projection
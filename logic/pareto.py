@@ -0,0 +1,196 @@
+# pareto.py
+# Pareto frontier (skyline) of courses over a chosen set of metrics
+#
+# A course is on the frontier when no other course is at least as good on
+# every chosen metric and different on one - nothing beats it outright.
+# Metrics are first turned into "lower is better" values and courses with
+# identical values are merged into one point. Points are then sorted by the
+# sum of their per-metric ranks, which puts every point after all the
+# points dominating it, and kept or dropped a block at a time against the
+# frontier found so far (sort-filter-skyline). Two metrics need only one
+# sorted sweep.
+
+import numpy as np
+
+from course_data import cached_per_data_version
+from rankings import get_rankings, RANK_METRICS
+from tax import resolve_tax_year
+
+DEFAULT_PARETO_METRICS = ("total_cost", "roi_5_years", "payback_years", "employment_rate")
+MAX_PARETO_METRICS = 6
+
+# Points checked together against the frontier
+BLOCK_SIZE = 1024
+# Largest (frontier x block x metric) comparison done in one step
+MAX_COMPARISONS = 4_000_000
+# Comparisons spent after each block pruning the points still to come
+PRUNE_COMPARISONS = 32_000_000
+# Points used to thin out the input before sorting
+PIVOTS = 8
+# Inputs this small are compared pairwise directly
+SMALL_INPUT = 64
+
+
+def _dominated(frontier, block):
+    """Which points of `block` some distinct point of `frontier` is <= on every metric"""
+    dominated = np.zeros(len(block), dtype=bool)
+    step = max(1, MAX_COMPARISONS // max(1, block.size))
+    for start in range(0, len(frontier), step):
+        part = frontier[start:start + step]
+        dominated |= (part[:, None, :] <= block[None, :, :]).all(axis=2).any(axis=0)
+    return dominated
+
+
+def _distinct(points):
+    """(distinct rows in lexicographic order, index of each original row's distinct row)"""
+    # Chained stable argsorts: much faster than np.lexsort on float keys
+    order = np.argsort(points[:, -1], kind="stable")
+    for column in range(points.shape[1] - 2, -1, -1):
+        order = order[np.argsort(points[order, column], kind="stable")]
+    ordered = points[order]
+    first = np.ones(len(points), dtype=bool)
+    first[1:] = (ordered[1:] != ordered[:-1]).any(axis=1)
+    inverse = np.empty(len(points), dtype=np.int64)
+    inverse[order] = np.cumsum(first) - 1
+    return ordered[first], inverse
+
+
+def _pivot_survivors(points):
+    """
+    Indices of the points not dominated by a few strong pivots.
+
+    Each pivot is the remaining point with the largest box of dominated
+    space (after scaling every metric to 0-1), so a handful of linear passes
+    usually leaves a small fraction of the points for the full algorithm.
+    """
+    low = points.min(axis=0)
+    spread = points.max(axis=0) - low
+    spread[spread == 0] = 1
+    scaled = np.minimum((points - low) / spread, 1 - 1e-9)
+    volume = np.log1p(-scaled).sum(axis=1)
+
+    survivors = np.arange(len(points))
+    for _ in range(PIVOTS):
+        pivot = points[survivors[np.argmax(volume[survivors])]]
+        candidates = points[survivors]
+        beaten = (pivot <= candidates).all(axis=1) & (pivot < candidates).any(axis=1)
+        if not beaten.any():
+            break
+        survivors = survivors[~beaten]
+    return survivors
+
+
+def skyline(points):
+    """
+    Indices of the non-dominated rows of an (n, metrics) array, lower being better.
+
+    Identical rows are all kept (none of them beats the others).
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if not len(points):
+        return np.empty(0, dtype=np.int64)
+    if len(points) <= SMALL_INPUT:
+        pairs_le = (points[:, None, :] <= points[None, :, :]).all(axis=2)
+        pairs_lt = (points[:, None, :] < points[None, :, :]).any(axis=2)
+        return np.flatnonzero(~(pairs_le & pairs_lt).any(axis=0))
+    candidates = _pivot_survivors(points)
+    unique, inverse = _distinct(points[candidates])
+    metrics = unique.shape[1]
+
+    if metrics == 1:
+        keep = np.zeros(len(unique), dtype=bool)
+        keep[0] = True
+    elif metrics == 2:
+        # Distinct points are sorted by the first metric, then the second: a
+        # point is on the frontier if it beats the best second metric so far
+        second = unique[:, 1]
+        best_before = np.concatenate(([np.inf], np.minimum.accumulate(second)[:-1]))
+        keep = second < best_before
+    else:
+        # Rank on each metric, ties broken by the lexicographic order of the
+        # distinct points. A point dominating another is lexicographically
+        # smaller, so it ranks no worse on any metric and better on one.
+        ranks = np.zeros(len(unique), dtype=np.int64)
+        positions = np.arange(len(unique))
+        for column in unique.T:
+            ranks[np.argsort(column, kind="stable")] += positions
+        by_rank = np.argsort(ranks, kind="stable")
+        ordered = unique[by_rank]
+
+        keep_ordered = np.zeros(len(unique), dtype=bool)
+        frontier = ordered[:0]
+        pending = np.arange(len(ordered))
+        while len(pending):
+            block_ids = pending[:BLOCK_SIZE]
+            block = ordered[block_ids]
+            alive = ~_dominated(frontier, block)
+            block_ids, block = block_ids[alive], block[alive]
+            # Within the block only earlier points can dominate later ones;
+            # points are distinct, so <= everywhere means dominated
+            beaten = (block[:, None, :] <= block[None, :, :]).all(axis=2)
+            np.fill_diagonal(beaten, False)
+            survivors = ~beaten.any(axis=0)
+            keep_ordered[block_ids[survivors]] = True
+            found = block[survivors]
+            frontier = np.concatenate((frontier, found))
+
+            # The first new frontier points (lowest rank sums) dominate the
+            # most, so they alone weed out much of what is left
+            pending = pending[BLOCK_SIZE:]
+            if len(pending) and len(found):
+                pruners = found[:max(1, PRUNE_COMPARISONS // (len(pending) * metrics))]
+                pending = pending[~_dominated(pruners, ordered[pending])]
+
+        keep = np.zeros(len(unique), dtype=bool)
+        keep[by_rank] = keep_ordered
+
+    return candidates[keep[inverse]]
+
+
+def parse_metrics(text):
+    """
+    Metric names from "a,b,c" (DEFAULT_PARETO_METRICS when empty).
+
+    Raises:
+        ValueError: for unknown or repeated metrics, or too few or too many
+    """
+    if not text:
+        return DEFAULT_PARETO_METRICS
+    metrics = tuple(m.strip() for m in text.split(",") if m.strip())
+    unknown = [m for m in metrics if m not in RANK_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metric '{unknown[0]}'. Available metrics: {', '.join(RANK_METRICS)}")
+    if len(set(metrics)) != len(metrics) or not 2 <= len(metrics) <= MAX_PARETO_METRICS:
+        raise ValueError(f"Choose between 2 and {MAX_PARETO_METRICS} different metrics")
+    return metrics
+
+
+# Keyed on the sorted metric names: the frontier does not depend on their
+# order. At most a few thousand metric sets exist, each holding only the
+# frontier's row ids.
+@cached_per_data_version
+def _frontier(metrics, tax_year):
+    rankings = get_rankings(tax_year)
+    columns = []
+    for metric in metrics:
+        values = np.asarray(rankings.values(metric), dtype=np.float64)
+        columns.append(-values if RANK_METRICS[metric] == "desc" else values)
+    points = np.column_stack(columns)
+    # Courses missing one of the metrics cannot be compared on all of them
+    complete = np.flatnonzero(~np.isnan(points).any(axis=1))
+    return complete[skyline(points[complete])], len(complete)
+
+
+def pareto_rows(metrics, tax_year=None):
+    """
+    Courses on the Pareto frontier of `metrics`.
+
+    Returns:
+        (row ids ordered best first by the first metric, number of courses
+        that have every metric)
+    """
+    tax_year = resolve_tax_year(tax_year)
+    rows, considered = _frontier(tuple(sorted(metrics)), tax_year)
+    metric = metrics[0]
+    position = get_rankings(tax_year).position(metric, RANK_METRICS[metric] == "desc")
+    return rows[np.argsort(position[rows], kind="stable")], considered
@@ -0,0 +1,113 @@
+# process_memory.py
+# Per-process memory figures from /proc (Linux)
+#
+# RSS counts every resident page a process maps, so forked workers that
+# share the master's pages each look as big as the master. PSS divides
+# shared pages between the processes mapping them, so the PSS of the master
+# plus its workers is what the server really costs.
+#
+# Usage (from the repo root):
+#   python logic/process_memory.py <gunicorn master pid>
+
+import os
+import sys
+import argparse
+
+# smaps_rollup fields reported, renamed to snake_case
+SMAPS_FIELDS = {
+    "Rss": "rss_kb",
+    "Pss": "pss_kb",
+    "Shared_Clean": "shared_clean_kb",
+    "Shared_Dirty": "shared_dirty_kb",
+    "Private_Clean": "private_clean_kb",
+    "Private_Dirty": "private_dirty_kb"
+}
+
+
+def process_memory(pid=None):
+    """
+    Memory breakdown of one process in KiB.
+
+    Reads /proc/<pid>/smaps_rollup, falling back to the RSS in
+    /proc/<pid>/status on older kernels. Returns None where /proc is not
+    available (e.g. macOS) or the process has gone.
+    """
+    proc = f"/proc/{pid or 'self'}"
+    try:
+        with open(f"{proc}/smaps_rollup") as f:
+            lines = f.readlines()
+    except OSError:
+        try:
+            with open(f"{proc}/status") as f:
+                lines = [line for line in f if line.startswith("VmRSS:")]
+        except OSError:
+            return None
+        lines = [line.replace("VmRSS:", "Rss:") for line in lines]
+
+    usage = {"pid": pid or os.getpid()}
+    for line in lines:
+        key, _, value = line.partition(":")
+        if key in SMAPS_FIELDS:
+            usage[SMAPS_FIELDS[key]] = int(value.split()[0])
+    if "shared_clean_kb" in usage:
+        usage["shared_kb"] = usage["shared_clean_kb"] + usage["shared_dirty_kb"]
+        usage["private_kb"] = usage["private_clean_kb"] + usage["private_dirty_kb"]
+    return usage
+
+
+def child_pids(pid):
+    """Direct children of a process, found by scanning /proc"""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name is in parentheses and may contain spaces
+        parent = int(stat.rsplit(")", 1)[1].split()[1])
+        if parent == pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def server_memory(master_pid):
+    """
+    Memory of a pre-fork server: the master, each worker and the totals.
+
+    Returns:
+        dict with "master", "workers" (list) and "total" (summed KiB per field)
+    """
+    master = process_memory(master_pid)
+    workers = [usage for usage in map(process_memory, child_pids(master_pid)) if usage]
+    total = {}
+    for usage in [master] + workers:
+        for key, value in (usage or {}).items():
+            if key != "pid":
+                total[key] = total.get(key, 0) + value
+    return {"master": master, "workers": workers, "total": total}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report memory of a pre-fork server and its workers")
+    parser.add_argument("pid", type=int, help="PID of the gunicorn master")
+    args = parser.parse_args(argv)
+
+    report = server_memory(args.pid)
+    if report["master"] is None:
+        print(f"❌ No /proc memory information for PID {args.pid}")
+        return 1
+
+    print(f"{'process':<16}{'RSS MB':>10}{'PSS MB':>10}{'private MB':>12}")
+    rows = [("master", report["master"])] + [(f"worker {w['pid']}", w) for w in report["workers"]]
+    rows.append(("total", report["total"]))
+    for label, usage in rows:
+        print(f"{label:<16}{usage['rss_kb'] / 1024:>10.1f}{usage.get('pss_kb', 0) / 1024:>10.1f}"
+              f"{usage.get('private_kb', 0) / 1024:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+# quiz_matcher.py
+# Course matching for the "Find Your Perfect Course" quiz
+#
+# The quiz scores every course against eight answers. Each question only
+# looks at one small feature of a course (which field keywords its name
+# has, which region its university is in, its tuition relative to the
+# budget steps, ...), so courses are grouped by their features once per
+# data version and a score is a sum of table lookups per group. Top
+# matches come from the first few courses (by name) of each group.
+#
+# The answers have a finite combination space (the sliders move in fixed
+# steps), so top matches are kept in a lookup table indexed by the answer
+# vector: filled up front for small catalogues, and per combination on
+# first use otherwise.
+
+import math
+
+import numpy as np
+
+from course_data import cached_per_data_version
+from catalogue_stats import get_catalogue_stats
+from tax import resolve_tax_year
+
+# Questions in the order the quiz asks them, with the answers they accept
+QUIZ_QUESTIONS = {
+    "goal": ("high-salary", "job-security", "passion", "balance"),
+    "field": ("technology", "healthcare", "business", "engineering", "other"),
+    "budget": tuple(range(5000, 35001, 1000)),
+    "length": (4, 5, 6),
+    "location": ("dublin", "cork-galway", "other", "no-preference"),
+    "work_style": ("remote", "hands-on", "hybrid"),
+    "demand": tuple(range(1, 11)),
+    "international": ("yes", "maybe", "no")
+}
+
+# Slider positions before the user moves them
+SLIDER_DEFAULTS = {"budget": 10000, "demand": 7}
+
+# Demand importance from which a "Very High" demand field earns a point
+HIGH_DEMAND = 7
+
+# Words in a course name that put it in each field of interest
+FIELD_KEYWORDS = {
+    "technology": ("computer", "data", "software", "cyber", "artificial intelligence", "ai"),
+    "healthcare": ("medicine", "nursing", "therapy", "pharma", "physiotherapy", "occupational",
+                   "speech", "radiography", "dentistry"),
+    "business": ("business", "commerce", "account", "finance", "actuarial"),
+    "engineering": ("engineering",),
+    "other": ("law", "education", "psychology", "communication", "social work", "architecture",
+              "veterinary")
+}
+
+# Words in a university's name that place it in each location
+LOCATION_KEYWORDS = {
+    "dublin": ("Dublin", "UCD", "Trinity", "DCU", "TU Dublin", "RCSI"),
+    "cork-galway": ("Cork", "Galway"),
+    "other": ("Limerick", "Maynooth")
+}
+
+DEFAULT_MATCHES = 5
+MAX_MATCHES = 20
+
+# Largest (answer combinations x candidate courses) scored to fill the
+# whole lookup table ahead of time, and the cells scored per step
+PRECOMPUTE_CELLS = 64_000_000
+PRECOMPUTE_STEP = 4_000_000
+
+# Highest possible raw score
+_MAX_SCORE = 111
+
+
+def _keyword_mask(text, keywords, lower=True):
+    """Bit i set when `text` contains any keyword of the i-th group"""
+    text = text.lower() if lower else text
+    return sum(1 << i for i, words in enumerate(keywords) if any(w in text for w in words))
+
+
+def _category_mask(column, keywords, lower=True):
+    """_keyword_mask of every row of a category column, worked out once per category"""
+    masks = np.array([_keyword_mask(str(value), keywords, lower) if value is not None else 0
+                      for value in column.categories], dtype=np.int64)
+    return masks[np.asarray(column.codes, dtype=np.int64)]
+
+
+def _category_equals(column, value):
+    """Rows of a category column equal to `value`"""
+    codes = [code for code, category in enumerate(column.categories) if category == value]
+    return np.isin(np.asarray(column.codes), codes)
+
+
+def _has_bits(values, bits):
+    return (values & bits) != 0
+
+
+def _question_points(question, values):
+    """
+    Points every answer to a question gives each feature value.
+
+    Returns:
+        int array of shape (number of answers, number of feature values)
+    """
+    answers = QUIZ_QUESTIONS[question]
+    values = np.asarray(values)
+    if question == "field":
+        # The field of interest decides most of the score; a course from
+        # another field is all but ruled out
+        return np.array([np.where(_has_bits(values, 1 << i), 50, -200) for i in range(len(answers))])
+    if question == "location":
+        return np.array([np.where(_has_bits(values, 1 << i), 50, -100) for i in range(3)] +
+                        [np.full(len(values), 25)])
+    if question == "goal":
+        # Bits: ROI over 350%, job security, work-life balance, satisfaction
+        high_roi, secure, balanced, satisfied = (_has_bits(values, 1 << i) for i in range(4))
+        return np.array([np.where(high_roi, 3, 0), np.where(secure, 3, 0),
+                         np.where(satisfied, 3, 1), np.where(balanced, 3, 0)])
+    if question == "budget":
+        # Values are tuition positions among _budget_thresholds()
+        thresholds = _budget_thresholds()
+        points = []
+        for budget in answers:
+            within = values <= np.searchsorted(thresholds, budget)
+            nearly = values <= np.searchsorted(thresholds, budget * 1.2)
+            points.append(np.where(within, 2, np.where(nearly, 1, 0)))
+        return np.array(points)
+    if question == "length":
+        return np.array([np.where(values <= length, 2, np.where(values == length + 1, 1, 0))
+                         for length in answers])
+    if question == "work_style":
+        # Values: 1 = high remote work availability, 2 = low, 0 = other
+        return np.array([np.where(values == 1, 2, 0), np.where(values == 2, 2, 0),
+                         np.ones(len(values), dtype=np.int64)])
+    if question == "demand":
+        # Answers collapse to below / at least HIGH_DEMAND
+        return np.array([np.zeros(len(values), dtype=np.int64), np.where(values == 1, 1, 0)])
+    # international
+    return np.array([np.where(values == 1, 1, 0), np.zeros(len(values), dtype=np.int64),
+                     np.zeros(len(values), dtype=np.int64)])
+
+
+def _budget_thresholds():
+    """Every tuition limit a budget answer tests against, ascending"""
+    budgets = QUIZ_QUESTIONS["budget"]
+    return np.unique(np.array(list(budgets) + [b * 1.2 for b in budgets], dtype=np.float64))
+
+
+def _answer_shape():
+    """Number of distinct answers per question, as the lookup table indexes them"""
+    return tuple(2 if q == "demand" else len(a) for q, a in QUIZ_QUESTIONS.items())
+
+
+def _answer_index(question, value):
+    if question == "demand":
+        return int(value >= HIGH_DEMAND)
+    return QUIZ_QUESTIONS[question].index(value)
+
+
+def parse_answers(args):
+    """
+    Quiz answers from a mapping of question name to answer.
+
+    The budget is rounded to the slider's steps and both sliders default to
+    their starting positions.
+
+    Raises:
+        ValueError: for a missing or unknown answer
+    """
+    answers = {}
+    for question, options in QUIZ_QUESTIONS.items():
+        value = args.get(question)
+        if value is None or value == "":
+            if question not in SLIDER_DEFAULTS:
+                raise ValueError(f"Missing answer for '{question}'. Options: {', '.join(map(str, options))}")
+            value = SLIDER_DEFAULTS[question]
+
+        if question in ("budget", "demand", "length"):
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                value = math.nan
+            if not math.isfinite(value):
+                raise ValueError(f"'{question}' must be a number")
+            if question == "budget":
+                step = options[1] - options[0]
+                value = min(max(int(round(value / step)) * step, options[0]), options[-1])
+            elif value != int(value) or int(value) not in options:
+                raise ValueError(f"'{question}' must be one of {', '.join(map(str, options))}")
+            value = int(value)
+        else:
+            value = str(value).strip().lower()
+            if value not in options:
+                raise ValueError(f"Unknown answer '{value}' for '{question}'. "
+                                 f"Options: {', '.join(options)}")
+        answers[question] = value
+    return answers
+
+
+class QuizIndex:
+    """
+    Quiz features of every course in one CatalogueStats, grouped.
+
+    Courses with the same answer to every feature always score the same,
+    so scores are worked out per group; only the first MAX_MATCHES courses
+    (by name) of each group can ever be a top match.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.version = stats.version
+        self.tax_year = stats.tax_year
+        columns = stats.columns
+        table = columns.table
+        size = len(columns)
+
+        def record_at_least(field, threshold):
+            with np.errstate(invalid="ignore"):
+                return columns.numeric(field) >= threshold      # missing values never match
+
+        # The quiz looks for field keywords anywhere in the course name, so the
+        # programme (every part before the university code, e.g. "Field -
+        # with Business 12") and the university code are searched separately
+        field_groups = tuple(FIELD_KEYWORDS.values())
+        features = {
+            "field": (_category_mask(table.category_column("programme"), field_groups) |
+                      _category_mask(table.category_column("university_code"), field_groups)),
+            "location": _category_mask(table.category_column("university"),
+                                       tuple(LOCATION_KEYWORDS.values()), lower=False),
+            "goal": ((stats.values["roi_5_years"] > 350) |
+                     record_at_least("job_security", 4.5) << 1 |
+                     record_at_least("work_life_balance", 3.7) << 2 |
+                     record_at_least("graduate_satisfaction", 4.2) << 3).astype(np.int64),
+            "budget": np.searchsorted(_budget_thresholds(), columns.typical_tuition, side="left"),
+            "length": np.clip(columns.course_length, 0, max(QUIZ_QUESTIONS["length"]) + 2),
+            "work_style": np.where(_category_equals(table.category_column("remote_work_availability"), "High"), 1,
+                                   np.where(_category_equals(table.category_column("remote_work_availability"),
+                                                             "Low"), 2, 0)),
+            "demand": _category_equals(table.category_column("skills_demand"), "Very High").astype(np.int64),
+            "international": _category_equals(table.category_column("international_opportunities"),
+                                              "Excellent").astype(np.int64)
+        }
+
+        # Number the distinct values of each feature, then the distinct
+        # combinations of all of them (the groups)
+        signature = np.zeros(size, dtype=np.int64)
+        self._codes = {}
+        self._points = {}
+        for question, values in features.items():
+            distinct, codes = np.unique(values, return_inverse=True)
+            self._codes[question] = codes
+            self._points[question] = _question_points(question, distinct)
+            signature = signature * len(distinct) + codes
+        _, first_rows, groups = np.unique(signature, return_index=True, return_inverse=True)
+        self.group_count = len(first_rows)
+        self._groups = groups
+        self._group_codes = {q: codes[first_rows] for q, codes in self._codes.items()}
+
+        # The first MAX_MATCHES rows of every group, in row (name) order
+        order = np.argsort(groups, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(np.bincount(groups, minlength=self.group_count))))
+        rank_in_group = np.arange(size) - starts[groups[order]]
+        self._candidates = order[rank_in_group < MAX_MATCHES]
+        self._candidate_groups = groups[self._candidates]
+        self._size = max(size, 1)
+
+        self._shape = _answer_shape()
+        self._table = np.full((int(np.prod(self._shape)), DEFAULT_MATCHES), -1, dtype=np.int32)
+        self._filled = np.zeros(len(self._table), dtype=bool)
+
+    def _group_scores(self, indices):
+        """Raw score of every group for answer indices (one per question)"""
+        scores = np.zeros(self.group_count, dtype=np.int64)
+        for question, index in zip(QUIZ_QUESTIONS, indices):
+            scores += self._points[question][index][self._group_codes[question]]
+        return scores
+
+    def _best(self, keys, limit):
+        """Positions of the `limit` smallest keys along the last axis, in order"""
+        if keys.shape[-1] > limit:
+            keys_part = np.argpartition(keys, limit - 1, axis=-1)[..., :limit]
+        else:
+            keys_part = np.broadcast_to(np.arange(keys.shape[-1]), keys.shape)
+        ordered = np.take_along_axis(keys, keys_part, axis=-1).argsort(axis=-1, kind="stable")
+        return np.take_along_axis(keys_part, ordered, axis=-1)
+
+    def _top(self, indices, limit):
+        # Highest score first, then course-name (row) order
+        scores = self._group_scores(indices)[self._candidate_groups]
+        keys = (_MAX_SCORE - scores) * self._size + self._candidates
+        return self._candidates[self._best(keys, limit)].astype(np.int32)
+
+    def warm(self):
+        """Fill the whole lookup table if the catalogue is small enough"""
+        combinations = len(self._table)
+        if combinations * len(self._candidates) > PRECOMPUTE_CELLS or not len(self._candidates):
+            return False
+        limit = min(DEFAULT_MATCHES, len(self._candidates))
+        step = max(1, PRECOMPUTE_STEP // len(self._candidates))
+        for start in range(0, combinations, step):
+            ids = np.arange(start, min(start + step, combinations))
+            indices = np.unravel_index(ids, self._shape)
+            scores = np.zeros((len(ids), self.group_count), dtype=np.int64)
+            for question, index in zip(QUIZ_QUESTIONS, indices):
+                scores += self._points[question][index[:, None], self._group_codes[question][None, :]]
+            keys = (_MAX_SCORE - scores[:, self._candidate_groups]) * self._size + self._candidates
+            self._table[ids, :limit] = self._candidates[self._best(keys, limit)]
+        self._filled[:] = True
+        return True
+
+    def match(self, answers, limit=DEFAULT_MATCHES):
+        """
+        Best matching courses for parsed answers.
+
+        Returns:
+            (row ids best first, raw score of each)
+        """
+        indices = tuple(_answer_index(q, answers[q]) for q in QUIZ_QUESTIONS)
+        if limit <= DEFAULT_MATCHES:
+            key = np.ravel_multi_index(indices, self._shape)
+            if not self._filled[key]:
+                top = self._top(indices, DEFAULT_MATCHES)
+                self._table[key, :len(top)] = top
+                self._filled[key] = True
+            rows = self._table[key]
+            rows = rows[rows >= 0][:limit]
+        else:
+            rows = self._top(indices, limit)
+        return rows, self._group_scores(indices)[self._groups[rows]]
+
+    def breakdown(self, row, answers):
+        """Points each answer gave one course"""
+        return {
+            question: int(self._points[question][_answer_index(question, answers[question]),
+                                                 self._codes[question][row]])
+            for question in QUIZ_QUESTIONS
+        }
+
+    def reasons(self, row, answers):
+        """Short explanations of why a course matched, in question order"""
+        points = self.breakdown(row, answers)
+        reasons = []
+        if points["field"] > 0:
+            reasons.append({"technology": "Matches tech interest", "healthcare": "Matches healthcare interest",
+                            "business": "Matches business interest",
+                            "engineering": "Matches engineering interest"}.get(
+                                answers["field"], "Matches your field interest"))
+        if points["location"] == 50:
+            reasons.append("Dublin location" if answers["location"] == "dublin" else "Preferred location")
+        if points["goal"] == 3:
+            reasons.append({"high-salary": "Excellent ROI", "job-security": "High job security",
+                            "balance": "Good work-life balance",
+                            "passion": "High student satisfaction"}[answers["goal"]])
+        if points["budget"] == 2:
+            reasons.append("Within budget")
+        if points["length"] == 2:
+            reasons.append("Right duration")
+        if points["work_style"] == 2:
+            reasons.append("Remote work options" if answers["work_style"] == "remote" else "Hands-on career")
+        if points["demand"]:
+            reasons.append("High demand field")
+        if points["international"]:
+            reasons.append("International opportunities")
+        return reasons or ["General match"]
+
+
+@cached_per_data_version
+def _build_quiz_index(tax_year):
+    return QuizIndex(get_catalogue_stats(tax_year))
+
+
+def get_quiz_index(tax_year=None):
+    """Return the QuizIndex for the current data version and tax year"""
+    return _build_quiz_index(resolve_tax_year(tax_year))
+
+
+def quiz_matches(answers, limit=DEFAULT_MATCHES, tax_year=None):
+    """
+    Top quiz matches as calculate_roi-style results.
+
+    Each result also has "match_score" (0-100), "raw_score", "breakdown"
+    (points per question), "reasons" and the course's "employment_rate".
+    """
+    index = get_quiz_index(tax_year)
+    rows, scores = index.match(answers, limit)
+    results = index.stats.results_for(rows)
+    employment = index.stats.columns.numeric("employment_rate")
+    for row, score, result in zip(rows.tolist(), scores.tolist(), results):
+        rate = employment[row].item()
+        result["employment_rate"] = None if math.isnan(rate) else rate
+        result["match_score"] = max(0, min(100, score))
+        result["raw_score"] = score
+        result["breakdown"] = index.breakdown(row, answers)
+        result["reasons"] = index.reasons(row, answers)
+    return results
@@ -0,0 +1,246 @@
+# rankings.py
+# Presorted course rankings for every ROI metric
+#
+# Each metric's row ids are sorted once per data version and tax year (on
+# first use), so a top-k list or any page of a ranking is an array slice
+# rather than a recalculation and sort of the whole catalogue. Rankings
+# within a university, a field or both reuse the same order, stably
+# regrouped by category with the offset of each group, so a page of those
+# is a slice too.
+
+import base64
+import binascii
+
+import numpy as np
+
+from course_data import cached_per_data_version
+from catalogue_stats import get_catalogue_stats
+from batch_calculator import ranked_rows
+from tax import resolve_tax_year
+
+# Rankable metrics (calculate_roi keys) and the order that puts the best first
+RANK_METRICS = {
+    "roi_5_years": "desc",
+    "lifetime_roi": "desc",
+    "payback_years": "asc",
+    "total_cost": "asc",
+    "tuition_per_year": "asc",
+    "course_length": "asc",
+    "starting_salary": "desc",
+    "salary_after_5_years": "desc",
+    "annual_net_income": "desc",
+    # Course record fields (courses without a value rank last)
+    "employment_rate": "desc",
+    "graduate_satisfaction": "desc",
+    "job_security": "desc",
+    "work_life_balance": "desc",
+    "further_study_rate": "desc",
+    "growth_rate": "desc",
+    "avg_class_size": "asc"
+}
+
+# Filters and the category column each one groups on
+GROUP_FIELDS = {
+    "university": "university_code",
+    "field": "field"
+}
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+
+
+class Rankings:
+    """
+    Row orders for every metric in RANK_METRICS, over one CatalogueStats.
+
+    Ties keep course-name order, as in ranked_rows, so results match the
+    sorts they replace.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.version = stats.version
+        self.tax_year = stats.tax_year
+        self._orders = {}
+        self._positions = {}
+        self._sorted = {}
+        self._groups = {}
+
+        # Group codes per filter, and the (lower-cased) values naming each group
+        table = stats.columns.table
+        self._codes = {}
+        self._aliases = {}
+        for name, field in GROUP_FIELDS.items():
+            column = table.category_column(field)
+            self._codes[name] = (np.asarray(column.codes, dtype=np.int64), len(column.categories))
+            aliases = {}
+            for code, value in enumerate(column.categories):
+                if value is not None:
+                    aliases.setdefault(str(value).lower(), set()).add(code)
+            self._aliases[name] = aliases
+
+        # A university can also be named in full
+        codes, count = self._codes["university"]
+        names = table.category_column("university")
+        pairs = np.unique(np.asarray(names.codes, dtype=np.int64) * count + codes)
+        for name_code, code in zip((pairs // count).tolist(), (pairs % count).tolist()):
+            if names.categories[name_code] is not None:
+                self._aliases["university"].setdefault(names.categories[name_code].lower(), set()).add(code)
+
+    def values(self, metric):
+        """Per-row values of a metric (NaN where a course has none)"""
+        values = self.stats.values.get(metric)
+        if values is None:
+            values = self.stats.columns.numeric(metric)
+        return values
+
+    def order(self, metric, descending):
+        """Every row id, best to worst (or reversed) by one metric"""
+        key = (metric, descending)
+        order = self._orders.get(key)
+        if order is None:
+            order = ranked_rows(self.values(metric), descending=descending).astype(np.int32)
+            self._orders[key] = order
+        return order
+
+    def sorted_values(self, metric):
+        """A metric's values in ascending order (NaN last), matching order(metric, False)"""
+        values = self._sorted.get(metric)
+        if values is None:
+            values = self._sorted[metric] = self.values(metric)[self.order(metric, False)]
+        return values
+
+    def position(self, metric, descending):
+        """Rank position of every row (the inverse of order())"""
+        key = (metric, descending)
+        position = self._positions.get(key)
+        if position is None:
+            order = self.order(metric, descending)
+            position = np.empty(len(order), dtype=np.int32)
+            position[order] = np.arange(len(order), dtype=np.int32)
+            self._positions[key] = position
+        return position
+
+    def _grouped(self, metric, descending, filters):
+        """
+        order() regrouped by the filters' categories, plus where each group starts.
+
+        Groups are numbered by combining the category codes of the filters
+        in the order of GROUP_FIELDS.
+        """
+        key = (metric, descending, filters)
+        grouped = self._groups.get(key)
+        if grouped is None:
+            codes, count = self.group_codes(filters)
+            order = self.order(metric, descending)
+            rows = order[np.argsort(codes[order], kind="stable")]
+            starts = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=count))))
+            grouped = self._groups[key] = (rows, starts)
+        return grouped
+
+    def group_codes(self, filters):
+        """(group number of every row, number of groups) for a tuple of filter names"""
+        codes, count = np.zeros(self.stats.course_count, dtype=np.int64), 1
+        for name in filters:
+            field_codes, field_count = self._codes[name]
+            codes, count = codes * field_count + field_codes, count * field_count
+        return codes, count
+
+    def groups_matching(self, filters):
+        """
+        Group numbers for {filter name: value}, matched ignoring case.
+
+        Raises:
+            LookupError: if a value names no university or field
+        """
+        groups = [0]
+        for name in GROUP_FIELDS:
+            if name not in filters:
+                continue
+            codes = self._aliases[name].get(filters[name].strip().lower())
+            if not codes:
+                raise LookupError(f"No courses found for {name} '{filters[name]}'")
+            count = self._codes[name][1]
+            groups = [group * count + code for group in groups for code in sorted(codes)]
+        return groups
+
+    def page(self, metric, descending=None, offset=0, limit=DEFAULT_LIMIT, filters=None):
+        """
+        One slice of a ranking.
+
+        Args:
+            metric: a key of RANK_METRICS
+            descending: True for highest first (default: best first for the metric)
+            offset: number of ranked courses to skip
+            limit: maximum number of rows to return
+            filters: {"university": ..., "field": ...} to rank within
+
+        Returns:
+            (row ids, total courses in the ranking)
+        """
+        if descending is None:
+            descending = RANK_METRICS[metric] == "desc"
+        if not filters:
+            order = self.order(metric, descending)
+            return order[offset:offset + limit], len(order)
+
+        names = tuple(name for name in GROUP_FIELDS if name in filters)
+        rows, starts = self._grouped(metric, descending, names)
+        groups = self.groups_matching(filters)
+        total = int(sum(starts[g + 1] - starts[g] for g in groups))
+        if len(groups) == 1:
+            start = starts[groups[0]]
+            return rows[start + offset:min(start + offset + limit, starts[groups[0] + 1])], total
+
+        # Several groups (e.g. a value shared by two spellings): merge the
+        # first offset + limit rows of each back into rank order
+        parts = [rows[starts[g]:min(starts[g] + offset + limit, starts[g + 1])] for g in groups]
+        merged = np.concatenate(parts)
+        merged = merged[np.argsort(self.position(metric, descending)[merged], kind="stable")]
+        return merged[offset:offset + limit], total
+
+    def results(self, rows):
+        """calculate_roi-style results for the given rows, in order"""
+        return self.stats.results_for(rows)
+
+    def warm(self):
+        """Build the default-direction order of every metric"""
+        for metric, direction in RANK_METRICS.items():
+            self.order(metric, direction == "desc")
+
+
+@cached_per_data_version
+def _build_rankings(tax_year):
+    return Rankings(get_catalogue_stats(tax_year))
+
+
+def get_rankings(tax_year=None):
+    """Return the Rankings for the current data version and tax year"""
+    return _build_rankings(resolve_tax_year(tax_year))
+
+
+# ==================== CURSORS ====================
+
+def encode_cursor(version, offset):
+    """Opaque cursor for the page starting at `offset` of a ranking"""
+    return base64.urlsafe_b64encode(f"{version}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, version):
+    """
+    Offset stored in a cursor from encode_cursor.
+
+    Raises:
+        ValueError: if the cursor is malformed or from another data version
+    """
+    try:
+        text = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        cursor_version, offset = (int(part) for part in text.split(":"))
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise ValueError("Invalid 'cursor'") from None
+    if cursor_version != version:
+        raise ValueError("The course data has changed since this cursor was issued; "
+                         "start again without a cursor")
+    if offset < 0:
+        raise ValueError("Invalid 'cursor'")
+    return offset
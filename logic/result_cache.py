@@ -0,0 +1,135 @@
+# result_cache.py
+# Size-bounded memoization for /calculate results
+# Default lookups (no tuition/years override) and override lookups get
+# separate LRU budgets, so slider traffic cannot push out the defaults
+
+import threading
+from collections import OrderedDict
+
+from course_data import get_data_version
+
+DEFAULT_BUDGET = 1024
+OVERRIDE_BUDGET = 4096
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with hit/miss/eviction counters"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value (moving it to most recent) or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Whether key is cached, without counting a lookup or reordering"""
+        return key in self._entries
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None
+        }
+
+
+class ResultCache:
+    """
+    Memoizes results keyed on (course, tuition, years, tax year) and the data version.
+
+    When the data version moves on, both budgets are emptied before the
+    next lookup, so a stale result is never served. Entries are keyed on
+    the version too, so a request pinned to an older table never sees a
+    result for a newer one (or the other way round).
+    """
+
+    def __init__(self, default_budget=DEFAULT_BUDGET, override_budget=OVERRIDE_BUDGET):
+        self.defaults = LRUCache(default_budget)
+        self.overrides = LRUCache(override_budget)
+        self.invalidations = 0
+        self._version = get_data_version()
+        self._lock = threading.Lock()
+
+    def _check_version(self):
+        version = get_data_version()
+        # Only a newer version clears; requests still pinned to the previous
+        # table just use (and fill) entries keyed on their own version
+        if version > self._version:
+            with self._lock:
+                if version > self._version:
+                    self.defaults.clear()
+                    self.overrides.clear()
+                    self.invalidations += 1
+                    self._version = version
+        return version
+
+    def get_or_compute(self, course_name, tuition_per_year, course_length, compute, tax_year=None):
+        """
+        Return the cached result or call compute() and cache what it returns.
+
+        A tax_year other than None counts as an override.
+
+        Exceptions from compute() propagate and nothing is cached. Cached
+        results are shared between requests - treat them as read-only.
+        """
+        cache, key = self._slot(course_name, tuition_per_year, course_length, tax_year)
+        result = cache.get(key)
+        if result is None:
+            result = compute()
+            cache.put(key, result)
+        return result
+
+    def contains(self, course_name, tuition_per_year, course_length, tax_year=None):
+        """Whether get_or_compute() would return without computing"""
+        cache, key = self._slot(course_name, tuition_per_year, course_length, tax_year)
+        return key in cache
+
+    def _slot(self, course_name, tuition_per_year, course_length, tax_year):
+        version = self._check_version()
+        is_default = tuition_per_year is None and course_length is None and tax_year is None
+        cache = self.defaults if is_default else self.overrides
+        return cache, (course_name, tuition_per_year, course_length, tax_year, version)
+
+    def clear(self):
+        self.defaults.clear()
+        self.overrides.clear()
+
+    def stats(self):
+        return {
+            "data_version": self._version,
+            "invalidations": self.invalidations,
+            "default": self.defaults.stats(),
+            "override": self.overrides.stats()
+        }
@@ -2,9 +2,18 @@
 # Core ROI calculation logic for Irish college courses
 # Updated to support expanded course database
 
+import numpy as np
+
 from course_data import COURSE_DATA, get_all_courses
+from lifetime import project_lifetime
+from tax import net_income, net_earnings_5_years, resolve_tax_year
+from batch_calculator import (
+    calculate_roi_batch, batch_results, get_course_columns,
+    ranked_rows, round_like_python, select_rows
+)
+from rankings import get_rankings
 
-def calculate_roi(course_name, tuition_per_year=None, course_length=None):
+def calculate_roi(course_name, tuition_per_year=None, course_length=None, tax_year=None):
     """
     Calculate ROI for a college course.
     
@@ -12,14 +21,17 @@ def calculate_roi(course_name, tuition_per_year=None, course_length=None):
         course_name: str (must match COURSE_DATA keys)
         tuition_per_year: float (€) - if None, uses typical tuition from data
         course_length: int (years) - if None, uses typical length from data
+        tax_year: int - tax rules to apply (see tax.py); if None, the latest year
     
     Returns:
         dict with all calculated outputs
     """
+    tax_year = resolve_tax_year(tax_year)
+    
     # Get course data
     course_info = COURSE_DATA.get(course_name)
     if not course_info:
-        raise ValueError(f"Course '{course_name}' not found. Available courses: {len(get_all_courses())} courses in database")
+        raise ValueError(f"Course '{course_name}' not found. Available courses: {len(COURSE_DATA)} courses in database")
     
     # Use provided values or defaults from course data
     if tuition_per_year is None:
@@ -29,29 +41,24 @@ def calculate_roi(course_name, tuition_per_year=None, course_length=None):
     
     starting_salary = course_info["starting_salary"]
     salary_5_years = course_info["salary_5_years"]
-    growth_rate = course_info["growth_rate"]
     
     # Calculate total education cost
     total_cost = tuition_per_year * course_length
     
-    # Calculate take-home pay (assuming 25% effective tax rate for graduates)
-    annual_net_income = starting_salary * 0.75
+    # Calculate take-home pay (income tax, USC and PRSI for the tax year)
+    annual_net_income = net_income(starting_salary, tax_year)
     
     # Calculate payback period (years to recover education cost)
     payback_years = total_cost / annual_net_income
     
-    # Calculate average salary over 5 years (linear growth assumption)
-    avg_salary_5y = (starting_salary + salary_5_years) / 2
-    
-    # Calculate total earnings over 5 years (after tax)
-    total_earnings_5y = avg_salary_5y * 5 * 0.75
+    # Calculate total earnings over 5 years (linear growth, each year taxed)
+    total_earnings_5y = net_earnings_5_years(starting_salary, salary_5_years, tax_year)
     
     # Calculate ROI percentage over 5 years
     roi_percentage = ((total_earnings_5y - total_cost) / total_cost) * 100
     
-    # Calculate lifetime value (30 year career, simplified)
-    lifetime_earnings = starting_salary * (growth_rate ** 6) * 24
-    lifetime_roi = ((lifetime_earnings - total_cost) / total_cost) * 100
+    # Calculate lifetime value (30 year career, see lifetime.py)
+    lifetime_roi = project_lifetime(starting_salary, salary_5_years, total_cost)["roi"]
     
     return {
         "course_name": course_name,
@@ -64,33 +71,39 @@ def calculate_roi(course_name, tuition_per_year=None, course_length=None):
         "roi_5_years": round(roi_percentage, 1),
         "lifetime_roi": round(lifetime_roi, 0),
         "course_length": course_length,
-        "tuition_per_year": tuition_per_year
+        "tuition_per_year": tuition_per_year,
+        "tax_year": tax_year
     }
 
 
-def compare_courses(course_list, tuition_override=None):
+def compare_courses(course_list, tuition_override=None, tax_year=None):
     """
     Compare multiple courses side by side.
     
     Args:
         course_list: list of course names
         tuition_override: optional dict of {course_name: tuition} to override defaults
+        tax_year: optional tax year (see tax.py)
     
     Returns:
         list of dicts with ROI calculations for each course
     """
-    results = []
+    columns = get_course_columns()
     for course in course_list:
-        tuition = tuition_override.get(course) if tuition_override else None
-        try:
-            result = calculate_roi(course, tuition_per_year=tuition)
-            results.append(result)
-        except ValueError as e:
-            print(f"Warning: {e}")
+        if course not in columns:
+            print(f"Warning: Course '{course}' not found. Available courses: {len(columns)} courses in database")
+    
+    rows = columns.rows_for(course_list)
+    tuition = None
+    if tuition_override:
+        tuition = [tuition_override.get(columns.names[row]) for row in rows]
+        tuition = np.array([np.nan if t is None else t for t in tuition], dtype=np.float64)
+    
+    batch = calculate_roi_batch(tuition_per_year=tuition, rows=rows, columns=columns, tax_year=tax_year)
     
     # Sort by ROI (descending)
-    results.sort(key=lambda x: x["roi_5_years"], reverse=True)
-    return results
+    order = ranked_rows(round_like_python(batch["roi_5_years"], 1), descending=True)
+    return batch_results(select_rows(batch, order), columns)
 
 
 def get_available_courses():
@@ -106,34 +119,14 @@ def get_courses_by_university(university_name):
 
 def get_top_roi_courses(limit=10):
     """Get top N courses by ROI"""
-    all_courses = get_available_courses()
-    results = []
-    
-    for course in all_courses:
-        try:
-            result = calculate_roi(course)
-            results.append(result)
-        except:
-            continue
-    
-    results.sort(key=lambda x: x["roi_5_years"], reverse=True)
-    return results[:limit]
+    rankings = get_rankings()
+    return rankings.results(rankings.page("roi_5_years", limit=limit)[0])
 
 
 def get_fastest_payback_courses(limit=10):
     """Get courses with fastest payback period"""
-    all_courses = get_available_courses()
-    results = []
-    
-    for course in all_courses:
-        try:
-            result = calculate_roi(course)
-            results.append(result)
-        except:
-            continue
-    
-    results.sort(key=lambda x: x["payback_years"])
-    return results[:limit]
+    rankings = get_rankings()
+    return rankings.results(rankings.page("payback_years", limit=limit)[0])
 
 
 # Test the calculator
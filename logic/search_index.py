@@ -0,0 +1,222 @@
+# search_index.py
+# Ranked course search and autocomplete
+# Terms come from the distinct programme names, universities, typical roles
+# and top employers; each term points at the rows that use that value, so
+# the index grows with the vocabulary rather than with the catalogue
+
+import re
+from array import array
+
+import numpy as np
+
+# How much a match in each source counts towards a course's score
+SOURCE_WEIGHTS = {
+    "name": 4.0,
+    "university": 3.0,
+    "roles": 1.5,
+    "employers": 1.0
+}
+SOURCES = list(SOURCE_WEIGHTS)
+
+# Match quality for a query token against an indexed term
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.8
+INFIX_MATCH = 0.6
+FUZZY_MATCH = 0.5
+
+# Bounds that keep a lookup cheap however large the catalogue gets
+MAX_TERMS_PER_TOKEN = 64
+MIN_FUZZY_SIMILARITY = 0.5
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lower-case alphanumeric words of a string"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def trigrams(term):
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+class PrefixTrie:
+    """Character trie over the index vocabulary"""
+
+    def __init__(self):
+        self._root = {}
+
+    def add(self, term):
+        node = self._root
+        for char in term:
+            node = node.setdefault(char, {})
+        node["$"] = term
+
+    def complete(self, prefix, limit=MAX_TERMS_PER_TOKEN):
+        """Terms starting with `prefix`, shortest first, at most `limit`"""
+        node = self._root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        # Breadth-first so the closest completions come back first
+        found = []
+        level = [node]
+        while level and len(found) < limit:
+            next_level = []
+            for current in level:
+                for key, child in sorted(current.items()):
+                    if key == "$":
+                        found.append(child)
+                    else:
+                        next_level.append(child)
+            level = next_level
+        return found[:limit]
+
+
+class SearchIndex:
+    """
+    Prefix trie + trigram index over a CourseTable.
+
+    search() scores every matching course in one vectorized pass and
+    returns results ranked by match quality.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.course_count = len(table)
+        # term -> {source index: sorted rows array}
+        self._postings = {}
+        self._trie = PrefixTrie()
+        self._trigrams = {}
+
+        self._add_category("name", table.index("programme"))
+        self._add_category("university", table.index("university"))
+        self._add_category("university", table.index("university_code"))
+        self._add_list_column("roles", table.category_column("typical_roles"))
+        self._add_list_column("employers", table.category_column("top_employers"))
+
+        # One merged rows array per (term, source) keeps a lookup to a few
+        # vectorized updates however many values share the term
+        for term, by_source in self._postings.items():
+            for source_id, parts in by_source.items():
+                rows = np.unique(np.concatenate([np.frombuffer(p, dtype=np.int32) for p in parts]))
+                by_source[source_id] = rows
+
+        for term in self._postings:
+            self._trie.add(term)
+            for gram in trigrams(term):
+                self._trigrams.setdefault(gram, []).append(term)
+
+    def _add_value(self, source, value, rows):
+        source_id = SOURCES.index(source)
+        for term in set(tokenize(value)):
+            self._postings.setdefault(term, {}).setdefault(source_id, []).append(rows)
+
+    def _add_category(self, source, index):
+        for value, rows in index.items():
+            self._add_value(source, value, rows.astype(np.int32))
+
+    def _add_list_column(self, source, column):
+        rows_by_code = [[] for _ in column.categories]
+        for row, code in enumerate(column.codes):
+            rows_by_code[code].append(row)
+
+        rows_by_value = {}
+        for values, rows in zip(column.categories, rows_by_code):
+            for value in values or ():
+                rows_by_value.setdefault(value, []).extend(rows)
+
+        for value, rows in rows_by_value.items():
+            self._add_value(source, value, array("i", sorted(set(rows))))
+
+    def _matching_terms(self, token):
+        """[(term, quality)] for one query token"""
+        matches = {}
+        if token in self._postings:
+            matches[token] = EXACT_MATCH
+        for term in self._trie.complete(token):
+            matches.setdefault(term, PREFIX_MATCH)
+
+        if len(token) >= 3 and len(matches) < MAX_TERMS_PER_TOKEN:
+            grams = trigrams(token)
+            shared = {}
+            for gram in grams:
+                for term in self._trigrams.get(gram, ()):
+                    shared[term] = shared.get(term, 0) + 1
+            for term, count in sorted(shared.items(), key=lambda x: -x[1]):
+                if term in matches:
+                    continue
+                if token in term:
+                    matches[term] = INFIX_MATCH
+                else:
+                    similarity = count / max(len(grams), len(trigrams(term)))
+                    if similarity >= MIN_FUZZY_SIMILARITY:
+                        matches[term] = FUZZY_MATCH * similarity
+                if len(matches) >= MAX_TERMS_PER_TOKEN:
+                    break
+        return matches.items()
+
+    def search(self, query, limit=10):
+        """
+        Rank courses against a free-text query.
+
+        Every query word has to match (by prefix, infix or a close spelling)
+        in the course name, university, typical roles or top employers.
+
+        Returns:
+            list of dicts with course, university, score and matched_on,
+            best match first; all matches when limit is None
+        """
+        tokens = tokenize(query)
+        if not tokens or not self.course_count:
+            return []
+
+        total = np.zeros(self.course_count)
+        matched_all = np.ones(self.course_count, dtype=bool)
+        sources_hit = np.zeros(self.course_count, dtype=np.uint8)
+        weights = [SOURCE_WEIGHTS[s] for s in SOURCES]
+
+        for token in tokens:
+            token_score = np.zeros(self.course_count)
+            for term, quality in self._matching_terms(token):
+                for source_id, rows in self._postings[term].items():
+                    token_score[rows] = np.maximum(token_score[rows], quality * weights[source_id])
+                    sources_hit[rows] |= 1 << source_id
+            matched_all &= token_score > 0
+            total += token_score
+
+        candidates = np.flatnonzero(matched_all)
+        if not len(candidates):
+            return []
+
+        # Courses whose name starts with the whole query rank first
+        lower_query = query.strip().lower()
+        names = self.table.names
+        shortlist = candidates
+        if limit is not None and len(candidates) > limit * 4:
+            top = np.argpartition(-total[candidates], limit * 4)[:limit * 4]
+            shortlist = candidates[top]
+
+        ranked = []
+        for row in shortlist.tolist():
+            name = names[row]
+            score = total[row]
+            if name.lower().startswith(lower_query):
+                score += SOURCE_WEIGHTS["name"]
+            ranked.append((-score, len(name), name, row))
+        ranked.sort()
+        if limit is not None:
+            ranked = ranked[:limit]
+
+        universities = self.table.category_column("university")
+        return [
+            {
+                "course": name,
+                "university": universities[row],
+                "score": round(float(-neg_score), 3),
+                "matched_on": [s for i, s in enumerate(SOURCES) if sources_hit[row] >> i & 1]
+            }
+            for neg_score, _, name, row in ranked
+        ]
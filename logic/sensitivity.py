@@ -0,0 +1,145 @@
+# sensitivity.py
+# ROI and payback over a grid of what-if scenarios
+#
+# Sweeps tuition per year, course length, effective tax rate and a salary
+# multiplier (applied to both the starting and the 5-year salary) for any
+# number of courses. The whole grid is one broadcast NumPy expression with
+# shape (course, tuition, years, tax_rate, salary_multiplier), using the
+# calculate_roi formulas in the same order.
+#
+# Without a tax_rate axis, take-home pay comes from the tax tables (tax.py)
+# for the chosen tax year, so the 1.0-multiplier cells match
+# /calculate?tuition=&years=&tax_year= exactly. With one, each value is a
+# flat effective rate applied to gross pay.
+
+import numpy as np
+
+from batch_calculator import get_course_columns, round_like_python
+from tax import get_tax_table, net_earnings_5_years_batch
+
+# Axes in the order of the result dimensions (after "course")
+SENSITIVITY_AXES = ("tuition", "years", "tax_rate", "salary_multiplier")
+
+MAX_AXIS_VALUES = 100
+MAX_CELLS = 2_000_000                   # courses x all axis lengths
+
+# Allowed values per axis (inclusive)
+AXIS_LIMITS = {
+    "tuition": (1, 100_000),
+    "years": (1, 10),
+    "tax_rate": (0, 0.9),
+    "salary_multiplier": (0.1, 5)
+}
+
+
+def parse_axis(name, text):
+    """
+    Values for one axis from "a,b,c" or an inclusive "start:stop:step" range.
+    "years" values and steps must be whole numbers.
+
+    Raises:
+        ValueError: on malformed text, too many values or values out of range
+    """
+    cast = int if name == "years" else float
+    try:
+        if ":" in text:
+            start, stop, step = (cast(part) for part in text.split(":"))
+            if step <= 0 or stop < start:
+                raise ValueError
+            count = int(round((stop - start) / step)) + 1
+            if count > MAX_AXIS_VALUES:
+                raise ValueError
+            # Rounded so 0.1 steps give 0.3, not 0.30000000000000004
+            values = [round(start + i * step, 10) for i in range(count)]
+        else:
+            values = [cast(part) for part in text.split(",")]
+    except ValueError:
+        kind = "whole numbers" if cast is int else "values"
+        raise ValueError(f"'{name}' must be comma-separated {kind} or start:stop:step "
+                         f"(at most {MAX_AXIS_VALUES} values)") from None
+
+    low, high = AXIS_LIMITS[name]
+    if not values or len(values) > MAX_AXIS_VALUES or not all(low <= v <= high for v in values):
+        raise ValueError(f"'{name}' values must be between {low} and {high} "
+                         f"(at most {MAX_AXIS_VALUES} values)")
+    return values
+
+
+def grid_shape(course_count, tuition=None, years=None, tax_rate=None, salary_multiplier=None):
+    """Shape of the result grid; omitted axes have length 1"""
+    return (course_count,) + tuple(
+        1 if axis is None else len(axis) for axis in (tuition, years, tax_rate, salary_multiplier)
+    )
+
+
+def sensitivity_grid(rows, tuition=None, years=None, tax_rate=None, salary_multiplier=None,
+                     tax_year=None, columns=None):
+    """
+    ROI and payback for every combination of the given axis values.
+
+    Args:
+        rows: row ids of the courses
+        tuition: tuition per year values, or None for each course's own tuition
+        years: course length values, or None for each course's own length
+        tax_rate: flat effective tax rates, or None for the tax tables
+        salary_multiplier: salary scale factors (default: 1.0)
+        tax_year: tax tables to use when tax_rate is None (default: latest)
+        columns: CourseColumns to use (defaults to the current data)
+
+    Returns:
+        dict with "roi_5_years" and "payback_years" arrays shaped
+        (course, tuition, years, tax_rate, salary_multiplier), rounded
+        like calculate_roi
+
+    Raises:
+        ValueError: if the grid would have more than MAX_CELLS cells
+    """
+    if columns is None:
+        columns = get_course_columns()
+    rows = np.asarray(rows, dtype=np.int64)
+    shape = grid_shape(len(rows), tuition, years, tax_rate, salary_multiplier)
+    if np.prod(shape) > MAX_CELLS:
+        raise ValueError(f"Grid of {int(np.prod(shape))} cells is larger than {MAX_CELLS}; "
+                         f"use fewer courses or axis values")
+
+    def along(values, axis):
+        """Values laid out along one grid dimension (0 = course)"""
+        layout = [1] * 5
+        layout[axis] = -1
+        return np.asarray(values).reshape(layout)
+
+    if tuition is None:
+        tuition = along(columns.typical_tuition[rows], 0)
+    else:
+        tuition = along(np.asarray(tuition, dtype=np.float64), 1)
+    if years is None:
+        length = along(columns.course_length[rows], 0)
+    else:
+        length = along(np.asarray(years, dtype=np.int64), 2)
+    if salary_multiplier is None:
+        salary_multiplier = [1.0]
+    multiplier = along(np.asarray(salary_multiplier, dtype=np.float64), 4)
+
+    starting_salary = along(columns.starting_salary[rows], 0) * multiplier
+    salary_5_years = along(columns.salary_5_years[rows], 0) * multiplier
+
+    # Same formulas, in the same order, as calculate_roi
+    total_cost = tuition * length
+    if tax_rate is None:
+        annual_net_income = get_tax_table(tax_year).net_batch(starting_salary)
+        total_earnings_5y = net_earnings_5_years_batch(starting_salary, salary_5_years, tax_year)
+    else:
+        take_home = along(1 - np.asarray(tax_rate, dtype=np.float64), 3)
+        annual_net_income = starting_salary * take_home
+        total_earnings_5y = (starting_salary + salary_5_years) / 2 * 5 * take_home
+    payback_years = total_cost / annual_net_income
+    roi_percentage = ((total_earnings_5y - total_cost) / total_cost) * 100
+
+    def rounded(values):
+        values = np.broadcast_to(values, shape)
+        return round_like_python(values.ravel(), 1).reshape(shape)
+
+    return {
+        "roi_5_years": rounded(roi_percentage),
+        "payback_years": rounded(payback_years)
+    }
@@ -0,0 +1,217 @@
+# simulation.py
+# Monte Carlo uncertainty for the ROI figures
+#
+# calculate_roi gives one number per course from one starting salary. Here
+# every input it uses is drawn from a per-course distribution instead, and
+# the same formulas are evaluated over many draws at once with NumPy:
+#
+#   starting salary  triangular over the course's startup_salary_range,
+#                    peaking at starting_salary (+/-10% when the range
+#                    is missing or does not contain it)
+#   5-year salary    starting draw x the course's 5-year growth multiple,
+#                    with lognormal noise
+#   later growth     normal around lifetime.DEFAULT_GROWTH (lifetime ROI)
+#   course length    sometimes one year longer (repeat or placement year)
+#
+# Take-home pay for every drawn salary comes from the tax tables (tax.py),
+# so the effective tax rate moves with the salary as it does in practice.
+#
+# Each course gets its own random stream seeded from (seed, course name),
+# so a result does not depend on which other courses were simulated with
+# it or on how a catalogue run was split across processes.
+
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from course_data import cached_per_data_version, get_course_table
+from course_table import MISSING, typecode_of
+from lifetime import project_lifetime_batch, DEFAULT_GROWTH
+from tax import get_tax_table, net_earnings_5_years_batch, resolve_tax_year
+
+DEFAULT_DRAWS = 100_000
+MAX_DRAWS = 1_000_000
+# Catalogue-wide runs: fewer draws per course, and a cap on the total
+CATALOGUE_DRAWS = 10_000
+MAX_CATALOGUE_DRAWS = 20_000_000
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Distribution parameters
+DEFAULT_SALARY_SPREAD = 0.10            # starting salary +/- when a course has no range
+FIVE_YEAR_SIGMA = 0.10                  # lognormal noise on the 5-year growth multiple
+GROWTH_SD = 0.01                        # spread of annual growth after year 5
+EXTRA_YEAR_PROBABILITY = 0.08           # chance of finishing a year late
+
+# Metrics reported, with the number of digits calculate_roi rounds them to
+SIMULATED_METRICS = {"roi_5_years": 1, "payback_years": 1, "lifetime_roi": 0}
+
+# Courses per task when a catalogue run is spread over processes
+CHUNK_COURSES = 64
+
+
+# ==================== INPUTS ====================
+
+def _optional_column(table, field):
+    """Numeric column as float64 with NaN where a course has no value"""
+    column = table.column(field)
+    values = np.asarray(column, dtype=np.float64)
+    typecode = typecode_of(column)
+    if typecode != "d":
+        values[np.asarray(column) == MISSING[typecode]] = np.nan
+    return values
+
+
+class SimulationInputs:
+    """Per-course distribution parameters as arrays, indexed by row id"""
+
+    def __init__(self, table):
+        self.version = table.version
+        self.names = table.names
+        self.starting_salary = np.asarray(table.column("starting_salary"), dtype=np.float64)
+        self.salary_5_years = np.asarray(table.column("salary_5_years"), dtype=np.float64)
+        self.tuition = np.asarray(table.column("typical_tuition"), dtype=np.float64)
+        self.course_length = np.asarray(table.column("course_length"), dtype=np.int64)
+
+        # Triangular bounds: the salary range, or a fixed spread where the
+        # range is missing, empty or does not contain starting_salary
+        low = _optional_column(table, "salary_range_min")
+        high = _optional_column(table, "salary_range_max")
+        with np.errstate(invalid="ignore"):
+            no_range = ~((low <= self.starting_salary) & (self.starting_salary <= high) & (low < high))
+        self.salary_low = np.where(no_range, self.starting_salary * (1 - DEFAULT_SALARY_SPREAD), low)
+        self.salary_high = np.where(no_range, self.starting_salary * (1 + DEFAULT_SALARY_SPREAD), high)
+
+    def __len__(self):
+        return len(self.names)
+
+    def chunk(self, rows):
+        """Plain parameters for some rows, small enough to send to a worker process"""
+        return {
+            "names": [self.names[row] for row in rows],
+            "starting_salary": self.starting_salary[rows],
+            "salary_low": self.salary_low[rows],
+            "salary_high": self.salary_high[rows],
+            "salary_5_years": self.salary_5_years[rows],
+            "tuition": self.tuition[rows],
+            "course_length": self.course_length[rows]
+        }
+
+
+@cached_per_data_version
+def get_simulation_inputs():
+    """Return the SimulationInputs for the current data version"""
+    return SimulationInputs(get_course_table())
+
+
+# ==================== SIMULATION ====================
+
+def course_rng(course_name, seed):
+    """Random generator for one course, fixed by the seed and the course name"""
+    key = int.from_bytes(hashlib.blake2b(course_name.encode("utf-8"), digest_size=8).digest(), "little")
+    return np.random.default_rng([seed, key])
+
+
+def simulate_draws(rng, draws, starting_salary, salary_low, salary_high, salary_5_years,
+                   tuition, course_length, tax_year=None):
+    """
+    ROI, payback and lifetime ROI for `draws` sampled scenarios of one course.
+
+    Same formulas as calculate_roi, evaluated on arrays of draws.
+
+    Returns:
+        dict of unrounded arrays, one value per draw
+    """
+    start = rng.triangular(salary_low, starting_salary, salary_high, draws)
+    five_year_multiple = salary_5_years / starting_salary
+    salary_5 = start * five_year_multiple * rng.lognormal(0.0, FIVE_YEAR_SIGMA, draws)
+    growth = rng.normal(DEFAULT_GROWTH, GROWTH_SD, draws)
+    length = course_length + (rng.random(draws) < EXTRA_YEAR_PROBABILITY)
+
+    total_cost = tuition * length
+    payback_years = total_cost / get_tax_table(tax_year).net_batch(start)
+    total_earnings_5y = net_earnings_5_years_batch(start, salary_5, tax_year)
+    roi_percentage = ((total_earnings_5y - total_cost) / total_cost) * 100
+    lifetime_roi = project_lifetime_batch(start, salary_5, total_cost, growth=growth)["roi"]
+
+    return {
+        "roi_5_years": roi_percentage,
+        "payback_years": payback_years,
+        "lifetime_roi": lifetime_roi
+    }
+
+
+def summarize(values, percentiles, ndigits):
+    """Mean and percentiles of one metric's draws, rounded like calculate_roi"""
+    summary = {"mean": round(float(values.mean()), ndigits)}
+    for p, value in zip(percentiles, np.percentile(values, percentiles)):
+        summary[f"p{p:g}"] = round(float(value), ndigits)
+    return summary
+
+
+def _simulate_chunk(chunk, draws, seed, percentiles, tax_year):
+    results = []
+    for i, name in enumerate(chunk["names"]):
+        outcomes = simulate_draws(
+            course_rng(name, seed), draws,
+            chunk["starting_salary"][i], chunk["salary_low"][i], chunk["salary_high"][i],
+            chunk["salary_5_years"][i], chunk["tuition"][i], chunk["course_length"][i],
+            tax_year
+        )
+        result = {"course_name": name}
+        for metric, ndigits in SIMULATED_METRICS.items():
+            result[metric] = summarize(outcomes[metric], percentiles, ndigits)
+        result["chance_of_loss"] = round(float(np.mean(outcomes["roi_5_years"] < 0)), 4)
+        results.append(result)
+    return results
+
+
+def simulate_rows(rows, draws=DEFAULT_DRAWS, seed=0, percentiles=DEFAULT_PERCENTILES,
+                  processes=1, inputs=None, tax_year=None):
+    """
+    Simulate several courses.
+
+    Args:
+        rows: row ids to simulate
+        draws: scenarios per course
+        seed: random seed; the same seed always gives the same results
+        percentiles: percentiles to report for each metric
+        processes: worker processes to spread the courses over (1 = in process)
+        inputs: SimulationInputs to use (defaults to the current data)
+        tax_year: tax tables to apply (defaults to the latest year)
+
+    Returns:
+        list of per-course summaries, in the order of `rows`
+    """
+    if inputs is None:
+        inputs = get_simulation_inputs()
+    if not 1 <= draws <= MAX_DRAWS:
+        raise ValueError(f"'draws' must be between 1 and {MAX_DRAWS}")
+    rows = np.asarray(rows, dtype=np.int64)
+    percentiles = tuple(percentiles)
+    tax_year = resolve_tax_year(tax_year)
+
+    if processes <= 1 or len(rows) <= CHUNK_COURSES:
+        return _simulate_chunk(inputs.chunk(rows), draws, seed, percentiles, tax_year)
+
+    chunks = [inputs.chunk(rows[i:i + CHUNK_COURSES]) for i in range(0, len(rows), CHUNK_COURSES)]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        parts = pool.map(_simulate_chunk, chunks, [draws] * len(chunks),
+                         [seed] * len(chunks), [percentiles] * len(chunks),
+                         [tax_year] * len(chunks))
+        return [result for part in parts for result in part]
+
+
+def simulate_course(course_name, draws=DEFAULT_DRAWS, seed=0, percentiles=DEFAULT_PERCENTILES,
+                    tax_year=None):
+    """
+    Simulate one course.
+
+    Raises:
+        ValueError: if the course is unknown or draws is out of range
+    """
+    row = get_course_table().row_of(course_name)
+    if row is None:
+        raise ValueError(f"Course '{course_name}' not found")
+    return simulate_rows([row], draws, seed, percentiles, tax_year=tax_year)[0]
+
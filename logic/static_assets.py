@@ -0,0 +1,322 @@
+# static_assets.py
+# Startup-time pipeline for the front-end files
+# Each file is minified, compressed (gzip, plus brotli when installed) and
+# fingerprinted once, then served from memory
+
+import os
+import re
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Files served by the app, with the URL they are requested as in the pages
+ASSET_FILES = {
+    "index.html": "text/html",
+    "quiz.html": "text/html",
+    "style.css": "text/css",
+    "script.js": "application/javascript"
+}
+
+# Fingerprinted copies live under this prefix and never change
+ASSET_PREFIX = "/assets/"
+
+# Encodings in order of preference
+ENCODINGS = ["br", "gzip"]
+
+_CSS_TOKENS = re.compile(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')|/\*.*?\*/", re.S)
+_HTML_COMMENT = re.compile(r"^<!--(?!\[).*-->$")
+
+
+# ==================== MINIFIERS ====================
+
+def minify_css(source):
+    """Drop comments and collapse whitespace, leaving quoted strings alone"""
+    parts = []
+    position = 0
+    for match in _CSS_TOKENS.finditer(source):
+        parts.append(_squeeze_css(source[position:match.start()]))
+        parts.append(match.group(1) or " ")
+        position = match.end()
+    parts.append(_squeeze_css(source[position:]))
+    return "".join(parts).strip()
+
+
+def _squeeze_css(text):
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r" ?([{};,>]) ?", r"\1", text)
+    text = re.sub(r": ", ":", text)
+    return text.replace(";}", "}")
+
+
+def _js_line_states(lines):
+    """
+    Whether each line starts/ends inside a template literal or block comment.
+
+    Tracks quotes, regex literals, template literals (with ${} nesting) and
+    block comments.
+    Returns None when the scan does not end back in plain code, in which
+    case the caller leaves the source untouched.
+    """
+    stack = []          # "`" for a template, "{" for a ${ } or plain block inside one
+    in_comment = False
+    states = []
+    for line in lines:
+        starts_in_template = bool(stack) and stack[-1] == "`"
+        starts_in_comment = in_comment
+        quote = None
+        i = 0
+        while i < len(line):
+            char = line[i]
+            if in_comment:
+                if line.startswith("*/", i):
+                    in_comment = False
+                    i += 1
+            elif quote:
+                if char == "\\":
+                    i += 1
+                elif char == quote:
+                    quote = None
+            elif stack and stack[-1] == "`":
+                if char == "\\":
+                    i += 1
+                elif char == "`":
+                    stack.pop()
+                elif line.startswith("${", i):
+                    stack.append("{")
+                    i += 1
+            elif char in "'\"":
+                quote = char
+            elif char == "`":
+                stack.append("`")
+            elif line.startswith("//", i):
+                break
+            elif line.startswith("/*", i):
+                in_comment = True
+                i += 1
+            elif char == "/" and _starts_regex(line, i):
+                i = _skip_regex(line, i)
+            elif char == "{" and stack:
+                stack.append("{")
+            elif char == "}" and stack:
+                stack.pop()
+            i += 1
+        ends_in_template = bool(stack) and stack[-1] == "`"
+        states.append((starts_in_template, ends_in_template, starts_in_comment, in_comment))
+    if stack or in_comment:
+        return None
+    return states
+
+
+def _starts_regex(line, position):
+    """A "/" starts a regex literal when it cannot be a division"""
+    before = line[:position].rstrip()
+    return not before or before[-1] in "(,=:[!&|?{};+-*%<>~^"
+
+
+def _skip_regex(line, position):
+    """Position of the closing "/" of the regex literal opening at `position`"""
+    i = position + 1
+    in_class = False
+    while i < len(line):
+        char = line[i]
+        if char == "\\":
+            i += 1
+        elif char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            return i
+        i += 1
+    return i
+
+
+def minify_js(source):
+    """
+    Conservative line-based minifier.
+
+    Strips indentation, blank lines and whole-line comments, never touching
+    the inside of a template literal. Safer than a token-level minifier
+    without a real JS parser; gzip/brotli recover most of the remainder.
+    """
+    lines = source.split("\n")
+    states = _js_line_states(lines)
+    if states is None:
+        return source
+
+    output = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        starts_in_template, ends_in_template, starts_in_comment, ends_in_comment = states[i]
+        if starts_in_template:
+            output.append(line if ends_in_template else line.rstrip())
+            i += 1
+            continue
+
+        stripped = line.lstrip() if ends_in_template else line.strip()
+        if not starts_in_comment and stripped.startswith("/*"):
+            end = _block_comment_end(lines, states, i)
+            if end is not None:
+                i = end + 1
+                continue
+        if not stripped or (stripped.startswith("//") and not starts_in_comment):
+            i += 1
+            continue
+        output.append(stripped)
+        i += 1
+    return "\n".join(output)
+
+
+def _block_comment_end(lines, states, start):
+    """Last line of a /* */ comment opening line `start`, if nothing follows it"""
+    end = start
+    while states[end][3]:
+        end += 1
+    closing = lines[end].rstrip()
+    offset = closing.index("/*") + 2 if end == start else 0
+    if closing.find("*/", offset) == len(closing) - 2:
+        return end
+    return None
+
+
+def minify_html(source):
+    """Strip indentation, blank lines and whole-line comments; inline JS is minified too"""
+    output = []
+    script = None
+    preformatted = False
+    for line in source.split("\n"):
+        stripped = line.strip()
+        lower = stripped.lower()
+        if script is not None:
+            if lower.startswith("</script>"):
+                output.append(minify_js("\n".join(script)))
+                output.append(stripped)
+                script = None
+            else:
+                script.append(line)
+            continue
+        if preformatted:
+            output.append(line)
+            if "</pre>" in lower or "</textarea>" in lower:
+                preformatted = False
+            continue
+
+        if lower.startswith(("<pre", "<textarea")) and \
+                "</pre>" not in lower and "</textarea>" not in lower:
+            preformatted = True
+            output.append(line)
+            continue
+        if not stripped or _HTML_COMMENT.match(stripped):
+            continue
+        output.append(stripped)
+        if lower == "<script>":
+            script = []
+    if script is not None:
+        output.extend(script)
+    return "\n".join(output)
+
+
+MINIFIERS = {
+    "text/html": minify_html,
+    "text/css": minify_css,
+    "application/javascript": minify_js
+}
+
+
+# ==================== PIPELINE ====================
+
+class Asset:
+    """One processed file: minified body, compressed variants and fingerprint"""
+
+    def __init__(self, name, mimetype, text):
+        self.name = name
+        self.mimetype = mimetype
+        self.body = text.encode("utf-8")
+        self.digest = hashlib.sha256(self.body).hexdigest()[:16]
+
+        stem, extension = os.path.splitext(name)
+        self.url = f"{ASSET_PREFIX}{stem}.{self.digest[:10]}{extension}"
+
+        # Only keep an encoding when it actually saves bytes
+        self.encoded = {}
+        candidates = {"gzip": gzip.compress(self.body, 9, mtime=0)}
+        if brotli is not None:
+            candidates["br"] = brotli.compress(self.body, quality=11)
+        for encoding, data in candidates.items():
+            if len(data) < len(self.body):
+                self.encoded[encoding] = data
+
+    def negotiate(self, accept_encodings):
+        """
+        Pick the best stored variant for an Accept-Encoding header.
+
+        Args:
+            accept_encodings: werkzeug Accept object (request.accept_encodings)
+
+        Returns:
+            (encoding, bytes) with encoding "identity" for the plain body
+        """
+        for encoding in ENCODINGS:
+            if encoding in self.encoded and accept_encodings.quality(encoding) > 0:
+                return encoding, self.encoded[encoding]
+        return "identity", self.body
+
+    def sizes(self):
+        sizes = {"identity": len(self.body)}
+        sizes.update({encoding: len(data) for encoding, data in self.encoded.items()})
+        return sizes
+
+
+class AssetPipeline:
+    """
+    Builds every asset once and looks them up by name or fingerprinted URL.
+
+    Stylesheets and scripts are built first so that the HTML pages can be
+    rewritten to point at their fingerprinted URLs.
+    """
+
+    def __init__(self, root, files=None):
+        self.root = root
+        self.files = files or ASSET_FILES
+        self._by_name = {}
+        self._by_url = {}
+
+    def build(self):
+        pages = [n for n, m in self.files.items() if m == "text/html"]
+        others = [n for n in self.files if n not in pages]
+        for name in others + pages:
+            path = os.path.join(self.root, name)
+            if not os.path.exists(path):
+                print(f"Warning: Static asset {name} not found, skipping")
+                continue
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+
+            mimetype = self.files[name]
+            if mimetype == "text/html":
+                text = self._link_fingerprints(text)
+            asset = Asset(name, mimetype, MINIFIERS[mimetype](text))
+            self._by_name[name] = asset
+            self._by_url[asset.url] = asset
+        return self
+
+    def _link_fingerprints(self, html):
+        for name, asset in self._by_name.items():
+            html = re.sub(rf'(\b(?:src|href)=")/?{re.escape(name)}"', rf'\g<1>{asset.url}"', html)
+        return html
+
+    def get(self, name):
+        """Asset for a source file name, or None"""
+        return self._by_name.get(name)
+
+    def by_url(self, url):
+        """Asset for a fingerprinted URL, or None"""
+        return self._by_url.get(url)
+
+    def stats(self):
+        return {name: {"url": asset.url, "bytes": asset.sizes()} for name, asset in self._by_name.items()}
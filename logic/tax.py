@@ -0,0 +1,207 @@
+# tax.py
+# Irish PAYE take-home pay: income tax, USC and PRSI by tax year
+#
+# Figures are for a single PAYE employee with the personal and employee
+# tax credits (Revenue.ie, Budgets 2023-2025). Each year's rules are
+# compiled into one piecewise-linear table of total deductions:
+#
+#   deductions(x) = intercept[k] + slope[k] * x   for bound[k-1] < x <= bound[k]
+#
+# so tax on any number of salaries is a searchsorted plus one multiply-add,
+# and the scalar path does the same arithmetic with bisect, giving the
+# same floats as the batch path.
+
+import hashlib
+from bisect import bisect_left
+from functools import lru_cache
+
+import numpy as np
+
+# Per-year rules. USC bands are (upper limit, rate), the last one open-ended.
+TAX_YEARS = {
+    2023: {
+        "standard_rate_band": 40000,
+        "rates": (0.20, 0.40),
+        "tax_credits": 1775 + 1775,
+        "usc_exemption": 13000,
+        "usc_bands": [(12012, 0.005), (22920, 0.02), (70044, 0.045), (None, 0.08)],
+        "prsi_rate": 0.04,
+        "prsi_threshold": 352 * 52
+    },
+    2024: {
+        "standard_rate_band": 42000,
+        "rates": (0.20, 0.40),
+        "tax_credits": 1875 + 1875,
+        "usc_exemption": 13000,
+        "usc_bands": [(12012, 0.005), (25760, 0.02), (70044, 0.04), (None, 0.08)],
+        "prsi_rate": 0.04025,       # 4% rising to 4.1% from October
+        "prsi_threshold": 352 * 52
+    },
+    2025: {
+        "standard_rate_band": 44000,
+        "rates": (0.20, 0.40),
+        "tax_credits": 2000 + 2000,
+        "usc_exemption": 13000,
+        "usc_bands": [(12012, 0.005), (27382, 0.02), (70044, 0.03), (None, 0.08)],
+        "prsi_rate": 0.04125,       # 4.1% rising to 4.2% from October
+        "prsi_threshold": 352 * 52
+    }
+}
+
+DEFAULT_TAX_YEAR = max(TAX_YEARS)
+
+
+def rules_digest():
+    """
+    Short hash of every year's rules and the default year.
+
+    It changes whenever the same salary could be taxed differently, so
+    HTTP validators built on it go stale with the rules.
+    """
+    text = repr((DEFAULT_TAX_YEAR, sorted(TAX_YEARS.items())))
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def resolve_tax_year(tax_year=None):
+    """
+    The tax year to use (DEFAULT_TAX_YEAR when None).
+
+    Raises:
+        ValueError: for a year with no tax tables
+    """
+    if tax_year is None:
+        return DEFAULT_TAX_YEAR
+    if tax_year not in TAX_YEARS:
+        raise ValueError(f"No tax tables for {tax_year}; available years: "
+                         f"{', '.join(str(y) for y in sorted(TAX_YEARS))}")
+    return tax_year
+
+
+# ==================== REFERENCE RULES ====================
+
+def tax_breakdown(salary, tax_year=None):
+    """
+    Income tax, USC and PRSI on a gross salary, band by band.
+
+    This is the readable definition of the rules; TaxTable compiles it into
+    the form used for calculations.
+    """
+    rules = TAX_YEARS[resolve_tax_year(tax_year)]
+    standard, higher = rules["rates"]
+    band = rules["standard_rate_band"]
+    gross_tax = standard * min(salary, band) + higher * max(0, salary - band)
+    income_tax = max(0, gross_tax - rules["tax_credits"])
+
+    usc = 0
+    if salary > rules["usc_exemption"]:
+        lower = 0
+        for upper, rate in rules["usc_bands"]:
+            top = salary if upper is None else min(salary, upper)
+            if top > lower:
+                usc += (top - lower) * rate
+            if upper is None or salary <= upper:
+                break
+            lower = upper
+
+    prsi = salary * rules["prsi_rate"] if salary > rules["prsi_threshold"] else 0
+
+    return {
+        "income_tax": income_tax,
+        "usc": usc,
+        "prsi": prsi,
+        "total": income_tax + usc + prsi
+    }
+
+
+# ==================== COMPILED TABLES ====================
+
+class TaxTable:
+    """One tax year's total deductions as a piecewise-linear function of salary"""
+
+    def __init__(self, tax_year):
+        self.tax_year = tax_year
+        rules = TAX_YEARS[tax_year]
+        breakpoints = {
+            rules["tax_credits"] / rules["rates"][0],      # credits used up
+            rules["standard_rate_band"],
+            rules["usc_exemption"],
+            rules["prsi_threshold"]
+        }
+        breakpoints.update(upper for upper, _ in rules["usc_bands"] if upper is not None)
+        bounds = sorted(breakpoints)
+
+        def total(x):
+            return tax_breakdown(x, tax_year)["total"]
+
+        # Fit each segment through two interior points. The rules are linear
+        # between breakpoints, so rounding only removes float noise.
+        slopes, intercepts = [], []
+        for lower, upper in zip([0.0] + bounds, bounds + [None]):
+            width = 3000.0 if upper is None else upper - lower
+            a, b = lower + width / 3, lower + 2 * width / 3
+            slope = round((total(b) - total(a)) / (b - a), 9)
+            slopes.append(slope)
+            intercepts.append(round(total(a) - slope * a, 6))
+
+        self.bounds = [float(b) for b in bounds]
+        self.slopes = slopes
+        self.intercepts = intercepts
+        self._bounds = np.array(self.bounds)
+        self._slopes = np.array(slopes)
+        self._intercepts = np.array(intercepts)
+
+    def deductions(self, salary):
+        """Total income tax, USC and PRSI on one salary"""
+        k = bisect_left(self.bounds, salary)
+        return self.intercepts[k] + self.slopes[k] * salary
+
+    def net(self, salary):
+        """Take-home pay for one salary"""
+        return salary - self.deductions(salary)
+
+    def net_batch(self, salaries):
+        """Take-home pay for an array of salaries, in one vectorized pass"""
+        salaries = np.asarray(salaries)
+        k = np.searchsorted(self._bounds, salaries, side="left")
+        return salaries - (self._intercepts[k] + self._slopes[k] * salaries)
+
+
+TAX_TABLES = {year: TaxTable(year) for year in TAX_YEARS}
+
+
+def get_tax_table(tax_year=None):
+    """Compiled TaxTable for a tax year (DEFAULT_TAX_YEAR when None)"""
+    return TAX_TABLES[resolve_tax_year(tax_year)]
+
+
+@lru_cache(maxsize=4096)
+def net_income(salary, tax_year=None):
+    """Take-home pay for one salary; memoized, since salaries repeat a lot"""
+    return get_tax_table(tax_year).net(salary)
+
+
+# ==================== ROI HELPERS ====================
+
+# Salaries over years 1-5 grow linearly from the starting salary to the
+# 5-year salary; these are each year's position along that line
+EARLY_CAREER_STEPS = [i / 4 for i in range(5)]
+
+
+def net_earnings_5_years(starting_salary, salary_5_years, tax_year=None):
+    """After-tax earnings over years 1-5, taxing each year's salary separately"""
+    table = get_tax_table(tax_year)
+    total = 0.0
+    for step in EARLY_CAREER_STEPS:
+        total = total + table.net(starting_salary + (salary_5_years - starting_salary) * step)
+    return total
+
+
+def net_earnings_5_years_batch(starting_salary, salary_5_years, tax_year=None):
+    """Vectorized net_earnings_5_years, adding the years in the same order"""
+    table = get_tax_table(tax_year)
+    starting_salary = np.asarray(starting_salary)
+    salary_5_years = np.asarray(salary_5_years)
+    total = 0.0
+    for step in EARLY_CAREER_STEPS:
+        total = total + table.net_batch(starting_salary + (salary_5_years - starting_salary) * step)
+    return total
@@ -0,0 +1,71 @@
+# test_alternatives.py
+# Tests for the per-field alternative course candidates
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from alternatives import FieldAlternatives, NO_ALTERNATIVE, BETTER, CHEAPER
+from catalogue_generator import generate_courses
+from catalogue_stats import get_catalogue_stats
+from course_data import get_course_table, install_course_table
+from course_table import CourseTable
+
+
+def reference_best(table, roi_values, cost_values, row, roi, cost):
+    """The original suggest_alternative scan over every other course in the field"""
+    peers = table.index("field").lookup(table.names[row].split(" - ")[0])
+    peers = peers[peers != row]
+    peer_roi, peer_cost = roi_values[peers], cost_values[peers]
+    better = peer_roi > roi * 1.1
+    cheaper = ~better & (peer_cost < cost * 0.9) & (peer_roi > roi * 0.95)
+    if better.any():
+        gains = peer_roi[better] - roi
+        best = int(np.argmax(gains))
+        return BETTER, int(peers[better][best]), gains[best].item()
+    if cheaper.any():
+        savings = cost - peer_cost[cheaper]
+        best = int(np.argmax(savings))
+        return CHEAPER, int(peers[cheaper][best]), savings[best].item()
+    return NO_ALTERNATIVE, None, None
+
+
+def test_matches_peer_scan():
+    """Test single and bulk answers against scanning the field, with ties and missing ROIs"""
+    original = get_course_table()
+    rng = np.random.default_rng(9)
+    try:
+        install_course_table(CourseTable.from_items(generate_courses(2000, seed=17)))
+        stats = get_catalogue_stats()
+        table = stats.columns.table
+        count = stats.course_count
+
+        # Few distinct values, so ties and "similar ROI, cheaper" cases are common
+        roi = rng.integers(90, 110, count).astype(np.float64)
+        roi[rng.random(count) < 0.02] = np.nan
+        cost = rng.integers(5, 15, count).astype(np.float64) * 1000
+        alternatives = FieldAlternatives(SimpleNamespace(
+            columns=stats.columns, course_count=count, values={"roi_5_years": roi, "total_cost": cost}))
+
+        kinds, others, amounts = alternatives.best_for_all()
+        seen = set()
+        for row in range(count):
+            expected = reference_best(table, roi, cost, row, roi[row].item(), cost[row].item())
+            assert alternatives.best_for(row, roi[row].item(), cost[row].item()) == expected, row
+            other = others[row].item()
+            assert (kinds[row].item(), None if other < 0 else other,
+                    None if other < 0 else amounts[row].item()) == expected, row
+            seen.add(expected[0])
+
+            # Overridden inputs go through best_for only
+            changed = (roi[row].item() * rng.uniform(0.8, 1.2), rng.integers(4, 16).item() * 1000.0)
+            assert alternatives.best_for(row, *changed) == reference_best(table, roi, cost, row, *changed)
+        assert seen == {NO_ALTERNATIVE, BETTER, CHEAPER}
+    finally:
+        install_course_table(original)
+
+    print("✓ Alternatives vs peer scan test passed")
+
+
+if __name__ == "__main__":
+    test_matches_peer_scan()
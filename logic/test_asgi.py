@@ -0,0 +1,146 @@
+# test_asgi.py
+# Tests for the asyncio (ASGI) entry point
+
+import asyncio
+import json
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import app, result_cache, get_courses_body
+from asgi import ASGIApp, call
+from course_data import get_course_table
+
+
+def test_responses_match_wsgi():
+    """Test that ASGI responses match the Flask test client, inline and on the pool"""
+    client = app.test_client()
+    application = ASGIApp(app, threads=2)
+    application.ready = True
+    courses = list(get_course_table().names)
+    result_cache.clear()
+    get_courses_body()
+
+    async def run():
+        checks = [
+            ('GET', '/courses', b'', b''),
+            ('GET', '/calculate', b'course=Law+-+UCD&tax_year=2023', b''),
+            ('GET', '/calculate', b'course=Law+-+UCD&tax_year=2023', b''),
+            ('GET', '/calculate', b'', b''),
+            ('GET', '/rank', b'metric=roi_5_years&limit=5', b''),
+            ('POST', '/compare-multiple', b'', json.dumps({"courses": courses[:3]}).encode()),
+            ('POST', '/compare-multiple', b'', json.dumps({"courses": courses[:120]}).encode()),
+            ('GET', '/no-such-route', b'', b'')
+        ]
+        for method, path, query, body in checks:
+            headers = [('Content-Type', 'application/json')] if body else []
+            status, response_headers, data = await call(application, method, path, query, body, headers)
+            expected = client.open(path, method=method, query_string=query.decode(), data=body, headers=headers)
+            assert status == expected.status_code, path
+            assert data == expected.get_data(), path
+            assert response_headers['access-control-allow-origin'] == '*'
+            assert response_headers.get('etag') == expected.headers.get('ETag'), path
+
+        status, headers, _ = await call(application, 'GET', '/courses', headers=[
+            ('If-None-Match', f'"{client.get("/courses").headers["ETag"].strip(chr(34))}"')])
+        assert status == 304
+
+        status, _, data = await call(application, 'GET', '/api')
+        assert status == 200 and json.loads(data)["status"] == "online"
+
+    asyncio.run(run())
+    stats = application.stats()
+    # Cached /calculate, /courses, the 400, the 304 and /api ran on the loop
+    assert stats["inline"] == 5, stats
+    assert stats["pooled"] == 5 and stats["pending"] == 0 and stats["rejected"] == 0
+
+    print("✓ ASGI vs WSGI responses test passed")
+
+
+def test_busy_pool_and_limits():
+    """Test the 503 when the pool is full, the 413 for large bodies and lifespan startup"""
+    release = threading.Event()
+
+    def slow_app(environ, start_response):
+        release.wait(5)
+        start_response('200 OK', [('Content-Type', 'text/plain'), ('Content-Length', '2')])
+        return [b'ok']
+
+    application = ASGIApp(slow_app, threads=1, max_pending=1, max_body=10)
+
+    async def run():
+        first = asyncio.ensure_future(call(application, 'GET', '/slow'))
+        while application.pending == 0:
+            await asyncio.sleep(0.001)
+
+        status, headers, data = await call(application, 'GET', '/slow')
+        assert status == 503 and headers['retry-after'] == '1'
+        assert json.loads(data)["success"] is False
+
+        release.set()
+        assert await first == (200, {'content-type': 'text/plain', 'content-length': '2'}, b'ok')
+
+        status, _, _ = await call(application, 'POST', '/slow', body=b'x' * 11)
+        assert status == 413
+
+        startup = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return startup.pop(0)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        await ASGIApp(app)({'type': 'lifespan'}, receive, send)
+        assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+
+    asyncio.run(run())
+    assert application.stats()["rejected"] == 1
+
+    print("✓ Busy pool and limits test passed")
+
+
+def test_stream_stops_on_disconnect():
+    """Test that a streamed body stops being pulled once the client goes away"""
+    pulled = []
+    closed = []
+
+    def streaming_app(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+
+        def chunks():
+            try:
+                for i in range(1000):
+                    pulled.append(i)
+                    yield b'line\n'
+            finally:
+                closed.append(True)
+        return chunks()
+
+    application = ASGIApp(streaming_app)
+    scope = {'type': 'http', 'method': 'GET', 'path': '/stream', 'query_string': b'', 'headers': []}
+    messages = [{'type': 'http.request', 'body': b''}, {'type': 'http.disconnect'}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+        await asyncio.sleep(0)
+
+    asyncio.run(application(scope, receive, send))
+    assert closed == [True]
+    assert len(pulled) < 10, len(pulled)
+    assert sent[0]['status'] == 200
+
+    print("✓ Stream disconnect test passed")
+
+
+if __name__ == "__main__":
+    test_responses_match_wsgi()
+    test_busy_pool_and_limits()
+    test_stream_stops_on_disconnect()
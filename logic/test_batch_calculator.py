@@ -0,0 +1,84 @@
+# test_batch_calculator.py
+# Tests that the vectorized engine agrees with calculate_roi / analyze_course
+
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import analyze_course
+from roi_calculator import calculate_roi
+from batch_calculator import (
+    calculate_roi_batch, analyze_batch, batch_results,
+    get_course_columns, round_like_python
+)
+
+
+def test_batch_matches_scalar():
+    """Test that every course matches calculate_roi exactly after rounding"""
+    columns = get_course_columns()
+    results = batch_results(calculate_roi_batch())
+
+    assert len(results) == len(columns)
+    for result in results:
+        assert result == calculate_roi(result["course_name"]), \
+            f"{result['course_name']}: batch result differs from calculate_roi"
+
+    print(f"✓ Batch matches scalar for all {len(results)} courses")
+
+
+def test_batch_overrides():
+    """Test per-course tuition and course length override arrays"""
+    columns = get_course_columns()
+    count = len(columns)
+
+    tuition = np.full(count, np.nan)
+    tuition[::3] = 9150.5
+    length = np.full(count, np.nan)
+    length[1::4] = 3
+
+    results = batch_results(calculate_roi_batch(tuition, length))
+    for i, result in enumerate(results):
+        expected = calculate_roi(
+            result["course_name"],
+            tuition_per_year=None if np.isnan(tuition[i]) else tuition[i],
+            course_length=None if np.isnan(length[i]) else int(length[i])
+        )
+        assert result == expected, f"{result['course_name']}: override mismatch"
+
+    print("✓ Batch override test passed")
+
+
+def test_analysis_matches_analyze_course():
+    """Test lifetime figures and labels against analyze_course"""
+    columns = get_course_columns()
+    analysis = analyze_batch(calculate_roi_batch())
+
+    for i, name in enumerate(columns.names):
+        expected = analyze_course(calculate_roi(name))["analysis"]
+        assert analysis["payback_label"][i] == expected["payback_label"]
+        assert analysis["roi_rating"][i] == expected["roi_rating"]
+        assert analysis["roi_stars"][i] == expected["roi_stars"]
+        for key, values in analysis["lifetime"].items():
+            assert values[i] == expected["lifetime"][key], f"{name}: lifetime {key} mismatch"
+
+    print("✓ Batch analysis test passed")
+
+
+def test_round_like_python():
+    """Test that array rounding agrees with round() on awkward values"""
+    values = [2.675, 1.005, 0.125, 0.375, 2.5, 3.5, -1.45, 1234.5678, 0.285]
+    for digits in (0, 1, 2):
+        rounded = round_like_python(values, digits).tolist()
+        assert rounded == [round(v, digits) for v in values]
+
+    print("✓ round_like_python test passed")
+
+
+if __name__ == "__main__":
+    test_batch_matches_scalar()
+    test_batch_overrides()
+    test_analysis_matches_analyze_course()
+    test_round_like_python()
@@ -0,0 +1,52 @@
+# test_benchmark.py
+# Tests for the benchmark harness (not the timings themselves)
+
+from benchmark import LARGE_COMPARISON, build_benchmarks, find_regressions, run_suite
+from course_data import get_course_table
+
+
+def test_find_regressions():
+    """Test that only slowdowns beyond the threshold are reported"""
+    def run(**timings):
+        return {"results": {"real": {"benchmarks": {
+            name: {"median_ms": ms} for name, ms in timings.items()
+        }}}}
+
+    baseline = run(calculate_roi=1.0, route_courses=2.0, only_in_baseline=1.0)
+    current = run(calculate_roi=1.2, route_courses=3.0, only_in_current=9.0)
+
+    regressions = find_regressions(current, baseline, threshold=0.25)
+    assert [r["benchmark"] for r in regressions] == ["route_courses"]
+    assert regressions[0]["slowdown"] == 0.5
+    assert find_regressions(current, baseline, threshold=0.6) == []
+
+    print("✓ Regression check test passed")
+
+
+def test_run_suite_restores_catalogue():
+    """Test a small suite run and that the real catalogue is reinstalled after"""
+    before = get_course_table().content_hash()
+    results = run_suite(["real"], only={"calculate_roi", "route_courses"})
+
+    timings = results["results"]["real"]["benchmarks"]
+    assert set(timings) == {"calculate_roi", "route_courses"}
+    assert timings["calculate_roi"]["median_ms"] > 0
+    assert get_course_table().content_hash() == before
+
+    print("✓ Suite run test passed")
+
+
+def test_large_comparison_needs_enough_courses():
+    """Test that route_compare_500 is only timed with a full 500-course group"""
+    names = list(get_course_table().names)
+    assert len(names) < LARGE_COMPARISON
+    assert "route_compare_500" not in build_benchmarks(names[:5], names)
+    assert "route_compare_500" in build_benchmarks(names[:5], (names * 10)[:LARGE_COMPARISON])
+
+    print("✓ Large comparison test passed")
+
+
+if __name__ == "__main__":
+    test_find_regressions()
+    test_run_suite_restores_catalogue()
+    test_large_comparison_needs_enough_courses()
@@ -0,0 +1,82 @@
+# test_catalogue_export.py
+# Tests for the streaming NDJSON / CSV catalogue export
+
+import csv
+import io
+import json
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import analyze_course
+from catalogue_export import (
+    export_records, ndjson_lines, csv_lines, parse_fields, EXPORT_FIELDS, FIRST_CHUNK, _chunks
+)
+from catalogue_stats import get_catalogue_stats
+from course_data import COURSE_DATA
+from course_table import split_course_name
+from roi_calculator import calculate_roi
+
+
+def test_records_match_calculate():
+    """Test exported records against calculate_roi, analyze_course and the course record"""
+    stats = get_catalogue_stats(2023)
+    rows = np.arange(stats.course_count)
+    lines = "".join(ndjson_lines(export_records(stats, rows))).splitlines()
+    assert len(lines) == len(COURSE_DATA)
+
+    for line in lines:
+        record = json.loads(line)
+        assert list(record) == EXPORT_FIELDS
+        name = record["course_name"]
+        expected = analyze_course(calculate_roi(name, tax_year=2023))
+        for key, value in expected.items():
+            if key != "analysis":
+                assert record[key] == value, (name, key)
+        analysis = expected["analysis"]
+        assert record["roi_rating"] == analysis["roi_rating"]
+        assert record["lifetime_profit"] == analysis["lifetime"]["profit"]
+        source = COURSE_DATA[name]
+        assert record["field"] == split_course_name(name)[0]
+        for key in ("employment_rate", "skills_demand", "avg_class_size", "industry_growth_rate"):
+            assert record[key] == source.get(key), (name, key)
+        employers = source.get("top_employers")
+        assert record["top_employers"] == (None if employers is None else list(employers))
+
+    print("✓ Export records test passed")
+
+
+def test_csv_and_field_selection():
+    """Test CSV output, chosen fields in order and list cells"""
+    stats = get_catalogue_stats()
+    fields = parse_fields("roi_5_years, course_name,top_employers,employment_rate")
+    rows = np.arange(stats.course_count)[::-1]
+    text = "".join(csv_lines(export_records(stats, rows, fields), fields))
+    reader = csv.DictReader(io.StringIO(text))
+    assert reader.fieldnames == fields
+    exported = list(reader)
+    assert [r["course_name"] for r in exported] == list(reversed(stats.columns.names))
+    first = exported[0]
+    assert float(first["roi_5_years"]) == calculate_roi(first["course_name"])["roi_5_years"]
+    assert first["top_employers"] == "; ".join(COURSE_DATA[first["course_name"]]["top_employers"])
+
+    # Chunks start small and cover every row once
+    sizes = [len(chunk) for chunk in _chunks(np.arange(1000))]
+    assert sizes[0] == FIRST_CHUNK and sum(sizes) == 1000
+
+    for text in ("roi_5_years,colour", "roi_5_years,roi_5_years"):
+        try:
+            parse_fields(text)
+            assert False, f"Expected ValueError for {text!r}"
+        except ValueError:
+            pass
+
+    print("✓ CSV export test passed")
+
+
+if __name__ == "__main__":
+    test_records_match_calculate()
+    test_csv_and_field_selection()
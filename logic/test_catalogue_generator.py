@@ -0,0 +1,81 @@
+# test_catalogue_generator.py
+# Tests for synthetic catalogue generation and NDJSON catalogue files
+
+import os
+import tempfile
+from itertools import islice
+
+from catalogue_generator import generate_courses
+from catalogue_file import write_catalogue, read_catalogue, load_catalogue
+from course_data import (
+    COURSE_RECORDS, get_course_table, install_course_table, validate_course_data
+)
+from course_table import CourseTable, RECORD_FIELDS, split_course_name
+
+
+def test_generation_is_deterministic():
+    """Test that a seed always produces the same courses, and seeds differ"""
+    first = list(generate_courses(200, seed=7))
+    assert first == list(generate_courses(200, seed=7))
+    assert first != list(generate_courses(200, seed=8))
+    assert list(islice(generate_courses(10**9, seed=7), 200)) == first
+
+    print("✓ Deterministic generation test passed")
+
+
+def test_generated_courses_are_realistic():
+    """Test schema, unique names and value ranges against the real catalogue"""
+    courses = dict(generate_courses(2000, seed=1))
+    assert len(courses) == 2000
+
+    real_fields = {split_course_name(n)[0] for n in COURSE_RECORDS}
+    real_universities = {r["university"] for r in COURSE_RECORDS.values()}
+    salaries = [r["starting_salary"] for r in COURSE_RECORDS.values()]
+
+    for name, record in courses.items():
+        assert set(record) <= set(RECORD_FIELDS), f"{name}: unknown fields"
+        assert split_course_name(name)[0] in real_fields
+        assert record["university"] in real_universities
+        assert 0.6 * min(salaries) < record["starting_salary"] < 1.5 * max(salaries)
+        assert record["salary_5_years"] >= record["starting_salary"]
+        assert 0 <= record.get("employment_rate", 100) <= 100
+
+    print("✓ Realistic generation test passed")
+
+
+def test_generated_catalogue_file_validates():
+    """Test streaming to disk, loading back and validate_course_data"""
+    original = get_course_table()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalogue.ndjson")
+        assert write_catalogue(path, generate_courses(500, seed=2)) == 500
+        assert dict(read_catalogue(path)) == dict(generate_courses(500, seed=2))
+
+        table = load_catalogue(path)
+        assert table.to_records() == CourseTable.from_records(dict(generate_courses(500, seed=2))).to_records()
+        try:
+            install_course_table(table)
+            assert validate_course_data()
+        finally:
+            install_course_table(CourseTable.from_records(original.to_records()))
+
+    print("✓ Catalogue file test passed")
+
+
+def test_duplicate_names_rejected():
+    """Test that a streamed catalogue cannot contain the same course twice"""
+    record = COURSE_RECORDS["Law - UCD"]
+    try:
+        CourseTable.from_items([("Law - UCD", record), ("Law - UCD", record)])
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+
+    print("✓ Duplicate name test passed")
+
+
+if __name__ == "__main__":
+    test_generation_is_deterministic()
+    test_generated_courses_are_realistic()
+    test_generated_catalogue_file_validates()
+    test_duplicate_names_rejected()
@@ -0,0 +1,107 @@
+# test_catalogue_snapshot.py
+# Tests for compiled, memory-mapped catalogue snapshots
+
+import os
+import tempfile
+
+from catalogue_snapshot import write_snapshot, open_snapshot, share_table, SHARED_MEMORY_DIR
+from catalogue_generator import generate_courses
+from course_data import COURSE_RECORDS
+from course_table import CourseTable
+
+
+def _round_trip(records):
+    table = CourseTable.from_records(records)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalogue.snap")
+        write_snapshot(table, path)
+        return table, open_snapshot(path, version=7)
+
+
+def test_snapshot_round_trip():
+    """Test that a mapped snapshot reads back exactly like the source table"""
+    table, mapped = _round_trip(COURSE_RECORDS)
+
+    assert mapped.version == 7
+    assert list(mapped.names) == list(table.names)
+    assert mapped.to_records() == COURSE_RECORDS
+    assert mapped.content_hash() == table.content_hash()
+    assert mapped.index("field").lookup("Engineering").tolist() == table.index("field").lookup("Engineering").tolist()
+    assert mapped.search_index().search("comp sci", 3) == table.search_index().search("comp sci", 3)
+
+    print("✓ Snapshot round trip test passed")
+
+
+def test_name_lookup():
+    """Test binary-search name lookups, including non-ASCII names"""
+    records = dict(generate_courses(300, seed=4))
+    records["Études Françaises - UCD"] = dict(COURSE_RECORDS["Law - UCD"])
+    records["Zoology - Ü"] = dict(COURSE_RECORDS["Law - UCD"])
+    table, mapped = _round_trip(records)
+
+    for row, name in enumerate(table.names):
+        assert mapped.row_of(name) == row
+    assert "Études Françaises - UCD" in mapped
+    assert mapped.row_of("Not A Course") is None
+    assert mapped.row_of("") is None
+    assert mapped.names[-1] == table.names[-1]
+
+    print("✓ Snapshot name lookup test passed")
+
+
+def test_large_vocabularies_and_extras():
+    """Test lazily decoded category values and fields outside the schema"""
+    records = dict(generate_courses(200, seed=5))
+    first = sorted(records)[0]
+    records[first]["accreditation"] = {"body": "Engineers Ireland", "years": [2020, 2025]}
+
+    import catalogue_snapshot
+    limit = catalogue_snapshot.EAGER_CATEGORY_LIMIT
+    catalogue_snapshot.EAGER_CATEGORY_LIMIT = 2
+    try:
+        table, mapped = _round_trip(records)
+    finally:
+        catalogue_snapshot.EAGER_CATEGORY_LIMIT = limit
+
+    assert mapped.to_records() == table.to_records()
+    assert mapped.record(first)["accreditation"] == records[first]["accreditation"]
+
+    print("✓ Snapshot vocabulary/extras test passed")
+
+
+def test_rejects_other_files():
+    """Test that a non-snapshot file raises ValueError"""
+    with tempfile.NamedTemporaryFile(suffix=".snap") as f:
+        f.write(b"{\"course\": \"Law - UCD\"}\n")
+        f.flush()
+        try:
+            open_snapshot(f.name)
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
+
+    print("✓ Snapshot format check test passed")
+
+
+def test_share_table():
+    """Test that a shared copy matches its source and leaves no file behind"""
+    table = CourseTable.from_records(COURSE_RECORDS, version=3)
+    directory = SHARED_MEMORY_DIR if os.path.isdir(SHARED_MEMORY_DIR) else tempfile.gettempdir()
+    before = set(os.listdir(directory))
+    shared = share_table(table)
+
+    assert shared.version == 3
+    assert shared.to_records() == COURSE_RECORDS
+    assert shared.content_hash() == table.content_hash()
+    assert not any(name.startswith("course-catalogue-")
+                   for name in set(os.listdir(directory)) - before)
+
+    print("✓ Shared table test passed")
+
+
+if __name__ == "__main__":
+    test_snapshot_round_trip()
+    test_name_lookup()
+    test_large_vocabularies_and_extras()
+    test_rejects_other_files()
+    test_share_table()
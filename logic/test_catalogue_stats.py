@@ -0,0 +1,72 @@
+# test_catalogue_stats.py
+# Tests for the cached catalogue statistics
+
+from roi_calculator import calculate_roi, get_available_courses
+from course_data import get_course_table, install_course_table, get_data_version
+from course_table import CourseTable
+from catalogue_stats import get_catalogue_stats
+
+
+def test_stats_match_full_scan():
+    """Test that cached averages equal a fresh scan of every course"""
+    rois = [calculate_roi(c)["roi_5_years"] for c in get_available_courses()]
+    paybacks = [calculate_roi(c)["payback_years"] for c in get_available_courses()]
+
+    stats = get_catalogue_stats()
+
+    assert stats.course_count == len(get_available_courses())
+    assert stats.average("roi_5_years") == sum(rois) / len(rois)
+    assert stats.average("payback_years") == sum(paybacks) / len(paybacks)
+    assert stats.minimum("roi_5_years") == min(rois)
+    assert stats.maximum("payback_years") == max(paybacks)
+    assert stats.sorted_values["roi_5_years"].tolist() == sorted(rois)
+
+    for course in get_available_courses():
+        assert repr(stats.result_for(course)) == repr(calculate_roi(course)), course
+    assert stats.result_for("Fake Course Name") is None
+
+    print("✓ Catalogue stats test passed")
+
+
+def test_stats_cached_until_data_changes():
+    """Test that stats are reused per version and rebuilt after a change"""
+    first = get_catalogue_stats()
+    assert get_catalogue_stats() is first, "Stats should be cached"
+
+    course = "Computer Science - UCD"
+    original_table = get_course_table()
+    records = original_table.to_records()
+    original_salary = records[course]["starting_salary"]
+    records[course]["starting_salary"] = original_salary * 2
+    try:
+        version = install_course_table(CourseTable.from_records(records))
+
+        rebuilt = get_catalogue_stats()
+        assert rebuilt is not first, "Stats should rebuild after a data change"
+        assert rebuilt.version == version == get_data_version()
+        assert rebuilt.result_for(course)["starting_salary"] == original_salary * 2
+    finally:
+        install_course_table(original_table)
+
+    assert get_catalogue_stats().result_for(course)["starting_salary"] == original_salary
+
+    print("✓ Stats invalidation test passed")
+
+
+def test_percentile_rank():
+    """Test percentile lookups against the sorted arrays"""
+    stats = get_catalogue_stats()
+    top = stats.maximum("roi_5_years")
+    bottom = stats.minimum("roi_5_years")
+
+    assert stats.percentile_rank("roi_5_years", top) == 100
+    assert stats.percentile_rank("roi_5_years", bottom - 1) == 0
+    assert stats.count_between("roi_5_years", bottom, top) == stats.course_count
+
+    print("✓ Percentile rank test passed")
+
+
+if __name__ == "__main__":
+    test_stats_match_full_scan()
+    test_stats_cached_until_data_changes()
+    test_percentile_rank()
@@ -0,0 +1,109 @@
+# test_catalogue_watcher.py
+# Tests for hot reload of the course catalogue
+
+import os
+import tempfile
+
+from catalogue_watcher import CatalogueWatcher
+from catalogue_file import write_catalogue
+from catalogue_generator import generate_courses
+from catalogue_stats import get_catalogue_stats
+from course_data import (
+    get_course_table, get_data_version, install_course_table, pin_course_table,
+    unpin_course_table
+)
+
+
+def _bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_swaps_catalogue():
+    """Test that a changed catalogue file is validated and installed"""
+    original = get_course_table()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalogue.ndjson")
+            write_catalogue(path, generate_courses(50, seed=1))
+            watcher = CatalogueWatcher("ndjson", path, interval=0)
+            assert not watcher.check(), "Unchanged file should not reload"
+
+            write_catalogue(path, generate_courses(80, seed=2))
+            _bump_mtime(path)
+            version = get_data_version()
+            assert watcher.check()
+
+            assert len(get_course_table()) == 80
+            assert get_data_version() == version + 1
+            assert get_catalogue_stats().version == version + 1
+            assert watcher.status()["reloads"] == 1
+            assert not watcher.check(), "Same file should not reload twice"
+    finally:
+        install_course_table(original)
+
+    print("✓ Reload swap test passed")
+
+
+def test_invalid_catalogue_is_rejected():
+    """Test that a broken or invalid file leaves the current catalogue in place"""
+    original = get_course_table()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalogue.ndjson")
+            write_catalogue(path, generate_courses(10, seed=3))
+            watcher = CatalogueWatcher("ndjson", path, interval=0)
+            version = get_data_version()
+
+            with open(path, "a") as f:
+                f.write("not json\n")
+            _bump_mtime(path)
+            assert not watcher.check()
+            assert get_course_table() is original
+            assert get_data_version() == version
+            assert "ValueError" in watcher.status()["last_error"]
+
+            bad = dict(generate_courses(10, seed=3))
+            next(iter(bad.values()))["starting_salary"] = 0
+            write_catalogue(path, bad.items())
+            _bump_mtime(path)
+            assert not watcher.check()
+            assert get_course_table() is original
+            assert watcher.status()["failures"] == 2
+    finally:
+        install_course_table(original)
+
+    print("✓ Invalid catalogue test passed")
+
+
+def test_pinned_readers_keep_old_catalogue():
+    """Test that a reader pinned before a swap sees the old table and version throughout"""
+    original = get_course_table()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalogue.ndjson")
+            write_catalogue(path, generate_courses(20, seed=5))
+            watcher = CatalogueWatcher("ndjson", path, interval=0)
+
+            token = pin_course_table()
+            version = get_data_version()
+            try:
+                assert watcher.reload()
+                assert get_course_table() is original
+                assert get_data_version() == version
+                assert get_catalogue_stats().version == version
+            finally:
+                unpin_course_table(token)
+
+            assert len(get_course_table()) == 20
+            assert get_data_version() == version + 1
+    finally:
+        install_course_table(original)
+
+    print("✓ Pinned reader test passed")
+
+
+if __name__ == "__main__":
+    test_reload_swaps_catalogue()
+    test_invalid_catalogue_is_rejected()
+    test_pinned_readers_keep_old_catalogue()
@@ -0,0 +1,58 @@
+# test_course_comparison.py
+# Tests for the many-course comparison helpers
+
+import random
+
+from course_comparison import resolve_courses, select_courses, metric_winners, non_dominated
+from rankings import get_rankings, RANK_METRICS
+from catalogue_generator import generate_courses
+from course_table import CourseTable, split_course_name
+from course_data import get_course_table, install_course_table
+from test_rankings import results_with_records
+
+
+def test_winners_match_plain_max():
+    """Test every metric's winner against max()/min() over plain results, ties to the first listed"""
+    original = get_course_table()
+    try:
+        install_course_table(CourseTable.from_items(generate_courses(2000, seed=17)))
+        table = get_course_table()
+        results = {r["course_name"]: r for r in results_with_records()}
+        rng = random.Random(3)
+        for size in (2, 7, 300):
+            names = rng.sample(table.names, size)
+            rows, errors = resolve_courses(names + [names[0], "No Such Course"], table)
+            assert [table.names[row] for row in rows] == names
+            assert [e["course"] for e in errors] == ["No Such Course"]
+
+            winners = metric_winners(get_rankings(), rows)
+            for metric, direction in RANK_METRICS.items():
+                valued = [n for n in names if results[n][metric] is not None]
+                pick = max if direction == "desc" else min
+                expected = pick(valued, key=lambda n: results[n][metric]) if valued else None
+                assert (table.names[winners[metric]] if winners[metric] is not None else None) == expected, metric
+
+            frontier = {table.names[row] for row in non_dominated(get_rankings(), rows)}
+            for name in names:
+                r = results[name]
+                beaten = any(results[o]["roi_5_years"] >= r["roi_5_years"] and
+                             results[o]["payback_years"] <= r["payback_years"] and
+                             results[o]["total_cost"] <= r["total_cost"] and
+                             results[o]["starting_salary"] >= r["starting_salary"] and
+                             any(results[o][m] != r[m] for m in
+                                 ("roi_5_years", "payback_years", "total_cost", "starting_salary"))
+                             for o in names)
+                assert (name in frontier) == (not beaten), name
+
+        code = split_course_name(table.names[0])[2]
+        selected = select_courses(university=code)
+        assert [table.names[row] for row in selected] == \
+            [n for n in table.names if split_course_name(n)[2] == code]
+    finally:
+        install_course_table(original)
+
+    print("✓ Comparison winners test passed")
+
+
+if __name__ == "__main__":
+    test_winners_match_plain_max()
@@ -0,0 +1,84 @@
+# test_course_query.py
+# Tests for the bitmap / sorted-array course query engine
+
+from course_query import query_rows, get_category_bitmaps
+from course_table import CourseTable, split_course_name
+from course_data import COURSE_DATA, get_course_table, install_course_table
+from catalogue_generator import generate_courses
+from test_rankings import results_with_records, sorted_reference
+
+
+def brute_force(results, categories, ranges, sort, descending):
+    """Filter and sort the plain results one course at a time"""
+    def matches(result):
+        record = COURSE_DATA[result["course_name"]]
+        field, _, code = split_course_name(result["course_name"])
+        values = {"university": {code.lower(), record["university"].lower()}, "field": {field.lower()}}
+        for name, wanted in categories.items():
+            have = values.get(name, {str(record.get(name)).lower()})
+            if not have & {w.lower() for w in wanted}:
+                return False
+        for metric, (low, high) in ranges.items():
+            value = result[metric]
+            if value is None or (low is not None and value < low) or (high is not None and value > high):
+                return False
+        return True
+
+    selected = [r for r in results if matches(r)]
+    if sort == "name":
+        selected.sort(key=lambda r: r["course_name"], reverse=descending)
+    else:
+        selected = sorted_reference(selected, sort, descending)
+    return [r["course_name"] for r in selected]
+
+
+def test_query_matches_brute_force():
+    """Test category, range, sort and paging combinations against a plain filter"""
+    original = get_course_table()
+    try:
+        install_course_table(CourseTable.from_items(generate_courses(3000, seed=9)))
+        results = results_with_records()
+        code = split_course_name(results[0]["course_name"])[2]
+        queries = [
+            ({}, {}, "roi_5_years", True),
+            ({"university": [code]}, {}, "payback_years", False),
+            ({"skills_demand": ["Very High", "high"]}, {"starting_salary": (33000, None)}, "name", False),
+            ({"remote_work_availability": ["Low"]}, {"employment_rate": (90, 95)}, "lifetime_roi", True),
+            ({}, {"avg_class_size": (None, 60)}, "avg_class_size", False),
+            ({}, {"roi_5_years": (400, 450), "payback_years": (None, 1.2)}, "name", True),
+            ({"university": [code], "career_progression": ["Excellent"]}, {}, "total_cost", True),
+            ({"skills_demand": ["None Such"]}, {}, "roi_5_years", True),
+        ]
+        for categories, ranges, sort, descending in queries:
+            expected = brute_force(results, categories, ranges, sort, descending)
+            for offset, limit in [(0, 10), (3, 25), (len(expected) - 2, 50), (0, 5000)]:
+                rows, total, rankings = query_rows(categories, ranges, sort, descending,
+                                                   max(offset, 0), limit)
+                assert total == len(expected), (categories, ranges)
+                names = [rankings.stats.columns.names[row] for row in rows]
+                assert names == expected[max(offset, 0):max(offset, 0) + limit], \
+                    (categories, ranges, sort, offset)
+    finally:
+        install_course_table(original)
+
+    print("✓ Query vs brute force test passed")
+
+
+def test_partial_field_match():
+    """Test that a field with no exact match selects every field containing it"""
+    bitmaps = get_category_bitmaps()
+    rows, total, rankings = query_rows({"field": ["data"]}, sort="name", limit=100)
+    names = [rankings.stats.columns.names[row] for row in rows]
+    assert names and all("data" in split_course_name(name)[0].lower() for name in names)
+    assert total == len(names)
+
+    exact = query_rows({"field": ["Engineering"]}, limit=100)[1]
+    assert exact == sum(split_course_name(n)[0] == "Engineering" for n in COURSE_DATA)
+    assert not bitmaps.match("field", ["Astrology"]).any()
+
+    print("✓ Partial field match test passed")
+
+
+if __name__ == "__main__":
+    test_query_matches_brute_force()
+    test_partial_field_match()
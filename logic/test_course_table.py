@@ -0,0 +1,131 @@
+# test_course_table.py
+# Tests for the columnar CourseTable and the COURSE_DATA mapping view
+
+from course_data import (
+    COURSE_RECORDS, COURSE_DATA, get_course_table,
+    get_courses_by_field, get_courses_by_university, search_courses
+)
+from course_table import CourseTable
+
+
+def test_records_round_trip():
+    """Test that every course reads back exactly as it was written"""
+    table = CourseTable.from_records(COURSE_RECORDS)
+    assert table.to_records() == COURSE_RECORDS
+
+    for name, record in COURSE_RECORDS.items():
+        assert dict(COURSE_DATA[name]) == {
+            k: tuple(v) if isinstance(v, list) else v for k, v in record.items()
+        }, f"{name}: record differs"
+
+    print(f"✓ Round trip test passed for {len(table)} courses")
+
+
+def test_mapping_view():
+    """Test that COURSE_DATA behaves like the old read-only dict"""
+    assert len(COURSE_DATA) == len(COURSE_RECORDS)
+    assert list(COURSE_DATA) == sorted(COURSE_RECORDS)
+    assert "Computer Science - UCD" in COURSE_DATA
+    assert COURSE_DATA.get("Fake Course Name") is None
+
+    course = COURSE_DATA["Computer Science - UCD"]
+    assert course["starting_salary"] == 35000
+    assert isinstance(course["starting_salary"], int)
+    assert course.get("not_a_field") is None
+    assert course["startup_salary_range"] == {"min": 32000, "max": 39000}
+
+    try:
+        course["starting_salary"] = 1
+        assert False, "Course records should be read-only"
+    except TypeError:
+        pass
+
+    print("✓ Mapping view test passed")
+
+
+def test_categorical_columns_are_shared():
+    """Test that repeated text is stored once and rows hold codes"""
+    table = get_course_table()
+    universities = table.category_column("university")
+    assert len(universities.categories) < len(table)
+    assert sorted(universities.categories) == sorted({r["university"] for r in COURSE_RECORDS.values()})
+
+    fields = table.category_column("field")
+    row = table.row_of("Software Engineering - UL")
+    assert fields[row] == "Software Engineering"
+
+    print("✓ Categorical column test passed")
+
+
+def test_missing_values():
+    """Test that absent fields stay absent instead of turning into sentinels"""
+    records = {
+        "Test Course - TST": {
+            "university": "Test University",
+            "starting_salary": 30000,
+            "salary_5_years": 40000,
+            "growth_rate": 1.3,
+            "typical_tuition": 5000,
+            "course_length": 4,
+            "source": "Test"
+        }
+    }
+    table = CourseTable.from_records(records)
+    record = table.record("Test Course - TST")
+
+    assert "avg_class_size" not in record
+    assert record.get("graduate_satisfaction") is None
+    assert record.get("startup_salary_range") is None
+    assert dict(record) == records["Test Course - TST"]
+
+    print("✓ Missing values test passed")
+
+
+def test_field_index_exact_match():
+    """Test that field lookups no longer match on substrings of other fields"""
+    engineering = get_courses_by_field("Engineering")
+    assert engineering, "Expected Engineering courses"
+    assert all(c.startswith("Engineering - ") for c in engineering)
+    assert "Software Engineering - UL" not in engineering
+    assert get_courses_by_field("engineering") == engineering
+
+    # No field is literally called "Data", so partial matches are used
+    data = get_courses_by_field("Data")
+    assert data == sorted(c for c in COURSE_RECORDS if c.split(" - ")[0].startswith("Data"))
+
+    print("✓ Field index test passed")
+
+
+def test_university_index():
+    """Test university lookups by short code and by full name"""
+    by_code = get_courses_by_university("UCD")
+    by_name = get_courses_by_university("University College Dublin")
+    assert by_code == by_name
+    assert by_code == sorted(c for c, r in COURSE_RECORDS.items()
+                             if r["university"] == "University College Dublin")
+
+    dublin = get_courses_by_university("Dublin")
+    assert set(by_code) <= set(dublin)
+
+    print("✓ University index test passed")
+
+
+def test_search_matches_substring_scan():
+    """Test that indexed search finds everything the old name scan found"""
+    for query in ["data", "eng", "ucc", "Primary", "Science - U", "Medicine - "]:
+        scanned = [c for c in COURSE_RECORDS if query.strip().lower() in c.lower()]
+        assert set(scanned) <= set(search_courses(query)), f"Search for {query!r} lost results"
+
+    assert search_courses("Law - UCD") == ["Law - UCD"]
+
+    print("✓ Search index test passed")
+
+
+if __name__ == "__main__":
+    test_records_round_trip()
+    test_mapping_view()
+    test_categorical_columns_are_shared()
+    test_missing_values()
+    test_field_index_exact_match()
+    test_university_index()
+    test_search_matches_substring_scan()
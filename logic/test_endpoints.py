@@ -0,0 +1,446 @@
+# test_endpoints.py
+# Tests for the Flask API routes (run through the Flask test client)
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import app as web
+from app import (
+    app, result_cache, analyze_course, add_comparison_context, build_course_result, get_all_results_body
+)
+from course_data import COURSE_DATA, get_course_table, install_course_table
+from course_table import CourseTable
+from catalogue_generator import generate_courses
+from roi_calculator import calculate_roi
+from tax import TAX_YEARS, DEFAULT_TAX_YEAR
+
+client = app.test_client()
+
+
+def test_calculate_all_matches_calculate():
+    """Test that /calculate-all returns the same data as /calculate per course"""
+    response = client.get('/calculate-all')
+    assert response.status_code == 200
+
+    data = response.get_json()
+    assert data["success"]
+    assert data["total_courses"] == len(data["courses"])
+
+    for course in data["courses"]:
+        single = client.get('/calculate', query_string={'course': course["course_name"]})
+        assert single.get_json()["data"] == course, \
+            f"{course['course_name']}: bulk result differs from /calculate"
+    
+    # Batch-built body vs the per-course pipeline, on a larger catalogue
+    original = get_course_table()
+    try:
+        install_course_table(CourseTable.from_items(generate_courses(600, seed=31)))
+        body = json.loads(get_all_results_body(2023))
+        expected = [json.loads(app.json.dumps(build_course_result(name, tax_year=2023)))
+                    for name in get_course_table().names]
+        assert body["courses"] == expected
+        assert body["total_courses"] == 600
+    finally:
+        install_course_table(original)
+
+    print("✓ /calculate-all test passed")
+
+
+def test_suggestion_stays_in_field():
+    """Test that suggestions only come from the same field"""
+    data = client.get('/calculate', query_string={'course': 'Engineering - TCD'}).get_json()["data"]
+    suggestion = data["suggestion"]
+
+    assert suggestion["has_suggestion"]
+    assert "'Engineering - " in suggestion["text"], suggestion["text"]
+
+    print("✓ Suggestion field test passed")
+
+
+def test_autocomplete():
+    """Test /autocomplete ranking, limits and empty queries"""
+    data = client.get('/autocomplete', query_string={'q': 'comp sci', 'limit': 3}).get_json()
+    assert data["success"]
+    assert len(data["results"]) == 3
+    assert all(r["course"].startswith("Computer Science") for r in data["results"])
+
+    empty = client.get('/autocomplete', query_string={'q': ''}).get_json()
+    assert empty["results"] == []
+
+    print("✓ /autocomplete test passed")
+
+
+def test_lifetime_endpoint():
+    """Test /lifetime for one course, the whole catalogue and bad input"""
+    single = client.get('/lifetime', query_string={'course': 'Law - UCD'}).get_json()
+    calculated = client.get('/calculate', query_string={'course': 'Law - UCD'}).get_json()["data"]
+    assert single["data"]["lifetime"] == calculated["analysis"]["lifetime"]
+
+    shorter = client.get('/lifetime', query_string={'course': 'Law - UCD', 'start_age': 50}).get_json()
+    assert shorter["parameters"]["career_years"] == 16
+    assert shorter["data"]["lifetime"]["total_earnings"] < single["data"]["lifetime"]["total_earnings"]
+
+    everything = client.get('/lifetime', query_string={'growth': 0.03}).get_json()
+    by_name = {c["course_name"]: c["lifetime"] for c in everything["courses"]}
+    assert by_name["Law - UCD"] == single["data"]["lifetime"]
+
+    assert client.get('/lifetime', query_string={'growth': 3}).status_code == 400
+
+    print("✓ /lifetime test passed")
+
+
+def test_conditional_get():
+    """Test ETags, 304 responses and that a 304 skips the calculation"""
+    params = {'course': 'Medicine - UCD', 'tuition': 4321}
+    first = client.get('/calculate', query_string=params)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"]
+
+    lookups = result_cache.stats()["override"]
+    repeat = client.get('/calculate', query_string=params, headers={'If-None-Match': etag})
+    assert repeat.status_code == 304
+    assert repeat.headers["ETag"] == etag
+    after = result_cache.stats()["override"]
+    assert (after["hits"], after["misses"]) == (lookups["hits"], lookups["misses"])
+
+    other = client.get('/calculate', query_string={'course': 'Medicine - UCD'})
+    assert other.headers["ETag"] != etag
+
+    page = client.get('/quiz')
+    assert client.get('/quiz', headers={'If-None-Match': page.headers["ETag"]}).status_code == 304
+
+    # New data means new ETags, even for the same request
+    original = get_course_table()
+    records = original.to_records()
+    records['Medicine - UCD']['starting_salary'] += 1
+    try:
+        install_course_table(CourseTable.from_records(records))
+        changed = client.get('/calculate', query_string=params, headers={'If-None-Match': etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+    finally:
+        install_course_table(CourseTable.from_records(original.to_records()))
+
+    print("✓ Conditional GET test passed")
+
+
+def test_etag_follows_computation():
+    """Test that new tax tables or a formula change mean new ETags for the same data"""
+    params = {'course': 'Law - UCD'}
+    etag = client.get('/calculate', query_string=params).headers["ETag"]
+
+    rules = TAX_YEARS[DEFAULT_TAX_YEAR]
+    original_rate = rules["prsi_rate"]
+    rules["prsi_rate"] = original_rate + 0.001
+    try:
+        changed = client.get('/calculate', query_string=params, headers={'If-None-Match': etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+    finally:
+        rules["prsi_rate"] = original_rate
+    assert client.get('/calculate', query_string=params).headers["ETag"] == etag
+
+    original_version = web.FORMULA_VERSION
+    web.FORMULA_VERSION = original_version + 1
+    try:
+        assert client.get('/calculate', query_string=params, headers={'If-None-Match': etag}).status_code == 200
+    finally:
+        web.FORMULA_VERSION = original_version
+
+    print("✓ ETag computation version test passed")
+
+
+def test_simulate_endpoint():
+    """Test /simulate results, seeding and parameter errors"""
+    params = {'course': 'Nursing - UCD', 'draws': 5000, 'seed': 2, 'percentiles': '10,90'}
+    data = client.get('/simulate', query_string=params).get_json()
+    assert data["success"]
+    roi = data["data"]["roi_5_years"]
+    assert set(roi) == {"mean", "p10", "p90"}
+    assert roi["p10"] <= data["data"]["point_estimate"]["roi_5_years"] <= roi["p90"]
+    assert client.get('/simulate', query_string=params).get_json() == data
+
+    catalogue = client.get('/simulate', query_string={'draws': 500}).get_json()
+    assert catalogue["total_courses"] == len(get_course_table())
+
+    assert client.get('/simulate', query_string={'draws': 0}).status_code == 400
+    assert client.get('/simulate', query_string={'percentiles': 'x'}).status_code == 400
+    assert client.get('/simulate', query_string={'draws': 10 ** 6}).status_code == 400
+    assert client.get('/simulate', query_string={'course': 'Not A Course'}).status_code == 404
+
+    print("✓ /simulate test passed")
+
+
+def test_sensitivity_endpoint():
+    """Test that one /sensitivity grid replaces a sweep of /calculate calls"""
+    params = {'course': ['Law - UCD', 'Nursing - UCD'], 'tuition': '4000:8000:2000', 'years': '3,4'}
+    data = client.get('/sensitivity', query_string=params).get_json()
+    assert data["success"]
+    assert data["dimensions"] == ["course", "tuition", "years", "tax_rate", "salary_multiplier"]
+    assert [c["course_name"] for c in data["courses"]] == params['course']
+
+    for c, course in enumerate(params['course']):
+        for t, tuition in enumerate(data["axes"]["tuition"]):
+            for y, years in enumerate(data["axes"]["years"]):
+                single = client.get('/calculate', query_string={
+                    'course': course, 'tuition': tuition, 'years': years
+                }).get_json()["data"]
+                assert data["roi_5_years"][c][t][y][0][0] == single["roi_5_years"]
+                assert data["payback_years"][c][t][y][0][0] == single["payback_years"]
+
+    assert client.get('/sensitivity', query_string={'tax_rate': '2'}).status_code == 400
+    fractional = client.get('/sensitivity', query_string={'years': '3:5:0.5'})
+    assert fractional.status_code == 400 and "whole numbers" in fractional.get_json()["error"]
+    assert client.get('/sensitivity', query_string={'course': 'Not A Course'}).status_code == 404
+
+    print("✓ /sensitivity test passed")
+
+
+def test_tax_year_parameter():
+    """Test that tax_year selects the tables everywhere and unknown years are rejected"""
+    for tax_year in (2023, 2024):
+        single = client.get('/calculate', query_string={
+            'course': 'Nursing - UCD', 'tax_year': tax_year
+        }).get_json()["data"]
+        assert single["tax_year"] == tax_year
+        courses = client.get('/calculate-all', query_string={'tax_year': tax_year}).get_json()["courses"]
+        assert next(c for c in courses if c["course_name"] == 'Nursing - UCD') == single
+
+    default = client.get('/calculate', query_string={'course': 'Nursing - UCD'}).get_json()["data"]
+    assert default["tax_year"] == client.get('/api').get_json()["default_tax_year"]
+
+    for path in ('/calculate', '/calculate-all', '/sensitivity', '/simulate'):
+        params = {'course': 'Nursing - UCD', 'tax_year': 1999}
+        assert client.get(path, query_string=params).status_code == 400, path
+
+    print("✓ tax_year test passed")
+
+
+def test_rank_endpoint():
+    """Test that /rank pages follow on from each other and agree with /calculate"""
+    first = client.get('/rank', query_string={'metric': 'payback_years', 'limit': 4}).get_json()
+    assert first["success"] and first["order"] == "asc"
+    second = client.get('/rank', query_string={
+        'metric': 'payback_years', 'limit': 4, 'cursor': first["next_cursor"]
+    }).get_json()
+    ranked = first["courses"] + second["courses"]
+    assert [c["rank"] for c in ranked] == list(range(1, 9))
+    assert [c["payback_years"] for c in ranked] == sorted(c["payback_years"] for c in ranked)
+
+    course = ranked[0]
+    single = client.get('/calculate', query_string={'course': course["course_name"]}).get_json()["data"]
+    assert all(single[key] == value for key, value in course.items() if key != "rank")
+
+    within = client.get('/rank', query_string={'university': 'UCD', 'limit': 100}).get_json()
+    assert within["total_courses"] == len(within["courses"]) and within["next_cursor"] is None
+    assert all(c["university"] == "University College Dublin" for c in within["courses"])
+
+    assert client.get('/rank', query_string={'metric': 'name'}).status_code == 400
+    assert client.get('/rank', query_string={'limit': 0}).status_code == 400
+    assert client.get('/rank', query_string={'field': 'Astrology'}).status_code == 404
+
+    print("✓ /rank test passed")
+
+
+def test_query_endpoint():
+    """Test /query filters, paging and the analysis the Explore grid needs"""
+    params = {'university': ['UCD', 'TCD'], 'min_employment_rate': 90, 'sort': 'total_cost',
+              'order': 'asc', 'limit': 5}
+    first = client.get('/query', query_string=params).get_json()
+    assert first["success"] and first["filters"]["university"] == ['UCD', 'TCD']
+    assert first["filters"]["employment_rate"] == {"min": 90.0, "max": None}
+    second = client.get('/query', query_string={**params, 'cursor': first["next_cursor"]}).get_json()
+    courses = first["courses"] + second["courses"]
+    assert len({c["course_name"] for c in courses}) == len(courses)
+    assert [c["total_cost"] for c in courses] == sorted(c["total_cost"] for c in courses)
+    for course in courses:
+        assert course["course_name"].endswith((" - UCD", " - TCD"))
+        assert COURSE_DATA[course["course_name"]]["employment_rate"] >= 90
+        assert "roi_rating" in course["analysis"]
+
+    assert client.get('/query', query_string={'sort': 'colour'}).status_code == 400
+    assert client.get('/query', query_string={'cursor': 'x'}).status_code == 400
+    empty = client.get('/query', query_string={'field': 'Astrology'}).get_json()
+    assert empty["success"] and empty["total_courses"] == 0 and empty["next_cursor"] is None
+
+    print("✓ /query test passed")
+
+
+def test_field_chips():
+    """Test that the Explore field chips (field_match=contains) keep the old client-side matches"""
+    chips = ["Computer Science", "Engineering", "Business", "Law", "Medicine", "Data",
+             "Cybersecurity", "Artificial Intelligence"]
+    for chip in chips:
+        # The filter script.js applied before /query existed
+        expected = sorted(name for name in COURSE_DATA
+                          if chip in name.split(' - ')[0] or name.split(' - ')[0] in chip)
+        response = client.get('/query', query_string={'field': chip, 'field_match': 'contains',
+                                                        'sort': 'name', 'limit': 100}).get_json()
+        assert [c["course_name"] for c in response["courses"]] == expected, chip
+    counts = {chip: client.get('/query', query_string={'field': chip, 'field_match': 'contains'})
+              .get_json()["total_courses"] for chip in ("Business", "Engineering", "Medicine")}
+    assert counts == {"Business": 6, "Engineering": 7, "Medicine": 4}, counts
+    business = client.get('/query', query_string={'field': 'Business', 'field_match': 'contains'}).get_json()
+    assert {"Business/Finance - Maynooth", "Business Analytics - UL"} <= {c["course_name"] for c in business["courses"]}
+
+    # Two chips select either field; the default still prefers the exact field
+    both = client.get('/query', query_string=[('field', 'Medicine'), ('field', 'Law'),
+                                               ('field_match', 'contains')]).get_json()
+    law = client.get('/query', query_string={'field': 'Law', 'field_match': 'contains'}).get_json()
+    assert both["total_courses"] == 4 + law["total_courses"]
+    assert client.get('/query', query_string={'field': 'Medicine'}).get_json()["total_courses"] < 4
+    assert client.get('/query', query_string={'field_match': 'fuzzy'}).status_code == 400
+    assert client.get('/export.csv', query_string={'field_match': 'fuzzy'}).status_code == 400
+
+    print("✓ Field chip test passed")
+
+
+def test_pareto_endpoint():
+    """Test /pareto paging, metric values and errors, and the compare-multiple frontier"""
+    params = {'metrics': 'total_cost,roi_5_years,employment_rate', 'limit': 2}
+    first = client.get('/pareto', query_string=params).get_json()
+    assert first["success"] and first["frontier_size"] >= 2
+    assert [m["better"] for m in first["metrics"]] == ["lower", "higher", "higher"]
+    courses = list(first["courses"])
+    cursor = first["next_cursor"]
+    while cursor:
+        page = client.get('/pareto', query_string={**params, 'cursor': cursor}).get_json()
+        courses += page["courses"]
+        cursor = page["next_cursor"]
+    assert len(courses) == first["frontier_size"]
+    assert [c["total_cost"] for c in courses] == sorted(c["total_cost"] for c in courses)
+    for course in courses:
+        assert course["employment_rate"] == COURSE_DATA[course["course_name"]]["employment_rate"]
+        # No other course is at least as good on all three and better on one
+        for other in courses:
+            assert not (other["total_cost"] <= course["total_cost"] and
+                        other["roi_5_years"] >= course["roi_5_years"] and
+                        other["employment_rate"] >= course["employment_rate"] and
+                        other != course and
+                        (other["total_cost"], other["roi_5_years"], other["employment_rate"]) !=
+                        (course["total_cost"], course["roi_5_years"], course["employment_rate"]))
+
+    for bad in ({'metrics': 'roi_5_years'}, {'metrics': 'roi_5_years,colour'}, {'limit': 0},
+                {'cursor': 'x'}, {'tax_year': 1999}):
+        assert client.get('/pareto', query_string=bad).status_code == 400, bad
+
+    names = ["Computer Science - UCD", "Medicine - UCD", "Law - UCD"]
+    compared = client.post('/compare-multiple', json={"courses": names}).get_json()
+    assert compared["success"] and set(compared["non_dominated"]) <= set(names)
+    assert compared["winners"]["best_roi"] in compared["non_dominated"]
+
+    print("✓ /pareto test passed")
+
+
+def test_quiz_match_endpoint():
+    """Test /quiz/match answers, explanations and errors"""
+    params = {'goal': 'job-security', 'field': 'healthcare', 'budget': 8000, 'length': 5,
+              'location': 'cork-galway', 'work_style': 'hands-on', 'demand': 9, 'international': 'maybe'}
+    data = client.get('/quiz/match', query_string=params).get_json()
+    assert data["success"] and data["answers"]["budget"] == 8000
+    matches = data["matches"]
+    assert len(matches) == 5
+    assert [m["raw_score"] for m in matches] == sorted((m["raw_score"] for m in matches), reverse=True)
+    for match in matches:
+        assert "Matches healthcare interest" in match["reasons"]
+        assert match["university"] in ("University College Cork", "University of Galway")
+        assert match["employment_rate"] == COURSE_DATA[match["course_name"]]["employment_rate"]
+
+    more = client.get('/quiz/match', query_string={**params, 'limit': 8}).get_json()["matches"]
+    assert [m["course_name"] for m in more[:5]] == [m["course_name"] for m in matches]
+    for bad in ({**params, 'field': 'astrology'}, {**params, 'limit': 0},
+                {k: v for k, v in params.items() if k != 'goal'}):
+        assert client.get('/quiz/match', query_string=bad).status_code == 400, bad
+
+    print("✓ /quiz/match test passed")
+
+
+def test_compare_multiple_large():
+    """Test batch comparisons against the per-course pipeline, streaming and selection by university"""
+    names = sorted(COURSE_DATA)[:4]
+    compared = client.post('/compare-multiple', json={"courses": names}).get_json()
+    for result in compared["courses"]:
+        expected = add_comparison_context(analyze_course(calculate_roi(result["course_name"])))
+        course_data = result.pop("course_data")
+        assert result == expected
+        assert course_data["employment_rate"] == COURSE_DATA[result["course_name"]]["employment_rate"]
+
+    everything = client.post('/compare-multiple', json={"courses": sorted(COURSE_DATA)})
+    assert everything.is_streamed
+    data = everything.get_json()
+    assert data["total_compared"] == len(COURSE_DATA) == len(data["courses"])
+    best = max(data["courses"], key=lambda r: r["roi_5_years"])["course_name"]
+    assert data["winners"]["best_roi"] == data["metric_winners"]["roi_5_years"] == best
+
+    ucd = client.post('/compare-multiple', json={"university": "UCD", "tax_year": 2023}).get_json()
+    assert ucd["total_compared"] == sum(n.endswith(" - UCD") for n in COURSE_DATA)
+    assert all(r["tax_year"] == 2023 for r in ucd["courses"])
+
+    assert client.post('/compare-multiple', json={"courses": ["x"] * 1001}).status_code == 400
+    assert client.post('/compare-multiple', json={"field": "Astrology"}).status_code == 400
+    for bad in ({"university": 5}, {"university": ["UCD"]}, {"field": {"name": "Law"}}, ["Law - UCD"]):
+        response = client.post('/compare-multiple', json=bad)
+        assert response.status_code == 400, bad
+        assert response.get_json()["success"] is False
+
+    print("✓ Large /compare-multiple test passed")
+
+
+def test_export_endpoints():
+    """Test /export.ndjson and /export.csv streaming, filters and errors"""
+    response = client.get('/export.ndjson')
+    assert response.is_streamed and response.mimetype == 'application/x-ndjson'
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [r["course_name"] for r in records] == sorted(COURSE_DATA)
+
+    params = {'university': 'UCD', 'min_starting_salary': 35000, 'sort': 'roi_5_years',
+              'fields': 'course_name,roi_5_years'}
+    response = client.get('/export.csv', query_string=params)
+    assert 'attachment' in response.headers['Content-Disposition']
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == 'course_name,roi_5_years'
+    expected = sorted((r for r in records if r["university_code"] == "UCD" and r["starting_salary"] >= 35000),
+                      key=lambda r: -r["roi_5_years"])
+    assert [line.split(',')[0] for line in lines[1:]] == [r["course_name"] for r in expected]
+
+    for bad in ({'fields': 'colour'}, {'sort': 'colour'}, {'tax_year': 1999}):
+        assert client.get('/export.ndjson', query_string=bad).status_code == 400, bad
+
+    print("✓ /export test passed")
+
+
+
+def test_not_found_lists_endpoints():
+    """Test that 404 responses list every endpoint /api documents"""
+    response = client.get('/no-such-endpoint')
+    assert response.status_code == 404
+    listed = response.get_json()["available_endpoints"]
+    assert set(listed) == set(client.get('/api').get_json()["endpoints"])
+    for route in ('/simulate', '/sensitivity', '/rank', '/pareto', '/query', '/quiz/match',
+                  '/export.ndjson', '/export.csv'):
+        assert route in listed, route
+
+    print("✓ 404 endpoint list test passed")
+
+
+if __name__ == "__main__":
+    test_calculate_all_matches_calculate()
+    test_suggestion_stays_in_field()
+    test_autocomplete()
+    test_lifetime_endpoint()
+    test_conditional_get()
+    test_etag_follows_computation()
+    test_simulate_endpoint()
+    test_sensitivity_endpoint()
+    test_tax_year_parameter()
+    test_rank_endpoint()
+    test_query_endpoint()
+    test_field_chips()
+    test_pareto_endpoint()
+    test_quiz_match_endpoint()
+    test_compare_multiple_large()
+    test_export_endpoints()
+    test_not_found_lists_endpoints()
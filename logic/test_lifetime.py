@@ -0,0 +1,69 @@
+# test_lifetime.py
+# Tests for the closed-form lifetime projection
+
+import numpy as np
+
+from lifetime import project_lifetime, project_lifetime_batch, career_length
+from batch_calculator import get_course_columns
+
+
+def loop_lifetime(starting_salary, salary_5_years, career_years, growth):
+    """Year-by-year reference version of the projection"""
+    earnings = 0
+    for year in range(1, career_years + 1):
+        if year <= 5:
+            earnings += starting_salary + (salary_5_years - starting_salary) * (year - 1) / 4
+        else:
+            earnings += salary_5_years * (1 + growth) ** (year - 5)
+    return earnings
+
+
+def test_closed_form_matches_loop():
+    """Test the geometric-series form against a per-year loop"""
+    for career_years in [0, 1, 3, 5, 6, 30, 45]:
+        for growth in [0.0, 0.03, -0.02, 0.1]:
+            projection = project_lifetime(35000, 49000, 28000, career_years=career_years, growth=growth)
+            expected = loop_lifetime(35000, 49000, career_years, growth)
+            assert abs(projection["total_earnings"] - expected) < 1e-6 * max(1, expected), \
+                f"{career_years} years at {growth}: {projection['total_earnings']} != {expected}"
+
+    print("✓ Closed form test passed")
+
+
+def test_career_length_parameters():
+    """Test how career_years, start_age and retirement_age combine"""
+    assert career_length() == 30
+    assert career_length(career_years=20) == 20
+    assert career_length(start_age=22) == 44
+    assert career_length(career_years=30, start_age=50) == 16
+    assert career_length(start_age=70) == 0
+
+    print("✓ Career length test passed")
+
+
+def test_batch_matches_scalar():
+    """Test that the batch projection equals the scalar one for every course"""
+    columns = get_course_columns()
+    total_cost = columns.typical_tuition * columns.course_length
+    batch = project_lifetime_batch(
+        columns.starting_salary, columns.salary_5_years, total_cost,
+        career_years=35, growth=0.025
+    )
+
+    for i in range(len(columns)):
+        scalar = project_lifetime(
+            int(columns.starting_salary[i]), int(columns.salary_5_years[i]), int(total_cost[i]),
+            career_years=35, growth=0.025
+        )
+        for key in ["total_earnings", "profit", "roi", "times_earned_back"]:
+            assert batch[key][i] == scalar[key], f"{columns.names[i]}: {key} mismatch"
+
+    assert isinstance(batch["total_earnings"], np.ndarray)
+
+    print("✓ Batch lifetime test passed")
+
+
+if __name__ == "__main__":
+    test_closed_form_matches_loop()
+    test_career_length_parameters()
+    test_batch_matches_scalar()
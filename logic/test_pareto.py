@@ -0,0 +1,81 @@
+# test_pareto.py
+# Tests for the Pareto frontier (skyline) of courses
+
+import numpy as np
+
+from pareto import skyline, pareto_rows, parse_metrics, DEFAULT_PARETO_METRICS
+from rankings import RANK_METRICS
+from catalogue_generator import generate_courses
+from course_table import CourseTable
+from course_data import get_course_table, install_course_table
+from test_rankings import results_with_records, sorted_reference
+
+
+def brute_force_skyline(points):
+    """Indices of the rows no other row is <= on every column and < on one"""
+    points = [tuple(p) for p in points]
+    return [i for i, p in enumerate(points)
+            if not any(all(a <= b for a, b in zip(q, p)) and q != p for q in points)]
+
+
+def test_skyline_matches_brute_force():
+    """Test the sweep and block skylines, with ties and duplicates, against a pairwise check"""
+    rng = np.random.default_rng(3)
+    for metrics in range(1, 6):
+        for size in (1, 2, 40, 700, 2500):
+            # Few distinct values, so many ties and identical rows
+            for points in (rng.random((size, metrics)), rng.integers(0, 6, (size, metrics))):
+                expected = brute_force_skyline(points)
+                assert skyline(points).tolist() == expected, (metrics, size)
+    assert skyline(np.empty((0, 3))).tolist() == []
+
+    print("✓ Skyline vs brute force test passed")
+
+
+def test_pareto_rows_match_results():
+    """Test the catalogue frontier against comparing calculate_roi results pairwise"""
+    original = get_course_table()
+    try:
+        install_course_table(CourseTable.from_items(generate_courses(800, seed=12)))
+        results = results_with_records()
+        for metrics in (DEFAULT_PARETO_METRICS, ("roi_5_years", "total_cost"),
+                        ("avg_class_size", "graduate_satisfaction", "starting_salary")):
+            complete = [r for r in results if all(r[m] is not None for m in metrics)]
+            points = [[-r[m] if RANK_METRICS[m] == "desc" else r[m] for m in metrics] for r in complete]
+            frontier = [complete[i] for i in brute_force_skyline(points)]
+            expected = [r["course_name"] for r in sorted_reference(
+                frontier, metrics[0], RANK_METRICS[metrics[0]] == "desc")]
+
+            rows, considered = pareto_rows(metrics)
+            assert considered == len(complete), metrics
+            names = get_course_table().names
+            assert [names[row] for row in rows] == expected, metrics
+
+            # The frontier does not depend on the order metrics are given in
+            reordered, _ = pareto_rows(metrics[::-1])
+            assert sorted(reordered.tolist()) == sorted(rows.tolist())
+    finally:
+        install_course_table(original)
+
+    print("✓ Pareto rows test passed")
+
+
+def test_parse_metrics():
+    """Test metric list parsing and its errors"""
+    assert parse_metrics(None) == DEFAULT_PARETO_METRICS
+    assert parse_metrics(" total_cost, roi_5_years ") == ("total_cost", "roi_5_years")
+    for text in ("roi_5_years", "roi_5_years,roi_5_years", "roi_5_years,vibes",
+                 ",".join(list(RANK_METRICS)[:7])):
+        try:
+            parse_metrics(text)
+            assert False, f"Expected ValueError for {text!r}"
+        except ValueError:
+            pass
+
+    print("✓ Parse metrics test passed")
+
+
+if __name__ == "__main__":
+    test_skyline_matches_brute_force()
+    test_pareto_rows_match_results()
+    test_parse_metrics()
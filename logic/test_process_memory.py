@@ -0,0 +1,53 @@
+# test_process_memory.py
+# Tests for /proc memory reporting
+
+import os
+
+from process_memory import process_memory, child_pids, server_memory
+
+
+def test_process_memory():
+    """Test the memory breakdown of the current process"""
+    usage = process_memory()
+    if usage is None:
+        print("✓ Process memory test skipped (no /proc)")
+        return
+
+    assert usage["pid"] == os.getpid()
+    assert usage["rss_kb"] > 0
+    if "pss_kb" in usage:
+        assert usage["shared_kb"] + usage["private_kb"] == usage["rss_kb"]
+        assert usage["pss_kb"] <= usage["rss_kb"]
+    assert process_memory(2 ** 22 + 1) is None
+
+    print("✓ Process memory test passed")
+
+
+def test_server_memory_finds_children():
+    """Test that a forked child is reported as a worker"""
+    if process_memory() is None or not hasattr(os, "fork"):
+        print("✓ Server memory test skipped (no /proc)")
+        return
+
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(write_end)
+        os.read(read_end, 1)    # wait until the parent has looked
+        os._exit(0)
+    try:
+        os.close(read_end)
+        assert pid in child_pids(os.getpid())
+        report = server_memory(os.getpid())
+        assert pid in [w["pid"] for w in report["workers"]]
+        assert report["total"]["rss_kb"] >= report["master"]["rss_kb"]
+    finally:
+        os.close(write_end)
+        os.waitpid(pid, 0)
+
+    print("✓ Server memory test passed")
+
+
+if __name__ == "__main__":
+    test_process_memory()
+    test_server_memory_finds_children()
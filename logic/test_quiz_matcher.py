@@ -0,0 +1,159 @@
+# test_quiz_matcher.py
+# Tests for the server-side quiz matcher
+
+import random
+
+from quiz_matcher import (
+    quiz_matches, parse_answers, get_quiz_index, QUIZ_QUESTIONS, FIELD_KEYWORDS, LOCATION_KEYWORDS,
+    HIGH_DEMAND
+)
+from catalogue_generator import generate_courses
+from course_table import CourseTable
+from course_data import COURSE_DATA, get_course_table, install_course_table
+from roi_calculator import calculate_roi
+
+
+def reference_score(name, answers):
+    """The quiz page's original per-course scoring, one course at a time"""
+    record = COURSE_DATA[name]
+    result = calculate_roi(name)
+    text = name.lower()
+    university = record["university"]
+
+    def at_least(key, threshold):
+        return record.get(key) is not None and record[key] >= threshold
+
+    score = 50 if any(w in text for w in FIELD_KEYWORDS[answers["field"]]) else -200
+    if answers["location"] == "no-preference":
+        score += 25
+    else:
+        score += 50 if any(w in university for w in LOCATION_KEYWORDS[answers["location"]]) else -100
+
+    goal = answers["goal"]
+    if goal == "high-salary" and result["roi_5_years"] > 350:
+        score += 3
+    elif goal == "job-security" and at_least("job_security", 4.5):
+        score += 3
+    elif goal == "balance" and at_least("work_life_balance", 3.7):
+        score += 3
+    elif goal == "passion":
+        score += 3 if at_least("graduate_satisfaction", 4.2) else 1
+
+    budget = answers["budget"]
+    score += 2 if result["tuition_per_year"] <= budget else 1 if result["tuition_per_year"] <= budget * 1.2 else 0
+    length = answers["length"]
+    score += 2 if result["course_length"] <= length else 1 if result["course_length"] == length + 1 else 0
+
+    remote = record.get("remote_work_availability")
+    if answers["work_style"] == "remote" and remote == "High":
+        score += 2
+    elif answers["work_style"] == "hands-on" and remote == "Low":
+        score += 2
+    elif answers["work_style"] == "hybrid":
+        score += 1
+
+    if answers["demand"] >= HIGH_DEMAND and record.get("skills_demand") == "Very High":
+        score += 1
+    if answers["international"] == "yes" and record.get("international_opportunities") == "Excellent":
+        score += 1
+    return score
+
+
+def random_answers(rng):
+    return {question: rng.choice(options) for question, options in QUIZ_QUESTIONS.items()}
+
+
+def check_against_reference(answers, limit):
+    names = get_course_table().names
+    scored = sorted(((-reference_score(name, answers), name) for name in names))
+    expected = [(name, -score) for score, name in scored[:limit]]
+    matches = quiz_matches(answers, limit)
+    assert [(m["course_name"], m["raw_score"]) for m in matches] == expected, answers
+    for match in matches:
+        assert match["match_score"] == max(0, min(100, match["raw_score"]))
+        assert sum(match["breakdown"].values()) == match["raw_score"]
+        assert match["reasons"]
+
+
+def test_matches_reference_scoring():
+    """Test the grouped scores and top matches against scoring every course directly"""
+    rng = random.Random(5)
+    for _ in range(60):
+        check_against_reference(random_answers(rng), rng.choice((1, 5, 12)))
+
+    original = get_course_table()
+    try:
+        install_course_table(CourseTable.from_items(generate_courses(1500, seed=21)))
+        for _ in range(40):
+            check_against_reference(random_answers(rng), rng.choice((5, 20)))
+    finally:
+        install_course_table(original)
+
+    print("✓ Quiz vs reference scoring test passed")
+
+
+def test_lookup_table_matches_live_scoring():
+    """Test that the precomputed table gives the same matches as scoring on request"""
+    index = get_quiz_index()
+    rng = random.Random(8)
+    answer_sets = [random_answers(rng) for _ in range(50)]
+    live = [index.match(answers)[0].tolist() for answers in answer_sets]
+    assert index.warm()
+    assert [index.match(answers)[0].tolist() for answers in answer_sets] == live
+
+    reasons = quiz_matches(parse_answers({"goal": "high-salary", "field": "technology", "length": "4",
+                                          "location": "dublin", "work_style": "remote",
+                                          "international": "yes"}))[0]["reasons"]
+    assert reasons[:2] == ["Matches tech interest", "Dublin location"]
+
+    print("✓ Lookup table test passed")
+
+
+def test_keywords_in_middle_of_name():
+    """Test that field keywords count in the middle part of a three-part course name"""
+    original = get_course_table()
+    record = dict(COURSE_DATA["Law - UCD"])
+    try:
+        install_course_table(CourseTable.from_items([
+            ("History - with Business 12 - UCD", record),
+            ("History - UCD", dict(record))
+        ]))
+        answers = parse_answers({"goal": "balance", "field": "business", "length": "4",
+                                 "location": "dublin", "work_style": "hybrid", "international": "no"})
+        matches = quiz_matches(answers, 2)
+        assert [m["course_name"] for m in matches] == ["History - with Business 12 - UCD", "History - UCD"]
+        assert [m["breakdown"]["field"] for m in matches] == [50, -200]
+        assert matches[0]["reasons"][0] == "Matches business interest"
+    finally:
+        install_course_table(original)
+
+    print("✓ Three-part name test passed")
+
+
+def test_parse_answers():
+    """Test slider defaults, budget rounding and rejected answers"""
+    base = {"goal": "Balance", "field": "other", "length": "5", "location": "other",
+            "work_style": "hybrid", "international": "no"}
+    answers = parse_answers(base)
+    assert answers["goal"] == "balance" and answers["length"] == 5
+    assert answers["budget"] == 10000 and answers["demand"] == 7
+    assert parse_answers({**base, "budget": "12499"})["budget"] == 12000
+    assert parse_answers({**base, "budget": "90000"})["budget"] == 35000
+
+    for bad in ({**base, "goal": "fame"}, {**base, "length": "3"}, {**base, "demand": "11"},
+                {**base, "budget": "lots"}, {**base, "budget": "nan"},
+                {k: v for k, v in base.items() if k != "field"}):
+        try:
+            parse_answers(bad)
+            assert False, f"Expected ValueError for {bad}"
+        except ValueError:
+            pass
+
+    print("✓ Parse answers test passed")
+
+
+if __name__ == "__main__":
+    test_matches_reference_scoring()
+    test_lookup_table_matches_live_scoring()
+    test_keywords_in_middle_of_name()
+    test_parse_answers()
@@ -0,0 +1,108 @@
+# test_rankings.py
+# Tests for the presorted ranking indexes
+
+from rankings import get_rankings, encode_cursor, decode_cursor, RANK_METRICS
+from roi_calculator import calculate_roi, get_top_roi_courses, get_fastest_payback_courses
+from catalogue_generator import generate_courses
+from course_table import CourseTable, split_course_name
+from course_data import COURSE_DATA, get_course_table, get_data_version, install_course_table
+
+
+def sorted_reference(results, metric, descending):
+    """Plain sort of results, ties in course-name order and missing values last"""
+    ordered = sorted(results, key=lambda r: r["course_name"])
+    return sorted(ordered, key=lambda r: (r[metric] is None,
+                                          0 if r[metric] is None else -r[metric] if descending else r[metric]))
+
+
+def results_with_records():
+    """calculate_roi results plus the record fields that can be ranked"""
+    results = []
+    for name in get_course_table().names:
+        result = calculate_roi(name)
+        for metric in RANK_METRICS:
+            result.setdefault(metric, COURSE_DATA[name].get(metric))
+        results.append(result)
+    return results
+
+
+def test_rankings_match_sort():
+    """Test every metric, both directions and the filters against sorting calculate_roi results"""
+    original = get_course_table()
+    try:
+        install_course_table(CourseTable.from_items(generate_courses(600, seed=4)))
+        rankings = get_rankings()
+        results = results_with_records()
+
+        for metric in RANK_METRICS:
+            for descending in (False, True):
+                expected = [r["course_name"] for r in sorted_reference(results, metric, descending)]
+                rows, total = rankings.page(metric, descending, offset=0, limit=len(results))
+                assert total == len(results)
+                assert [rankings.stats.columns.names[row] for row in rows] == expected, metric
+
+                # Pages join up into the whole ranking
+                pages = []
+                for offset in range(0, len(results), 70):
+                    rows, _ = rankings.page(metric, descending, offset=offset, limit=70)
+                    pages.extend(rankings.stats.columns.names[row] for row in rows)
+                assert pages == expected
+
+        # Within a university, a field and both, matched by code or full name
+        sample = results[17]
+        field, _, code = split_course_name(sample["course_name"])
+        for filters in ({"university": code}, {"university": sample["university"].upper()},
+                        {"field": field}, {"university": code, "field": field}):
+            def matches(result):
+                result_field, _, result_code = split_course_name(result["course_name"])
+                return (("university" not in filters or result_code == code) and
+                        ("field" not in filters or result_field == field))
+            expected = [r["course_name"] for r in sorted_reference(
+                [r for r in results if matches(r)], "roi_5_years", True)]
+            rows, total = rankings.page("roi_5_years", filters=filters, offset=1, limit=5)
+            assert total == len(expected), filters
+            assert [r["course_name"] for r in rankings.results(rows)] == expected[1:6], filters
+
+        try:
+            rankings.page("roi_5_years", filters={"field": "Not A Field"})
+            assert False, "Expected LookupError for an unknown field"
+        except LookupError:
+            pass
+    finally:
+        install_course_table(original)
+
+    print("✓ Rankings vs sort test passed")
+
+
+def test_top_lists_unchanged():
+    """Test that the top-k helpers return the same lists as a full sort"""
+    results = [calculate_roi(name) for name in get_course_table().names]
+    expected = [r["course_name"] for r in sorted_reference(results, "roi_5_years", True)[:10]]
+    assert [r["course_name"] for r in get_top_roi_courses(10)] == expected
+    expected = [r["course_name"] for r in sorted_reference(results, "payback_years", False)[:5]]
+    top = get_fastest_payback_courses(5)
+    assert [r["course_name"] for r in top] == expected
+    assert top[0] == calculate_roi(top[0]["course_name"])
+
+    print("✓ Top lists test passed")
+
+
+def test_cursor_round_trip():
+    """Test cursors decode to their offset and are rejected after a data change"""
+    version = get_data_version()
+    assert decode_cursor(encode_cursor(version, 40), version) == 40
+    for cursor, cursor_version in [(encode_cursor(version - 1, 40), version), ("%%%", version),
+                                   (encode_cursor(version, -1), version)]:
+        try:
+            decode_cursor(cursor, cursor_version)
+            assert False, f"Expected ValueError for cursor {cursor!r}"
+        except ValueError:
+            pass
+
+    print("✓ Cursor test passed")
+
+
+if __name__ == "__main__":
+    test_rankings_match_sort()
+    test_top_lists_unchanged()
+    test_cursor_round_trip()
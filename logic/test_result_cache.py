@@ -0,0 +1,86 @@
+# test_result_cache.py
+# Tests for the bounded /calculate result cache
+
+from course_data import mark_data_changed
+from result_cache import LRUCache, ResultCache
+
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first"""
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1        # "b" is now least recent
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+    assert len(cache) == 2
+
+    print("✓ LRU eviction test passed")
+
+
+def test_separate_budgets():
+    """Test that override lookups cannot push out default results"""
+    cache = ResultCache(default_budget=2, override_budget=2)
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return {"value": value}
+
+    cache.get_or_compute("Law - UCD", None, None, lambda: compute("default"))
+    for tuition in range(5):
+        cache.get_or_compute("Law - UCD", float(tuition), None, lambda: compute(tuition))
+
+    result = cache.get_or_compute("Law - UCD", None, None, lambda: compute("again"))
+    assert result == {"value": "default"}
+    assert calls.count("again") == 0
+    assert cache.contains("Law - UCD", None, None) and cache.contains("Law - UCD", 4.0, None)
+    assert not cache.contains("Law - UCD", 0.0, None)
+
+    stats = cache.stats()
+    assert stats["default"]["hits"] == 1
+    assert stats["override"]["evictions"] == 3
+
+    print("✓ Separate budgets test passed")
+
+
+def test_invalidated_on_data_change():
+    """Test that a data version change empties the cache"""
+    cache = ResultCache()
+    cache.get_or_compute("Law - UCD", None, None, lambda: {"value": 1})
+    mark_data_changed()
+    assert not cache.contains("Law - UCD", None, None)
+
+    result = cache.get_or_compute("Law - UCD", None, None, lambda: {"value": 2})
+    assert result == {"value": 2}
+    assert cache.stats()["invalidations"] == 1
+
+    print("✓ Cache invalidation test passed")
+
+
+def test_errors_are_not_cached():
+    """Test that a failing computation is retried on the next lookup"""
+    cache = ResultCache()
+
+    def fail():
+        raise ValueError("Course not found")
+
+    for _ in range(2):
+        try:
+            cache.get_or_compute("Fake - XYZ", None, None, fail)
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
+    assert cache.stats()["default"]["size"] == 0
+
+    print("✓ Error caching test passed")
+
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_separate_budgets()
+    test_invalidated_on_data_change()
+    test_errors_are_not_cached()
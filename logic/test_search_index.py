@@ -0,0 +1,64 @@
+# test_search_index.py
+# Tests for ranked search and autocomplete
+
+from course_data import get_course_table
+from search_index import PrefixTrie
+
+
+def search(query, limit=10):
+    return get_course_table().search_index().search(query, limit=limit)
+
+
+def test_prefix_trie():
+    """Test that completions come back shortest first and are bounded"""
+    trie = PrefixTrie()
+    for term in ["engineer", "engineering", "english", "economics"]:
+        trie.add(term)
+
+    assert trie.complete("eng") == ["english", "engineer", "engineering"]
+    assert trie.complete("eng", limit=1) == ["english"]
+    assert trie.complete("xyz") == []
+
+    print("✓ Prefix trie test passed")
+
+
+def test_name_matches_rank_first():
+    """Test that course-name matches outrank role or employer matches"""
+    results = search("software")
+    assert results[0]["course"] == "Software Engineering - UL"
+    assert "name" in results[0]["matched_on"]
+    scores = [r["score"] for r in results]
+    assert scores == sorted(scores, reverse=True), "Results should be ranked by score"
+
+    print("✓ Name ranking test passed")
+
+
+def test_every_word_must_match():
+    """Test that multi-word queries narrow the results"""
+    results = search("nursing galway")
+    assert [r["course"] for r in results] == ["Nursing - Galway"]
+
+    both = {r["course"] for r in search("computer science", limit=None)}
+    assert {"Computer Science - UCD", "Computer Science - TCD"} <= both
+    assert "Law - UCD" not in both
+
+    print("✓ Multi-word search test passed")
+
+
+def test_roles_employers_and_typos():
+    """Test matches on typical roles, top employers and misspellings"""
+    google = {r["course"] for r in search("google", limit=None)}
+    assert "Computer Science - UCD" in google
+    assert all("employers" in r["matched_on"] for r in search("google", limit=None))
+
+    assert search("cybersecurty")[0]["course"] == "Cybersecurity - UCD"
+    assert "roles" in search("pharmacist")[0]["matched_on"]
+
+    print("✓ Roles, employers and typo test passed")
+
+
+if __name__ == "__main__":
+    test_prefix_trie()
+    test_name_matches_rank_first()
+    test_every_word_must_match()
+    test_roles_employers_and_typos()
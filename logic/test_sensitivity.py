@@ -0,0 +1,80 @@
+# test_sensitivity.py
+# Tests for the tuition x length x tax x salary sensitivity grid
+
+import numpy as np
+
+from sensitivity import sensitivity_grid, parse_axis, MAX_CELLS
+from roi_calculator import calculate_roi
+from batch_calculator import get_course_columns
+from course_data import COURSE_RECORDS
+
+
+def test_grid_matches_calculate_roi():
+    """Test that the tax-table, 1.0-multiplier cells equal calculate_roi with overrides"""
+    courses = ["Law - UCD", "Medicine - UCD", "Nursing - UCD"]
+    rows = get_course_columns().rows_for(courses)
+    tuition = parse_axis("tuition", "2500:12500:2500")
+    years = parse_axis("years", "3,4,5")
+    for tax_year in (2023, 2025):
+        grid = sensitivity_grid(rows, tuition=tuition, years=years,
+                                salary_multiplier=[0.9, 1.0], tax_year=tax_year)
+        assert grid["roi_5_years"].shape == (3, 5, 3, 1, 2)
+
+        for c, course in enumerate(courses):
+            for t, tuition_value in enumerate(tuition):
+                for y, length in enumerate(years):
+                    expected = calculate_roi(course, tuition_value, length, tax_year)
+                    assert grid["roi_5_years"][c, t, y, 0, 1] == expected["roi_5_years"]
+                    assert grid["payback_years"][c, t, y, 0, 1] == expected["payback_years"]
+
+    # With flat rates, lower tax and higher salaries can only improve the outcome
+    grid = sensitivity_grid(rows, tuition=tuition, years=years,
+                            tax_rate=[0.2, 0.25], salary_multiplier=[0.9, 1.0])
+    roi = grid["roi_5_years"]
+    assert (roi[:, :, :, 0, :] >= roi[:, :, :, 1, :]).all()
+    assert (roi[:, :, :, :, 1] >= roi[:, :, :, :, 0]).all()
+
+    print("✓ Grid vs calculate_roi test passed")
+
+
+def test_default_axes():
+    """Test that omitted axes use each course's own tuition and length"""
+    columns = get_course_columns()
+    grid = sensitivity_grid(np.arange(len(columns)))
+    assert grid["roi_5_years"].shape == (len(COURSE_RECORDS), 1, 1, 1, 1)
+    for row, course in enumerate(columns.names):
+        assert grid["roi_5_years"][row].item() == calculate_roi(course)["roi_5_years"]
+
+    print("✓ Default axes test passed")
+
+
+def test_parse_axis():
+    """Test list and range syntax, and rejected input"""
+    assert parse_axis("tax_rate", "0.1:0.4:0.1") == [0.1, 0.2, 0.3, 0.4]
+    assert parse_axis("years", "3,4") == [3, 4]
+    assert parse_axis("years", "3:7:2") == [3, 5, 7]
+    assert parse_axis("tuition", "3000") == [3000.0]
+
+    for name, text in [("years", "3.5"), ("tax_rate", "0.95"), ("tuition", "5:1:1"),
+                       ("tuition", "1:1000:1"), ("salary_multiplier", "x"), ("years", ""),
+                       ("years", "3:5:0.5"), ("years", "3.5:5:1"), ("years", "3:5.5:1")]:
+        try:
+            parse_axis(name, text)
+            assert False, f"Expected ValueError for {name}={text!r}"
+        except ValueError:
+            pass
+
+    try:
+        sensitivity_grid(np.arange(len(COURSE_RECORDS)), tuition=list(range(1, 101)),
+                         years=list(range(1, 11)), tax_rate=[0.25] * 100)
+        assert False, f"Expected ValueError above {MAX_CELLS} cells"
+    except ValueError:
+        pass
+
+    print("✓ Axis parsing test passed")
+
+
+if __name__ == "__main__":
+    test_grid_matches_calculate_roi()
+    test_default_axes()
+    test_parse_axis()
@@ -0,0 +1,78 @@
+# test_simulation.py
+# Tests for the Monte Carlo ROI simulation
+
+import numpy as np
+
+import simulation
+from simulation import simulate_course, simulate_rows, get_simulation_inputs, MAX_DRAWS
+from roi_calculator import calculate_roi
+from lifetime import growth_factor
+from course_data import COURSE_RECORDS
+
+
+def test_reproducible():
+    """Test that a seed fixes the results and a different seed changes them"""
+    first = simulate_course("Computer Science - UCD", draws=20000, seed=7)
+    assert first == simulate_course("Computer Science - UCD", draws=20000, seed=7)
+    assert first != simulate_course("Computer Science - UCD", draws=20000, seed=8)
+
+    # A course's result does not depend on what it is simulated with
+    rows = simulate_rows(range(5), draws=2000, seed=7)
+    alone = simulate_rows([3], draws=2000, seed=7)
+    assert rows[3] == alone[0]
+
+    print("✓ Reproducibility test passed")
+
+
+def test_ranges_cover_point_estimate():
+    """Test that every course's 5-95% range contains calculate_roi's figures"""
+    for result in simulate_rows(range(len(COURSE_RECORDS)), draws=20000, seed=1):
+        point = calculate_roi(result["course_name"])
+        for metric in ("roi_5_years", "lifetime_roi"):
+            summary = result[metric]
+            assert summary["p5"] <= summary["p50"] <= summary["p95"]
+            assert summary["p5"] <= point[metric] <= summary["p95"], \
+                f"{result['course_name']} {metric}: {point[metric]} outside {summary}"
+        assert 0 <= result["chance_of_loss"] <= 1
+
+    print("✓ Range coverage test passed")
+
+
+def test_process_pool_matches_serial():
+    """Test that spreading a run over processes gives identical results"""
+    chunk_courses = simulation.CHUNK_COURSES
+    simulation.CHUNK_COURSES = 8
+    try:
+        rows = range(len(get_simulation_inputs()))
+        serial = simulate_rows(rows, draws=1000, seed=3)
+        pooled = simulate_rows(rows, draws=1000, seed=3, processes=2)
+    finally:
+        simulation.CHUNK_COURSES = chunk_courses
+    assert pooled == serial
+
+    print("✓ Process pool test passed")
+
+
+def test_invalid_input():
+    """Test unknown courses and out-of-range draw counts"""
+    for kwargs in ({"course_name": "Not A Course"},
+                   {"course_name": "Law - UCD", "draws": 0},
+                   {"course_name": "Law - UCD", "draws": MAX_DRAWS + 1}):
+        try:
+            simulate_course(**kwargs)
+            assert False, f"Expected ValueError for {kwargs}"
+        except ValueError:
+            pass
+
+    # Array growth rates agree with the scalar formula
+    rates = np.array([-0.02, 0.0, 0.03])
+    assert np.allclose(growth_factor(rates, 25), [growth_factor(r, 25) for r in rates.tolist()])
+
+    print("✓ Invalid input test passed")
+
+
+if __name__ == "__main__":
+    test_reproducible()
+    test_ranges_cover_point_estimate()
+    test_process_pool_matches_serial()
+    test_invalid_input()
@@ -0,0 +1,73 @@
+# test_static_assets.py
+# Tests for the minify / compress / fingerprint asset pipeline
+
+import os
+import gzip
+
+from werkzeug.datastructures import Accept
+
+from static_assets import AssetPipeline, minify_css, minify_js, minify_html
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+def test_minify_js_keeps_template_literals():
+    """Test that template literal contents and regex literals survive"""
+    source = """
+    // A comment
+    function card(course) {
+        /* block
+           comment */
+        const safe = course.replace(/'/g, "\\\\'");
+        return `
+            <div>
+                // not a comment
+            </div>
+        `;
+    }
+    """
+    minified = minify_js(source)
+    assert "A comment" not in minified and "block" not in minified
+    assert "                // not a comment\n" in minified
+    assert "const safe = course.replace(/'/g, \"\\\\'\");" in minified
+
+    print("✓ JS minifier test passed")
+
+
+def test_minify_css_and_html():
+    """Test whitespace and comment removal in CSS and HTML"""
+    css = "/* header */\n.card > p ,\n.box {\n    font-family: 'Segoe  UI', sans-serif;\n    margin: 0 auto;\n}\n"
+    assert minify_css(css) == ".card>p,.box{font-family:'Segoe  UI',sans-serif;margin:0 auto}"
+
+    html = "<div>\n    <!-- note -->\n\n    <span>Hi</span>\n</div>"
+    assert minify_html(html) == "<div>\n<span>Hi</span>\n</div>"
+
+    print("✓ CSS/HTML minifier test passed")
+
+
+def test_pipeline_fingerprints_and_negotiates():
+    """Test fingerprinted links, compressed variants and encoding negotiation"""
+    assets = AssetPipeline(ROOT).build()
+    script = assets.get("script.js")
+    page = assets.get("index.html")
+
+    assert script.url.startswith("/assets/script.") and script.url.endswith(".js")
+    assert assets.by_url(script.url) is script
+    assert f'src="{script.url}"' in page.body.decode()
+    assert f'href="{assets.get("style.css").url}"' in page.body.decode()
+
+    encoding, body = script.negotiate(Accept([("gzip", 1)]))
+    assert encoding == "gzip"
+    assert gzip.decompress(body) == script.body
+    assert len(body) < len(script.body)
+
+    assert script.negotiate(Accept([]))[0] == "identity"
+    assert script.negotiate(Accept([("gzip", 0)]))[0] == "identity"
+
+    print("✓ Asset pipeline test passed")
+
+
+if __name__ == "__main__":
+    test_minify_js_keeps_template_literals()
+    test_minify_css_and_html()
+    test_pipeline_fingerprints_and_negotiates()
@@ -0,0 +1,79 @@
+# test_tax.py
+# Tests for the progressive tax engine
+
+import numpy as np
+
+from tax import (
+    TAX_YEARS, get_tax_table, net_income, net_earnings_5_years,
+    net_earnings_5_years_batch, resolve_tax_year, tax_breakdown
+)
+from roi_calculator import calculate_roi
+from batch_calculator import batch_results, calculate_roi_batch
+
+
+def test_table_matches_band_rules():
+    """Test the compiled tables against the band-by-band rules, including at the breakpoints"""
+    for tax_year in TAX_YEARS:
+        table = get_tax_table(tax_year)
+        salaries = sorted(set(list(range(0, 200001, 250)) + table.bounds +
+                              [b + 0.01 for b in table.bounds] + [b - 0.01 for b in table.bounds]))
+        for salary in salaries:
+            expected = tax_breakdown(salary, tax_year)["total"]
+            assert abs(table.deductions(salary) - expected) < 1e-6, \
+                f"{tax_year} at {salary}: {table.deductions(salary)} != {expected}"
+
+    # 2025: 35,000 pays 3,000 income tax, 596 USC and 1,443.75 PRSI
+    breakdown = tax_breakdown(35000, 2025)
+    assert round(breakdown["income_tax"], 2) == 3000
+    assert round(breakdown["usc"], 2) == 596.0
+    assert round(breakdown["prsi"], 2) == 1443.75
+
+    print("✓ Table vs band rules test passed")
+
+
+def test_batch_matches_scalar():
+    """Test that the vectorized paths give exactly the scalar floats"""
+    salaries = np.random.default_rng(0).uniform(0, 150000, 5000)
+    fives = salaries * 1.4
+    for tax_year in TAX_YEARS:
+        table = get_tax_table(tax_year)
+        batch = table.net_batch(salaries)
+        earnings = net_earnings_5_years_batch(salaries, fives, tax_year)
+        for i in range(0, len(salaries), 50):
+            assert batch[i] == table.net(salaries[i])
+            assert batch[i] == net_income(float(salaries[i]), tax_year)
+            assert earnings[i] == net_earnings_5_years(salaries[i], fives[i], tax_year)
+
+    print("✓ Batch vs scalar test passed")
+
+
+def test_tax_year_selection():
+    """Test year resolution and that scalar and batch ROI agree for each year"""
+    assert resolve_tax_year() == max(TAX_YEARS)
+    try:
+        resolve_tax_year(1999)
+        assert False, "Expected ValueError for an unknown tax year"
+    except ValueError:
+        pass
+
+    courses = ["Computer Science - UCD", "Medicine - UCD", "Nursing - UCD"]
+    for tax_year in TAX_YEARS:
+        batch = batch_results(calculate_roi_batch(tax_year=tax_year))
+        by_name = {result["course_name"]: result for result in batch}
+        for course in courses:
+            scalar = calculate_roi(course, tax_year=tax_year)
+            assert scalar["tax_year"] == tax_year
+            assert by_name[course] == scalar, f"{course} differs for {tax_year}"
+
+    # Income tax bands widened each year, so take-home pay only went up
+    older = calculate_roi("Computer Science - UCD", tax_year=2023)
+    newer = calculate_roi("Computer Science - UCD", tax_year=2025)
+    assert newer["annual_net_income"] > older["annual_net_income"]
+
+    print("✓ Tax year selection test passed")
+
+
+if __name__ == "__main__":
+    test_table_matches_band_rules()
+    test_batch_matches_scalar()
+    test_tax_year_selection()
@@ -1,6 +1,5 @@
 // Global variables
 let allCourses = [];
-let allCoursesData = [];
 let salaryChartInstance = null;
 let investmentChartInstance = null;
 let comparisonChartInstance = null;
@@ -36,8 +35,8 @@ function switchView(viewName) {
     
     hideAllResults();
     
-    if (viewName === 'explore' && allCoursesData.length > 0) {
-        renderCourseGrid(allCoursesData);
+    if (viewName === 'explore') {
+        applyFilters();
     }
 }
 
@@ -147,8 +146,11 @@ document.addEventListener('DOMContentLoaded', function() {
         
         if (query.length > 0) {
             clearSearchBtn.style.display = 'flex';
-            const results = searchCourses(query);
-            displaySearchResults(results, query);
+            searchCourses(query).then(results => {
+                if (results !== null) {
+                    displaySearchResults(results, query);
+                }
+            });
         } else {
             clearSearchBtn.style.display = 'none';
             searchResults.style.display = 'none';
@@ -170,12 +172,21 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 });
 
-// Search courses
+// Search courses (ranked on the server)
+let latestSearchId = 0;
+
 function searchCourses(query) {
-    const lowerQuery = query.toLowerCase();
-    return allCourses.filter(course => 
-        course.toLowerCase().includes(lowerQuery)
-    );
+    const searchId = ++latestSearchId;
+    
+    return fetch(`${API_BASE_URL}/autocomplete?q=${encodeURIComponent(query)}&limit=8`)
+        .then(response => response.json())
+        .then(data => data.success ? data.results.map(result => result.course) : [])
+        .catch(() => {
+            // Fall back to filtering the course list we already have
+            const lowerQuery = query.toLowerCase();
+            return allCourses.filter(course => course.toLowerCase().includes(lowerQuery));
+        })
+        .then(results => searchId === latestSearchId ? results : null);  // ignore stale responses
 }
 
 // Display search results
@@ -267,6 +278,19 @@ function toggleFieldFilter(button) {
     applyFilters();
 }
 
+// Sort options (Explore tab) as /query sort and order parameters
+const SORT_OPTIONS = {
+    'roi-desc': ['roi_5_years', 'desc'],
+    'roi-asc': ['roi_5_years', 'asc'],
+    'payback-asc': ['payback_years', 'asc'],
+    'payback-desc': ['payback_years', 'desc'],
+    'cost-asc': ['total_cost', 'asc'],
+    'cost-desc': ['total_cost', 'desc'],
+    'name': ['name', 'asc']
+};
+
+const EXPLORE_PAGE_SIZE = 60;
+
 // Apply all filters (Explore tab)
 function applyFilters() {
     // Get selected universities from checkboxes
@@ -285,66 +309,54 @@ function applyFilters() {
         activeFilters.sortBy = sortSelect.value;
     }
     
-    // Filter courses
-    let filtered = [...allCoursesData];
-    
-    // Apply university filter
-    if (activeFilters.universities.length > 0) {
-        filtered = filtered.filter(course => {
-            return activeFilters.universities.some(uni => {
-                // Check if course name contains the university abbreviation
-                return course.course_name.includes(` - ${uni}`);
-            });
-        });
+    // Filtering and sorting happen on the server
+    const [sort, order] = SORT_OPTIONS[activeFilters.sortBy] || SORT_OPTIONS['roi-desc'];
+    const params = new URLSearchParams({ sort, order, limit: EXPLORE_PAGE_SIZE });
+    activeFilters.universities.forEach(uni => params.append('university', uni));
+    activeFilters.fields.forEach(field => params.append('field', field));
+    // A field chip also covers its specialisms ("Engineering" takes in "Software Engineering")
+    if (activeFilters.fields.length) {
+        params.append('field_match', 'contains');
     }
     
-    // Apply field filter
-    if (activeFilters.fields.length > 0) {
-        filtered = filtered.filter(course => {
-            return activeFilters.fields.some(field => {
-                // Check if course name starts with the field
-                const courseName = course.course_name.split(' - ')[0];
-                return courseName.includes(field) || field.includes(courseName);
-            });
+    queryCourses(params, false);
+}
+
+// Fetch one page of /query results; `append` adds them below the current grid
+function queryCourses(params, append) {
+    fetch(`${API_BASE_URL}/query?${params}`)
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) {
+                throw new Error(data.error || 'Query failed');
+            }
+            renderCourseGrid(data.courses, append);
+            
+            if (data.next_cursor) {
+                const nextParams = new URLSearchParams(params);
+                nextParams.set('cursor', data.next_cursor);
+                showMoreButton(nextParams, data.total_courses);
+            }
+        })
+        .catch(error => {
+            console.error('Error querying courses:', error);
+            if (!append) {
+                renderCourseGrid([]);
+            }
         });
-    }
-    
-    // Sort courses
-    filtered = sortCourses(filtered, activeFilters.sortBy);
-    
-    // Render
-    renderCourseGrid(filtered);
 }
 
-// Sort courses
-function sortCourses(courses, sortBy) {
-    const sorted = [...courses];
-    
-    switch(sortBy) {
-        case 'roi-desc':
-            sorted.sort((a, b) => b.roi_5_years - a.roi_5_years);
-            break;
-        case 'roi-asc':
-            sorted.sort((a, b) => a.roi_5_years - b.roi_5_years);
-            break;
-        case 'payback-asc':
-            sorted.sort((a, b) => a.payback_years - b.payback_years);
-            break;
-        case 'payback-desc':
-            sorted.sort((a, b) => b.payback_years - a.payback_years);
-            break;
-        case 'cost-asc':
-            sorted.sort((a, b) => a.total_cost - b.total_cost);
-            break;
-        case 'cost-desc':
-            sorted.sort((a, b) => b.total_cost - a.total_cost);
-            break;
-        case 'name':
-            sorted.sort((a, b) => a.course_name.localeCompare(b.course_name));
-            break;
-    }
-    
-    return sorted;
+// "Show more" button at the end of the grid for the next page
+function showMoreButton(params, total) {
+    const grid = document.getElementById('courseGrid');
+    const button = document.createElement('button');
+    button.className = 'btn-secondary show-more';
+    button.textContent = `Show more (${total} courses)`;
+    button.onclick = () => {
+        button.remove();
+        queryCourses(params, true);
+    };
+    grid.appendChild(button);
 }
 
 // Reset all filters
@@ -369,37 +381,25 @@ function resetFilters() {
         sortBy: 'roi-desc'
     };
     
-    renderCourseGrid(allCoursesData);
+    applyFilters();
 }
 
 // Show Top 5 (Explore tab)
 function showTop5(type) {
-    let sorted = [...allCoursesData];
-    
-    switch(type) {
-        case 'roi':
-            sorted.sort((a, b) => b.roi_5_years - a.roi_5_years);
-            break;
-        case 'payback':
-            sorted.sort((a, b) => a.payback_years - b.payback_years);
-            break;
-        case 'cost':
-            sorted.sort((a, b) => a.total_cost - b.total_cost);
-            break;
-    }
+    const sort = { roi: 'roi_5_years', payback: 'payback_years', cost: 'total_cost' }[type];
     
-    renderCourseGrid(sorted.slice(0, 5));
+    queryCourses(new URLSearchParams({ sort, limit: 5 }), false);
     
     // Scroll to grid
     document.getElementById('courseGrid').scrollIntoView({ behavior: 'smooth', block: 'start' });
 }
 
 // Render course grid (Explore tab)
-function renderCourseGrid(courses) {
+function renderCourseGrid(courses, append) {
     const grid = document.getElementById('courseGrid');
     const noResults = document.getElementById('noResults');
     
-    if (courses.length === 0) {
+    if (courses.length === 0 && !append) {
         grid.style.display = 'none';
         noResults.style.display = 'flex';
         return;
@@ -450,7 +450,11 @@ function renderCourseGrid(courses) {
         `;
     });
     
-    grid.innerHTML = html;
+    if (append) {
+        grid.insertAdjacentHTML('beforeend', html);
+    } else {
+        grid.innerHTML = html;
+    }
 }
 
 // Select course from grid
@@ -593,9 +597,7 @@ window.onload = function() {
                 option.text = course;
                 multiDropdown.appendChild(option);
             });
-            
-            // Load all course data for filtering
-            loadAllCoursesData();
+
             
             // Load saved preferences after courses are loaded
             loadSavedPreferences();
@@ -606,20 +608,6 @@ window.onload = function() {
         });
 };
 
-// Load all courses data with calculations
-function loadAllCoursesData() {
-    const promises = allCourses.map(course => 
-        fetch(`${API_BASE_URL}/calculate?course=${encodeURIComponent(course)}`)
-            .then(response => response.json())
-            .then(data => data.success ? data.data : null)
-            .catch(() => null)
-    );
-    
-    Promise.all(promises).then(results => {
-        allCoursesData = results.filter(r => r !== null);
-    });
-}
-
 // Single course calculation with customization
 document.addEventListener('DOMContentLoaded', function() {
     const form = document.createElement('form');